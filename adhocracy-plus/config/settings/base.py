@@ -135,6 +135,8 @@ MIDDLEWARE = (
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.contrib.middleware.PredicateCacheMiddleware",
+    "apps.projects.middleware.InsightBatchMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "wagtail.contrib.redirects.middleware.RedirectMiddleware",
     "allauth.account.middleware.AccountMiddleware",
@@ -583,6 +585,79 @@ CELERY_BROKER_URL = "redis://localhost:6379"
 CELERY_RESULT_BACKEND = "redis://localhost:6379"
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 CELERY_RESULT_EXTENDED = True
+# Periodic tasks, run by celery beat
+CELERY_BEAT_SCHEDULE = {
+    # sends notifications left over by a lost or failed dispatcher
+    "dispatch-notifications": {
+        "task": "apps.notifications.tasks.dispatch_notifications",
+        "schedule": 60,
+    },
+    # removes export files after EXPORT_JOB_LIFETIME
+    "delete-expired-export-jobs": {
+        "task": "apps.exports.tasks.delete_expired_export_jobs",
+        "schedule": 60 * 60,
+    },
+}
+
+# Newsletters are sent by one task per chunk of receivers
+NEWSLETTER_CHUNK_SIZE = 500
+# Maximum number of newsletter mails sent per second, 0 means unlimited
+NEWSLETTER_SEND_RATE = 0
+
+# Project invites added at once are sent by one task per chunk of addresses
+INVITE_CHUNK_SIZE = 500
+# Welcome emails to participants added at once are sent by one task per chunk
+WELCOME_EMAIL_CHUNK_SIZE = 500
+
+# Notifications about actions are sent from an outbox in batches of receivers,
+# skipping receivers notified with the same collapse key within the window
+NOTIFICATION_BATCH_SIZE = 500
+NOTIFICATION_COLLAPSE_WINDOW = 10 * 60
+# Mails per second, 0 for no limit
+NOTIFICATION_SEND_RATE = 0
+
+# Seconds a live question update request waits for changes before it answers
+LIVEQUESTION_UPDATES_TIMEOUT = 25
+# Live question update requests waiting at once per process, each holds a
+# thread. Further ones are answered right away, see docs/api.md for sizing.
+LIVEQUESTION_UPDATES_MAX_WAITING = 16
+# Seconds after which a live question feed queries changes of other processes
+LIVEQUESTION_FEED_TTL = 2
+# Milliseconds live question likes are buffered in memory before they are
+# written in bulk, 0 writes every like right away
+LIVEQUESTION_LIKE_BUFFER_INTERVAL = 0
+
+# Files of exports run in the background, not served by the web server
+EXPORTS_ROOT = os.path.join(BASE_DIR, "exports")
+# Seconds an export file can be downloaded and reused for unchanged modules
+EXPORT_JOB_LIFETIME = 24 * 60 * 60
+# Seconds after which a pending or running export without progress is
+# considered lost, e.g. because its worker died, and is started again
+EXPORT_JOB_STALE_AFTER = 30 * 60
+
+# Seconds a rendered project sitemap is cached. Changes to projects, modules
+# and phases render it again right away, this only bounds how late phases
+# starting by time show up in lastmod.
+SITEMAP_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Seconds the ids of the projects and organisations of a user are cached.
+# Membership changes clear them right away, in all processes only if the
+# cache is shared, see CACHES in production.py.
+PROJECT_VISIBILITY_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Seconds the start and end of the projects on an organisation landing page
+# and their rendered tiles are cached. Changes to projects, modules and
+# phases clear both, in all processes only if the cache is shared, see
+# CACHES in production.py. Tiles are rendered again every full hour and
+# after the short tile timeout, so remaining times and progress bars lag
+# behind by at most that timeout.
+ORGANISATION_TIMELINE_CACHE_TIMEOUT = 24 * 60 * 60
+ORGANISATION_TILE_CACHE_TIMEOUT = 10 * 60
+
+# Rendered sharepics, not served by the web server
+SHAREPICS_ROOT = os.path.join(BASE_DIR, "sharepics")
+# Seconds a rendered sharepic is kept for previews and downloads
+SHAREPIC_LIFETIME = 24 * 60 * 60
 
 # CKEditor5 config
 CKEDITOR_5_FILE_STORAGE = "adhocracy4.ckeditor.storage.CustomStorage"
@@ -11,6 +11,15 @@ STORAGES = {
     },
 }
 
+# The cache has to be shared by all web and celery processes: it holds the
+# state of live question feeds and cached data invalidated on changes.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": "redis://localhost:6379/1",
+    }
+}
+
 try:
     from .local import *
 except ImportError:
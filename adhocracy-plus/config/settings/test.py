@@ -1,3 +1,5 @@
+import tempfile
+
 from .dev import *
 
 A4_ORGANISATION_FACTORY = "tests.factories.OrganisationFactory"
@@ -11,6 +13,9 @@ CAPTCHA_TEST_ACCEPTED_ANSWER = "testpass"
 CAPTCHA_URL = "https://captcheck.netsyms.com/api.php"
 WAGTAILADMIN_BASE_URL = "http://localhost:8004"
 
+EXPORTS_ROOT = os.path.join(tempfile.gettempdir(), "adhocracy-plus-test-exports")
+SHAREPICS_ROOT = os.path.join(tempfile.gettempdir(), "adhocracy-plus-test-sharepics")
+
 try:
     from .polygons import *
 except ImportError:
@@ -5,12 +5,14 @@ from rules.contrib.views import PermissionRequiredMixin
 from adhocracy4.comments.models import Comment
 from adhocracy4.exports import mixins
 from adhocracy4.exports import views as a4_export_views
+from apps.exports import mixins as export_mixins
 
 from . import models
 
 
 class ProposalExportView(
     PermissionRequiredMixin,
+    export_mixins.StreamingExportMixin,
     mixins.ItemExportWithReferenceNumberMixin,
     mixins.ItemExportWithLinkMixin,
     mixins.ExportModelFieldsMixin,
@@ -28,6 +30,13 @@ class ProposalExportView(
     fields = ["name", "description", "budget"]
     html_fields = ["description"]
     permission_required = "a4_candy_budgeting.moderate_proposal"
+    export_select_related = (
+        "creator",
+        "category",
+        "moderator_feedback_text",
+        "module__project__organisation",
+    )
+    export_prefetch_related = ("labels",)
 
     def get_permission_object(self):
         return self.module
@@ -49,6 +58,7 @@ class ProposalExportView(
 
 class ProposalCommentExportView(
     PermissionRequiredMixin,
+    export_mixins.StreamingExportMixin,
     mixins.ItemExportWithLinkMixin,
     mixins.ExportModelFieldsMixin,
     mixins.UserGeneratedContentExportMixin,
@@ -62,6 +72,7 @@ class ProposalCommentExportView(
 
     fields = ["id", "comment", "created"]
     permission_required = "a4_candy_budgeting.moderate_proposal"
+    export_select_related = ("creator",)
 
     def get_permission_object(self):
         return self.module
@@ -18,6 +18,11 @@ urlpatterns = [
         views.ProposalCreateView.as_view(),
         name="proposal-create",
     ),
+    re_path(
+        r"^module/(?P<module_slug>[-\w_]+)/map-data/$",
+        views.ProposalMapDataView.as_view(),
+        name="proposal-map-data",
+    ),
     re_path(
         r"^(?P<year>\d{4})-(?P<pk>\d+)/update/$",
         views.ProposalUpdateView.as_view(),
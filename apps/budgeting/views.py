@@ -8,7 +8,9 @@ from adhocracy4.filters import filters as a4_filters
 from adhocracy4.filters.widgets import DropdownLinkWidget
 from adhocracy4.projects.mixins import DisplayProjectOrModuleMixin
 from apps.contrib.widgets import AplusOrderingWidget
+from apps.exports.views import ExportDashboardMixin
 from apps.ideas import views as idea_views
+from apps.mapideas import views as mapidea_views
 from apps.organisations.mixins import UserFormViewMixin
 
 from . import forms
@@ -54,10 +56,28 @@ class ProposalListView(idea_views.AbstractIdeaListView, DisplayProjectOrModuleMi
 
     def dispatch(self, request, **kwargs):
         self.mode = request.GET.get("mode", "map")
-        if self.mode == "map":
-            self.paginate_by = 0
         return super().dispatch(request, **kwargs)
 
+    def get_queryset(self):
+        if self.mode == "map":
+            # the map loads its points from the map data view
+            return super().get_queryset().none()
+        return super().get_queryset()
+
+
+class ProposalMapDataView(mapidea_views.AbstractMapDataView):
+    model = models.Proposal
+    permission_required = "a4_candy_budgeting.view_proposal"
+    detail_url_name = "a4_candy_budgeting:proposal-detail"
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        # same default as the list, archived proposals are hidden
+        is_archived = self.request.GET.get("is_archived", "false")
+        if is_archived in ("true", "false"):
+            qs = qs.filter(is_archived=is_archived == "true")
+        return qs
+
 
 class ProposalDetailView(idea_views.AbstractIdeaDetailView):
     model = models.Proposal
@@ -95,9 +115,7 @@ class ProposalModerateView(idea_views.AbstractIdeaModerateView):
     moderateable_form_class = forms.ProposalModerateForm
 
 
-class ProposalDashboardExportView(DashboardExportView):
-    template_name = "a4exports/export_dashboard.html"
-
+class ProposalDashboardExportView(ExportDashboardMixin, DashboardExportView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["export"] = reverse(
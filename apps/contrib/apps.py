@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class Config(AppConfig):
     name = "apps.contrib"
     label = "a4_candy_contrib"
+
+    def ready(self):
+        from . import predicate_cache
+
+        predicate_cache.install()
@@ -0,0 +1,31 @@
+import time
+from contextlib import contextmanager
+
+from apps import logger
+
+
+@contextmanager
+def bulk_operation(name, **counts):
+    """Log the duration and row counts of a bulk operation.
+
+    The counts passed in can be completed within the block, e.g. with the
+    number of rows actually written:
+
+        with bulk_operation("follows", users=len(pks)) as stats:
+            stats["rows"] = len(Follow.objects.bulk_create(follows))
+    """
+    stats = dict(counts)
+    start = time.monotonic()
+    try:
+        yield stats
+    finally:
+        duration = time.monotonic() - start
+        logger.info(
+            "bulk %s took %.3fs (%s)",
+            name,
+            duration,
+            ", ".join("{}={}".format(key, value) for key, value in stats.items()),
+            extra={
+                "bulk_operation": dict(stats, name=name, duration=duration),
+            },
+        )
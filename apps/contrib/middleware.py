@@ -0,0 +1,24 @@
+from apps import logger
+
+from . import predicate_cache
+
+
+class PredicateCacheMiddleware:
+    """Memoize rule predicates for the duration of a request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with predicate_cache.request_scope() as scope:
+            response = self.get_response(request)
+        info = scope.info()
+        if info["saved"]:
+            logger.debug(
+                "predicate cache saved %d of %d evaluations for %s",
+                info["saved"],
+                info["saved"] + info["evaluated"],
+                request.path,
+                extra={"predicate_cache": info},
+            )
+        return response
@@ -0,0 +1,132 @@
+"""Request scoped memo of the rule predicates hitting the database.
+
+Permission checks of templates, serializers and api permissions evaluate
+the same membership, moderator and initiator predicates and the active
+phase of the same modules many times per request. While a scope is active,
+e.g. during a request handled by `PredicateCacheMiddleware`, their results
+are memoized per user and object. Outside of a scope everything is
+evaluated as before.
+
+The memo assumes the objects keep their state within the scope, so it is
+cleared whenever a model instance is saved or deleted or a many-to-many
+relation changes.
+"""
+
+import contextvars
+import inspect
+from collections import Counter
+from contextlib import contextmanager
+from functools import cached_property
+
+from django.db import models
+from django.db.models import signals
+
+from adhocracy4.modules.models import Module
+from adhocracy4.organisations import predicates as organisation_predicates
+from adhocracy4.projects import predicates as project_predicates
+
+PREDICATES = [
+    project_predicates.is_project_member,
+    project_predicates.is_moderator,
+    organisation_predicates.is_initiator,
+    organisation_predicates.is_org_member,
+]
+
+_scope = contextvars.ContextVar("predicate_cache_scope", default=None)
+_installed = False
+
+
+class PredicateCacheScope:
+    def __init__(self):
+        self._results = {}
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def get(self, name, key, evaluate):
+        key = (name,) + key
+        if key in self._results:
+            self.hits[name] += 1
+        else:
+            self.misses[name] += 1
+            self._results[key] = evaluate()
+        return self._results[key]
+
+    def clear(self):
+        self._results.clear()
+
+    def info(self):
+        return {
+            "saved": sum(self.hits.values()),
+            "evaluated": sum(self.misses.values()),
+            "hits": dict(self.hits),
+        }
+
+
+@contextmanager
+def request_scope():
+    scope = PredicateCacheScope()
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+
+
+def clear(**kwargs):
+    scope = _scope.get()
+    if scope is not None:
+        scope.clear()
+
+
+def _object_key(obj):
+    if isinstance(obj, models.Model) and obj.pk is not None:
+        return obj._meta.label, obj.pk
+    return None
+
+
+def _memoize_predicate(predicate):
+    fn = predicate.fn
+
+    def memoized(user, obj):
+        scope = _scope.get()
+        key = _object_key(obj)
+        if scope is None or key is None:
+            return fn(user, obj)
+        user_key = user.pk if getattr(user, "is_authenticated", False) else None
+        return scope.get(predicate.name, (user_key,) + key, lambda: fn(user, obj))
+
+    predicate.fn = memoized
+
+
+def _memoize_active_phase():
+    original = inspect.getattr_static(Module, "active_phase")
+
+    def evaluate(module):
+        if isinstance(original, cached_property) and "active_phase" in vars(module):
+            return vars(module)["active_phase"]
+        return original.__get__(module, Module)
+
+    def active_phase(module):
+        scope = _scope.get()
+        if scope is None or module.pk is None:
+            return evaluate(module)
+        return scope.get("active_phase", (module.pk,), lambda: evaluate(module))
+
+    Module.active_phase = property(active_phase, doc=original.__doc__)
+
+
+def install():
+    """Memoize the predicates while a scope is active, done once on startup.
+
+    Replacing the functions of the predicate objects covers every rule
+    they are combined into.
+    """
+    global _installed
+    if _installed:
+        return
+    for predicate in PREDICATES:
+        _memoize_predicate(predicate)
+    _memoize_active_phase()
+    for signal in (signals.post_save, signals.post_delete, signals.m2m_changed):
+        signal.connect(clear, dispatch_uid="predicate_cache_clear")
+    _installed = True
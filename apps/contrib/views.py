@@ -1,3 +1,6 @@
+from datetime import datetime
+
+from django.db.models import Q
 from django.shortcuts import redirect
 from django.views import generic
 
@@ -20,3 +23,104 @@ class CanonicalURLDetailView(generic.DetailView):
 
         context = self.get_context_data(object=self.object)
         return self.render_to_response(context)
+
+
+class KeysetPage:
+    """Page of a keyset paginated list, usable like a Django Page."""
+
+    is_keyset = True
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginationMixin:
+    """Paginate long lists ordered by creation date by a cursor.
+
+    Offset pagination counts the whole list and makes the database skip all
+    rows before the requested page. Lists sorted by ``-created`` with more
+    than ``keyset_threshold`` items are paginated by the creation date and pk
+    of the last item shown instead, so every page costs the same.
+    """
+
+    keyset_threshold = 1000
+    keyset_ordering = ("-created",)
+    cursor_kwarg = "cursor"
+
+    def use_keyset_pagination(self, queryset):
+        if tuple(queryset.query.order_by) != self.keyset_ordering:
+            return False
+        if self.cursor_kwarg in self.request.GET:
+            return True
+        threshold = self.keyset_threshold
+        return queryset.order_by().values("pk")[threshold : threshold + 1].exists()
+
+    @staticmethod
+    def _encode_cursor(direction, obj):
+        return "{}{}_{}".format(direction, obj.created.isoformat(), obj.pk)
+
+    @staticmethod
+    def _decode_cursor(cursor):
+        direction, value = cursor[:1], cursor[1:]
+        created, _, pk = value.rpartition("_")
+        try:
+            return direction, datetime.fromisoformat(created), int(pk)
+        except ValueError:
+            return None, None, None
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_keyset_pagination(queryset):
+            return super().paginate_queryset(queryset, page_size)
+
+        cursor = self.request.GET.get(self.cursor_kwarg, "")
+        direction, created, pk = self._decode_cursor(cursor)
+        if direction == "p":
+            items = list(
+                queryset.filter(
+                    Q(created__gt=created) | Q(created=created, pk__gt=pk)
+                ).order_by("created", "pk")[: page_size + 1]
+            )
+            has_previous = len(items) > page_size
+            items = items[:page_size][::-1]
+            has_next = True
+        else:
+            queryset = queryset.order_by("-created", "-pk")
+            if direction == "n":
+                queryset = queryset.filter(
+                    Q(created__lt=created) | Q(created=created, pk__lt=pk)
+                )
+            items = list(queryset[: page_size + 1])
+            has_next = len(items) > page_size
+            items = items[:page_size]
+            has_previous = direction == "n"
+
+        page = KeysetPage(
+            items,
+            next_cursor=(
+                self._encode_cursor("n", items[-1]) if items and has_next else None
+            ),
+            previous_cursor=(
+                self._encode_cursor("p", items[0]) if items and has_previous else None
+            ),
+        )
+        return None, page, items, page.has_other_pages()
@@ -58,6 +58,11 @@ urlpatterns = [
         organisation_views.DashboardCommunicationContentCreateView.as_view(),
         name="communication-content-create",
     ),
+    re_path(
+        r"^communication/content/sharepics/(?P<key>\d+-[0-9a-f]{64})\.png$",
+        organisation_views.DashboardSharepicView.as_view(),
+        name="communication-content-sharepic",
+    ),
 ]
 
 # a4 dashboard urls without organisation slug
@@ -12,6 +12,7 @@ from . import models
 
 class SubjectExportView(
     PermissionRequiredMixin,
+    export_mixins.StreamingExportMixin,
     mixins.ItemExportWithReferenceNumberMixin,
     mixins.ItemExportWithLinkMixin,
     mixins.ExportModelFieldsMixin,
@@ -22,6 +23,7 @@ class SubjectExportView(
     model = models.Subject
     fields = ["name"]
     permission_required = "a4_candy_debate.change_subject"
+    export_select_related = ("creator", "module__project__organisation")
 
     def get_permission_object(self):
         return self.module
@@ -38,6 +40,7 @@ class SubjectExportView(
 
 class SubjectCommentExportView(
     PermissionRequiredMixin,
+    export_mixins.StreamingExportMixin,
     mixins.ItemExportWithLinkMixin,
     mixins.ExportModelFieldsMixin,
     export_mixins.CommentExportWithCategoriesMixin,
@@ -52,6 +55,7 @@ class SubjectCommentExportView(
 
     fields = ["id", "comment", "created"]
     permission_required = "a4_candy_debate.change_subject"
+    export_select_related = ("creator",)
 
     def get_permission_object(self):
         return self.module
@@ -6,6 +6,7 @@ from adhocracy4.exports.views import DashboardExportView
 from adhocracy4.filters import views as filter_views
 from adhocracy4.projects.mixins import DisplayProjectOrModuleMixin
 from adhocracy4.projects.mixins import ProjectMixin
+from apps.exports.views import ExportDashboardMixin
 from apps.ideas import views as idea_views
 
 from . import filters
@@ -121,9 +122,7 @@ class SubjectDeleteView(
         return self.get_object()
 
 
-class SubjectDashboardExportView(DashboardExportView):
-    template_name = "a4exports/export_dashboard.html"
-
+class SubjectDashboardExportView(ExportDashboardMixin, DashboardExportView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["subject_export"] = reverse(
@@ -5,10 +5,12 @@ from rules.contrib.views import PermissionRequiredMixin
 from adhocracy4.comments.models import Comment
 from adhocracy4.exports import mixins
 from adhocracy4.exports import views as a4_export_views
+from apps.exports import mixins as export_mixins
 
 
 class DocumentExportView(
     PermissionRequiredMixin,
+    export_mixins.StreamingExportMixin,
     mixins.ItemExportWithLinkMixin,
     mixins.ExportModelFieldsMixin,
     mixins.UserGeneratedContentExportMixin,
@@ -19,6 +21,7 @@ class DocumentExportView(
 
     model = Comment
     permission_required = "a4_candy_documents.change_chapter"
+    export_select_related = ("creator",)
 
     fields = ["id", "comment", "created"]
 
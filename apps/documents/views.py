@@ -10,6 +10,7 @@ from adhocracy4.exports.views import DashboardExportView
 from adhocracy4.projects.mixins import DisplayProjectOrModuleMixin
 from adhocracy4.projects.mixins import ProjectMixin
 from adhocracy4.rules import mixins as rules_mixins
+from apps.exports.views import ExportDashboardMixin
 
 from . import models
 
@@ -80,8 +81,7 @@ class ParagraphDetailView(
     permission_required = "a4_candy_documents.view_paragraph"
 
 
-class DocumentDashboardExportView(DashboardExportView):
-    template_name = "a4exports/export_dashboard.html"
+class DocumentDashboardExportView(ExportDashboardMixin, DashboardExportView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
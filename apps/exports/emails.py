@@ -0,0 +1,16 @@
+from apps.users.emails import EmailAplus as Email
+
+
+class ExportReadyEmail(Email):
+    template_name = "a4_candy_exports/emails/export_ready"
+
+    def get_organisation(self):
+        return self.object.module.project.organisation
+
+    def get_receivers(self):
+        return [self.object.creator]
+
+    def get_context(self):
+        context = super().get_context()
+        context["object"] = self.object
+        return context
@@ -0,0 +1,240 @@
+"""Exports run by background tasks.
+
+A job stores the url of an export view. The task rebuilds a GET request to
+that url for the creator of the job and runs the view, so permissions,
+filters and the export format are the same as when downloading directly.
+"""
+
+import hashlib
+import io
+import re
+import tempfile
+import uuid
+from datetime import timedelta
+from functools import partial
+from urllib.parse import urlsplit
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.files import File
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import transaction
+from django.db.models import CharField
+from django.db.models import Count
+from django.db.models import Max
+from django.db.models import Q
+from django.db.models.functions import Cast
+from django.urls import resolve
+from django.utils import timezone
+from django.utils import translation
+
+from adhocracy4.categories.models import Category
+from adhocracy4.comments.models import Comment
+from adhocracy4.labels.models import Label
+from adhocracy4.modules.models import Item
+from adhocracy4.ratings.models import Rating
+from apps.moderatorfeedback.models import Moderateable
+from apps.moderatorfeedback.models import ModeratorCommentFeedback
+from apps.moderatorfeedback.models import ModeratorFeedback
+from apps.moderatorremark.models import ModeratorRemark
+
+from .models import ExportJob
+
+FILENAME_RE = re.compile(r'filename="?([^";]+)"?')
+
+
+class ExportFailed(Exception):
+    pass
+
+
+def _pks_as_text(queryset):
+    # ratings refer to their objects by a text column
+    return queryset.annotate(pk_text=Cast("pk", output_field=CharField())).values(
+        "pk_text"
+    )
+
+
+def _moderator_feedback(module):
+    """Return the official feedback on the items of the module.
+
+    It is referred to by the moderateable items, so updating its text does
+    not change the item.
+    """
+    query = Q(pk__in=[])
+    for model in django_apps.get_models():
+        if issubclass(model, Item) and issubclass(model, Moderateable):
+            query |= Q(
+                pk__in=model.objects.filter(module=module).values(
+                    "moderator_feedback_text"
+                )
+            )
+    return ModeratorFeedback.objects.filter(query)
+
+
+def _label_assignments(module):
+    """Return the counts and highest ids of the labels set on items."""
+    return [
+        sorted(
+            relation.through.objects.filter(label__module=module)
+            .aggregate(Count("pk"), Max("pk"))
+            .items()
+        )
+        for relation in Label._meta.related_objects
+        if relation.many_to_many
+    ]
+
+
+def get_module_fingerprint(module):
+    """Return a hash changing whenever the exported data of the module does."""
+    items = Item.objects.filter(module=module)
+    comments = Comment.objects.filter(root_project__project=module.project)
+    comment_ct = ContentType.objects.get_for_model(Comment)
+    ratings = Rating.objects.filter(
+        Q(content_type=comment_ct, object_pk__in=_pks_as_text(comments))
+        | (~Q(content_type=comment_ct) & Q(object_pk__in=_pks_as_text(items)))
+    )
+    remarks = ModeratorRemark.objects.filter(item_object_id__in=items.values("pk"))
+    comment_feedback = ModeratorCommentFeedback.objects.filter(comment__in=comments)
+    state = repr(
+        [
+            sorted(
+                queryset.aggregate(Count("pk"), Max("created"), Max("modified")).items()
+            )
+            for queryset in (
+                items,
+                comments,
+                ratings,
+                remarks,
+                _moderator_feedback(module),
+                comment_feedback,
+            )
+        ]
+        + [
+            # neither has timestamps, renaming them changes the export
+            list(Category.objects.filter(module=module).order_by("pk").values_list()),
+            list(Label.objects.filter(module=module).order_by("pk").values_list()),
+            _label_assignments(module),
+        ]
+    )
+    return hashlib.sha256(state.encode()).hexdigest()
+
+
+def enqueue(request, module, url):
+    """Start an export of the url for the user of the request.
+
+    Returns the pending job, or a finished job sharing the file of an earlier
+    export if the module has not changed since then.
+    """
+    from .tasks import run_export_job
+
+    language = translation.get_language()
+    unfinished = ExportJob.objects.filter(
+        creator=request.user,
+        url=url,
+        language=language,
+        status__in=[ExportJob.PENDING, ExportJob.RUNNING],
+    )
+    # a lost job would otherwise block exports of the url for good
+    unfinished.stale().update(status=ExportJob.FAILED)
+    job = unfinished.order_by("-created").first()
+    if job:
+        return job
+
+    reusable = (
+        ExportJob.objects.reusable(url, language, get_module_fingerprint(module))
+        .order_by("-expires")
+        .first()
+    )
+    if reusable:
+        return ExportJob.objects.create(
+            module=module,
+            creator=request.user,
+            url=url,
+            language=language,
+            fingerprint=reusable.fingerprint,
+            status=ExportJob.FINISHED,
+            rows_done=reusable.rows_done,
+            rows_total=reusable.rows_total,
+            file=reusable.file.name,
+            finished=timezone.now(),
+            expires=reusable.expires,
+        )
+
+    job = ExportJob.objects.create(
+        module=module, creator=request.user, url=url, language=language
+    )
+    transaction.on_commit(partial(run_export_job.delay, job.pk))
+    return job
+
+
+def _build_request(job):
+    parts = urlsplit(job.url)
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "SCRIPT_NAME": "",
+        "PATH_INFO": parts.path,
+        "QUERY_STRING": parts.query,
+        "HTTP_HOST": parts.netloc,
+        "SERVER_NAME": parts.hostname,
+        "SERVER_PORT": str(parts.port or (443 if parts.scheme == "https" else 80)),
+        "wsgi.url_scheme": parts.scheme,
+        "wsgi.input": io.BytesIO(),
+    }
+    request = WSGIRequest(environ)
+    request.user = job.creator
+    return request
+
+
+def _render(job, request):
+    match = resolve(request.path_info)
+    view = match.func.view_class(**match.func.view_initkwargs)
+    view.setup(request, *match.args, **match.kwargs)
+    view.export_job = job
+    response = view.dispatch(request, *match.args, **match.kwargs)
+    if response.status_code != 200:
+        raise ExportFailed(
+            "Export {} answered with status {}".format(job.url, response.status_code)
+        )
+    return response
+
+
+def run(job):
+    """Run the export of the job and store its file."""
+    fingerprint = get_module_fingerprint(job.module)
+    request = _build_request(job)
+    with translation.override(job.language):
+        response = _render(job, request)
+
+    match = FILENAME_RE.search(response.get("Content-Disposition", ""))
+    filename = match.group(1) if match else "export"
+    with tempfile.TemporaryFile() as output:
+        if response.streaming:
+            for chunk in response.streaming_content:
+                output.write(chunk)
+        else:
+            output.write(response.content)
+        response.close()
+        output.seek(0)
+        job.file.save(
+            "{}/{}".format(uuid.uuid4().hex, filename), File(output), save=False
+        )
+
+    job.fingerprint = fingerprint
+    job.status = ExportJob.FINISHED
+    job.finished = timezone.now()
+    job.expires = job.finished + timedelta(seconds=settings.EXPORT_JOB_LIFETIME)
+    job.save()
+
+
+def delete_expired():
+    """Delete expired jobs and the files no other job refers to anymore."""
+    expired = ExportJob.objects.expired()
+    names = set(expired.exclude(file="").values_list("file", flat=True))
+    expired.delete()
+    in_use = set(
+        ExportJob.objects.filter(file__in=names).values_list("file", flat=True)
+    )
+    storage = ExportJob._meta.get_field("file").storage
+    for name in names - in_use:
+        storage.delete(name)
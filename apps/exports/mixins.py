@@ -1,7 +1,229 @@
+import csv
+import tempfile
+from functools import cached_property
+
 from django.conf import settings
+from django.contrib import messages
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count
+from django.db.models import prefetch_related_objects
+from django.http import FileResponse
+from django.http import StreamingHttpResponse
+from django.shortcuts import redirect
+from django.utils import timezone
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.utils.translation import gettext as _
 
+from adhocracy4.comments.models import Comment
 from adhocracy4.exports.mixins import VirtualFieldMixin
+from adhocracy4.modules.models import Item
+from adhocracy4.ratings.models import Rating
+from apps.moderatorremark.models import ModeratorRemark
+
+from . import jobs
+from .models import ExportJob
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+# cells starting with these are run as formulas by spreadsheet apps
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class _Echo:
+    """File-like object handing written csv lines back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def escape_csv_cell(value):
+    """Keep spreadsheet apps from running user input as a formula."""
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class StreamingExportMixin:
+    """
+    Exports items in chunks with constant memory.
+
+    The items are queried in chunks of export_chunk_size ordered by pk and the
+    related data of each chunk is fetched in bulk before its rows are built.
+    With ?format=csv the rows are streamed while they are queried, otherwise
+    an XLSX file is written in xlsxwriter's constant memory mode to a
+    temporary file and sent from there. Posting to the view runs the export
+    in the background instead, see jobs.enqueue.
+
+    Has to be mixed in before BaseItemExportView.
+    """
+
+    export_chunk_size = 2000
+    export_select_related = ()
+    export_prefetch_related = ()
+    # set when run by a background task, see jobs.run
+    export_job = None
+
+    def get_export_items(self):
+        queryset = self.get_queryset().order_by("pk")
+        if self.export_select_related:
+            queryset = queryset.select_related(*self.export_select_related)
+        if self.export_job:
+            self.export_job.set_rows_total(queryset.count())
+        last_pk = None
+        while True:
+            chunk_queryset = queryset
+            if last_pk is not None:
+                chunk_queryset = queryset.filter(pk__gt=last_pk)
+            chunk = list(chunk_queryset[: self.export_chunk_size])
+            if not chunk:
+                return
+            self.prefetch_export_items(chunk)
+            yield from chunk
+            if self.export_job:
+                self.export_job.add_rows_done(len(chunk))
+            if len(chunk) < self.export_chunk_size:
+                return
+            last_pk = chunk[-1].pk
+
+    def prefetch_export_items(self, items):
+        if self.export_prefetch_related:
+            prefetch_related_objects(items, *self.export_prefetch_related)
+        if isinstance(items[0], Comment):
+            prefetch_comment_targets(items)
+        elif isinstance(items[0], Item):
+            prefetch_remarks(items)
+
+    def export_rows(self):
+        names = list(self.get_virtual_fields({}))
+        for item in self.get_export_items():
+            yield [self.get_field_data(item, name) for name in names]
+
+    def get_export_header(self):
+        return [str(header) for header in self.get_virtual_fields({}).values()]
+
+    def get_export_filename(self, extension):
+        return "{}_{}.{}".format(
+            self.project.slug, timezone.now().strftime("%Y%m%dT%H%M%S"), extension
+        )
+
+    def get(self, request, *args, **kwargs):
+        if request.GET.get("format") == "csv":
+            return self.get_csv_response()
+        return self.get_xlsx_response()
+
+    def post(self, request, *args, **kwargs):
+        url = request.build_absolute_uri(request.path)
+        if request.POST.get("format") == "csv":
+            url += "?format=csv"
+        job = jobs.enqueue(request, self.module, url)
+        if job.status == ExportJob.FINISHED:
+            messages.success(request, _("The export is ready for download."))
+        else:
+            messages.success(
+                request,
+                _(
+                    "The export is prepared in the background. You will receive "
+                    "an email when it is ready."
+                ),
+            )
+        next_url = request.POST.get("next", "")
+        if not url_has_allowed_host_and_scheme(
+            next_url, allowed_hosts={request.get_host()}
+        ):
+            next_url = job.get_status_url()
+        return redirect(next_url)
+
+    def get_csv_response(self):
+        writer = csv.writer(_Echo())
+        rows = (
+            writer.writerow([escape_csv_cell(value) for value in row])
+            for rows in ([self.get_export_header()], self.export_rows())
+            for row in rows
+        )
+        response = StreamingHttpResponse(rows, content_type="text/csv")
+        response["Content-Disposition"] = 'attachment; filename="{}"'.format(
+            self.get_export_filename("csv")
+        )
+        # keep nginx from collecting the whole export before sending it
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def get_xlsx_response(self):
+        import xlsxwriter
+
+        output = tempfile.TemporaryFile()
+        workbook = xlsxwriter.Workbook(
+            output, {"constant_memory": True, "strings_to_formulas": False}
+        )
+        worksheet = workbook.add_worksheet()
+        for column, header in enumerate(self.get_export_header()):
+            worksheet.write(0, column, header)
+        for row_number, row in enumerate(self.export_rows(), start=1):
+            for column, value in enumerate(row):
+                if isinstance(value, str):
+                    value = value.replace("\r", "")
+                worksheet.write(row_number, column, value)
+        workbook.close()
+        output.seek(0)
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename=self.get_export_filename("xlsx"),
+            content_type=XLSX_CONTENT_TYPE,
+        )
+
+
+def prefetch_comment_targets(comments):
+    """Fetch what comments are on and the module of those items in bulk."""
+    prefetch_related_objects(comments, "content_object")
+    parents = [
+        comment.content_object
+        for comment in comments
+        if isinstance(comment.content_object, Comment)
+    ]
+    if parents:
+        prefetch_related_objects(parents, "content_object")
+    items = [
+        comment.content_object
+        for comment in comments + parents
+        if isinstance(comment.content_object, Item)
+    ]
+    if items:
+        prefetch_related_objects(items, "module__project__organisation")
+
+    counts = {}
+    for object_pk, value, count in (
+        Rating.objects.filter(
+            content_type=ContentType.objects.get_for_model(Comment),
+            object_pk__in=[str(comment.pk) for comment in comments],
+        )
+        .values_list("object_pk", "value")
+        .annotate(count=Count("pk"))
+        .order_by()
+    ):
+        counts[object_pk, value] = count
+    for comment in comments:
+        comment.positive_rating_count = counts.get(
+            (str(comment.pk), Rating.POSITIVE), 0
+        )
+        comment.negative_rating_count = counts.get(
+            (str(comment.pk), Rating.NEGATIVE), 0
+        )
+
+
+def prefetch_remarks(items):
+    """Attach the moderator remarks of the items, see AbstractIdea.remark."""
+    if not hasattr(type(items[0]), "remark"):
+        return
+    content_type = ContentType.objects.get_for_model(items[0])
+    remarks = {
+        remark.item_object_id: remark
+        for remark in ModeratorRemark.objects.filter(
+            item_content_type=content_type,
+            item_object_id__in=[item.pk for item in items],
+        )
+    }
+    for item in items:
+        item._prefetched_remark = remarks.get(item.pk)
 
 
 class CommentExportWithCategoriesMixin(VirtualFieldMixin):
@@ -19,10 +241,13 @@ class CommentExportWithCategoriesMixin(VirtualFieldMixin):
             virtual["categories"] = _("Categories")
         return super().get_virtual_fields(virtual)
 
-    def get_categories_data(self, item):
+    @cached_property
+    def category_choices(self):
         category_choices = getattr(settings, "A4_COMMENT_CATEGORIES", "")
-        if category_choices:
-            category_choices = dict((x, str(y)) for x, y in category_choices)
+        return dict((x, str(y)) for x, y in category_choices)
+
+    def get_categories_data(self, item):
+        category_choices = self.category_choices
         if hasattr(item, "comment_categories") and item.comment_categories:
             categories = []
             category_list = item.comment_categories.strip("[]").split(",")
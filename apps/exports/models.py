@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from adhocracy4.models import base
+from adhocracy4.modules.models import Module
+
+
+def get_export_storage():
+    """Keep export files out of the public media folder."""
+    return FileSystemStorage(location=settings.EXPORTS_ROOT)
+
+
+class ExportJobQuerySet(models.QuerySet):
+    def expired(self):
+        return self.filter(expires__lte=timezone.now())
+
+    def stale(self):
+        """Pending or running jobs without progress for EXPORT_JOB_STALE_AFTER."""
+        return self.filter(
+            status__in=[ExportJob.PENDING, ExportJob.RUNNING],
+            modified__lt=timezone.now()
+            - timedelta(seconds=settings.EXPORT_JOB_STALE_AFTER),
+        )
+
+    def reusable(self, url, language, fingerprint):
+        return self.filter(
+            url=url,
+            language=language,
+            fingerprint=fingerprint,
+            status=ExportJob.FINISHED,
+            expires__gt=timezone.now(),
+        ).exclude(file="")
+
+
+class ExportJob(base.TimeStampedModel):
+    """An export run by a background task and the file it produced.
+
+    The url is the one of the export view, the task runs that view for the
+    creator. Jobs for a module that did not change since another export
+    share its file, see jobs.enqueue.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (PENDING, _("Pending")),
+        (RUNNING, _("Running")),
+        (FINISHED, _("Finished")),
+        (FAILED, _("Failed")),
+    )
+
+    module = models.ForeignKey(Module, related_name="+", on_delete=models.CASCADE)
+    creator = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name="+", on_delete=models.CASCADE
+    )
+    url = models.CharField(max_length=500)
+    language = models.CharField(max_length=10)
+    fingerprint = models.CharField(max_length=64, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    rows_done = models.PositiveIntegerField(default=0)
+    rows_total = models.PositiveIntegerField(blank=True, null=True)
+    file = models.FileField(storage=get_export_storage, blank=True)
+    finished = models.DateTimeField(blank=True, null=True)
+    expires = models.DateTimeField(blank=True, null=True)
+
+    objects = ExportJobQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["-created"]
+
+    def __str__(self):
+        return "Export {} of {}".format(self.pk, self.url)
+
+    @property
+    def progress(self):
+        if self.status == self.FINISHED:
+            return 100
+        if not self.rows_total:
+            return 0
+        return min(100, int(self.rows_done * 100 / self.rows_total))
+
+    @property
+    def is_available(self):
+        return (
+            self.status == self.FINISHED
+            and bool(self.file)
+            and self.expires is not None
+            and self.expires > timezone.now()
+        )
+
+    def get_absolute_url(self):
+        return reverse("export-job-download", kwargs={"pk": self.pk})
+
+    def get_status_url(self):
+        return reverse("export-job-status", kwargs={"pk": self.pk})
+
+    # the progress updates touch modified, so jobs still making progress are
+    # not considered stale
+    def set_rows_total(self, rows_total):
+        self.rows_total = rows_total
+        ExportJob.objects.filter(pk=self.pk).update(
+            rows_total=rows_total, modified=timezone.now()
+        )
+
+    def add_rows_done(self, rows):
+        self.rows_done += rows
+        ExportJob.objects.filter(pk=self.pk).update(
+            rows_done=F("rows_done") + rows, modified=timezone.now()
+        )
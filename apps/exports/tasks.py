@@ -0,0 +1,33 @@
+from celery import shared_task
+from django.utils import timezone
+
+from apps import logger
+
+from . import emails
+from . import jobs
+from .models import ExportJob
+
+
+@shared_task
+def run_export_job(job_pk):
+    jobs.delete_expired()
+    updated = ExportJob.objects.filter(pk=job_pk, status=ExportJob.PENDING).update(
+        status=ExportJob.RUNNING, modified=timezone.now()
+    )
+    if not updated:
+        # already run or deleted
+        return
+
+    job = ExportJob.objects.select_related("module__project", "creator").get(pk=job_pk)
+    try:
+        jobs.run(job)
+    except Exception:
+        logger.exception("export job {} failed".format(job.pk))
+        ExportJob.objects.filter(pk=job.pk).update(status=ExportJob.FAILED)
+        return
+    emails.ExportReadyEmail.send(job)
+
+
+@shared_task
+def delete_expired_export_jobs():
+    jobs.delete_expired()
@@ -0,0 +1,16 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path(
+        "jobs/<int:pk>/",
+        views.ExportJobStatusView.as_view(),
+        name="export-job-status",
+    ),
+    path(
+        "jobs/<int:pk>/download/",
+        views.ExportJobDownloadView.as_view(),
+        name="export-job-download",
+    ),
+]
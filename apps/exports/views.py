@@ -0,0 +1,56 @@
+import os
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import FileResponse
+from django.http import Http404
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views import generic
+
+from .models import ExportJob
+
+
+class ExportJobMixin(LoginRequiredMixin):
+    def get_job(self):
+        return get_object_or_404(
+            ExportJob, pk=self.kwargs["pk"], creator=self.request.user
+        )
+
+
+class ExportJobStatusView(ExportJobMixin, generic.View):
+    def get(self, request, *args, **kwargs):
+        job = self.get_job()
+        return JsonResponse(
+            {
+                "status": job.status,
+                "progress": job.progress,
+                "rows_done": job.rows_done,
+                "rows_total": job.rows_total,
+                "download": job.get_absolute_url() if job.is_available else None,
+            }
+        )
+
+
+class ExportJobDownloadView(ExportJobMixin, generic.View):
+    def get(self, request, *args, **kwargs):
+        job = self.get_job()
+        if not job.is_available:
+            raise Http404("The export is not available.")
+        return FileResponse(
+            job.file.open("rb"),
+            as_attachment=True,
+            filename=os.path.basename(job.file.name),
+        )
+
+
+class ExportDashboardMixin:
+    """Show the background export jobs on the export page of a module."""
+
+    template_name = "a4_candy_exports/export_dashboard.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["export_jobs"] = ExportJob.objects.filter(
+            module=self.module, creator=self.request.user
+        )[:10]
+        return context
@@ -32,6 +32,8 @@ class IdeaViewSet(
             .annotate_comment_count()
             .annotate_positive_rating_count()
             .annotate_negative_rating_count()
+            .select_related("creator", "category", "module")
+            .prefetch_related("labels")
             .order_by("created")
         )
         return ideas
@@ -5,12 +5,14 @@ from rules.contrib.views import PermissionRequiredMixin
 from adhocracy4.comments.models import Comment
 from adhocracy4.exports import mixins
 from adhocracy4.exports import views as a4_export_views
+from apps.exports import mixins as export_mixins
 
 from . import models
 
 
 class IdeaExportView(
     PermissionRequiredMixin,
+    export_mixins.StreamingExportMixin,
     mixins.ItemExportWithReferenceNumberMixin,
     mixins.ItemExportWithLinkMixin,
     mixins.ExportModelFieldsMixin,
@@ -27,6 +29,13 @@ class IdeaExportView(
     fields = ["name", "description"]
     html_fields = ["description"]
     permission_required = "a4_candy_ideas.moderate_idea"
+    export_select_related = (
+        "creator",
+        "category",
+        "moderator_feedback_text",
+        "module__project__organisation",
+    )
+    export_prefetch_related = ("labels",)
 
     def get_permission_object(self):
         return self.module
@@ -48,6 +57,7 @@ class IdeaExportView(
 
 class IdeaCommentExportView(
     PermissionRequiredMixin,
+    export_mixins.StreamingExportMixin,
     mixins.ItemExportWithLinkMixin,
     mixins.ExportModelFieldsMixin,
     mixins.UserGeneratedContentExportMixin,
@@ -61,6 +71,7 @@ class IdeaCommentExportView(
 
     fields = ["id", "comment", "created"]
     permission_required = "a4_candy_ideas.moderate_idea"
+    export_select_related = ("creator",)
 
     def get_permission_object(self):
         return self.module
@@ -55,6 +55,8 @@ class AbstractIdea(module_models.Item, Moderateable):
 
     @property
     def remark(self):
+        if hasattr(self, "_prefetched_remark"):
+            return self._prefetched_remark
         content_type = ContentType.objects.get_for_model(self)
         return remark_models.ModeratorRemark.objects.filter(
             item_content_type=content_type, item_object_id=self.id
@@ -43,6 +43,38 @@ class RatingSerializer(serializers.ModelSerializer):
         fields = ("id", "value")
 
 
+class IdeaUserState:
+    """Fields of a list of ideas depending on the requesting user.
+
+    The ratings of the user are loaded with one query. The idea rules only
+    depend on the module, its project and phases and on whether the user
+    created the idea, so every rule is evaluated once per module and
+    ownership and shared by all ideas in the list.
+    """
+
+    def __init__(self, user, ideas):
+        self.user = user
+        self._permissions = {}
+        self._ratings = {}
+        if user.is_authenticated and ideas:
+            ratings = Rating.objects.filter(
+                content_type=ContentType.objects.get_for_model(Idea),
+                object_pk__in=[idea.pk for idea in ideas],
+                creator=user,
+            ).order_by("pk")
+            for rating in ratings:
+                self._ratings.setdefault(str(rating.object_pk), rating)
+
+    def get_rating(self, idea):
+        return self._ratings.get(str(idea.pk))
+
+    def has_perm(self, perm, idea):
+        key = (perm, idea.module_id, idea.creator_id == self.user.pk)
+        if key not in self._permissions:
+            self._permissions[key] = self.user.has_perm(perm, idea)
+        return self._permissions[key]
+
+
 class IdeaSerializer(serializers.ModelSerializer):
     description = DescriptionSerializerField()
     created = serializers.SerializerMethodField()
@@ -110,44 +142,53 @@ class IdeaSerializer(serializers.ModelSerializer):
     def get_content_type(self, idea):
         return ContentType.objects.get_for_model(idea).id
 
+    def _get_user_state(self, idea):
+        """Return the user state from the per-request memo.
+
+        The memo covers all ideas of the list being serialized, so they are
+        computed together.
+        """
+        request = self.context.get("request")
+        if not request or not hasattr(request, "user"):
+            return None
+        if "idea_user_state" not in self.context:
+            if isinstance(self.parent, serializers.ListSerializer):
+                ideas = list(self.parent.instance)
+            else:
+                ideas = [idea]
+            self.context["idea_user_state"] = IdeaUserState(request.user, ideas)
+        return self.context["idea_user_state"]
+
     def get_user_rating(self, idea):
-        if "request" in self.context:
-            user = self.context["request"].user
-            if user.is_authenticated:
-                ct = ContentType.objects.get_for_model(idea)
-                ratings = Rating.objects.filter(
-                    content_type_id=ct.id, object_pk=idea.pk, creator=user
-                )
-                if ratings.exists():
-                    return RatingSerializer(ratings.first()).data
+        state = self._get_user_state(idea)
+        if state:
+            rating = state.get_rating(idea)
+            if rating:
+                return RatingSerializer(rating).data
         return None
 
     def get_has_rating_permission(self, idea):
-        request = self.context.get("request")
-        if request and hasattr(request, "user"):
-            user = request.user
-            return user.has_perm("a4_candy_ideas.rate_idea", idea)
+        state = self._get_user_state(idea)
+        if state:
+            return state.has_perm("a4_candy_ideas.rate_idea", idea)
         return False
 
     def get_has_commenting_permission(self, idea):
-        request = self.context.get("request")
-        if request and hasattr(request, "user"):
-            user = request.user
-            return user.has_perm("a4_candy_ideas.comment_idea", idea)
+        state = self._get_user_state(idea)
+        if state:
+            return state.has_perm("a4_candy_ideas.comment_idea", idea)
         return False
 
     def get_has_changing_permission(self, idea):
-        request = self.context.get("request")
-        if request and hasattr(request, "user"):
-            user = request.user
-            return user.has_perm("a4_candy_ideas.change_idea", idea)
+        state = self._get_user_state(idea)
+        if state:
+            return state.has_perm("a4_candy_ideas.change_idea", idea)
         return False
 
     def get_has_deleting_permission(self, idea):
-        request = self.context.get("request")
-        if request and hasattr(request, "user"):
-            user = request.user
-            return user.has_perm("a4_candy_ideas.delete_idea", idea)
+        state = self._get_user_state(idea)
+        if state:
+            return state.has_perm("a4_candy_ideas.delete_idea", idea)
         return False
 
     def create(self, validated_data):
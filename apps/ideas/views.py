@@ -14,8 +14,10 @@ from adhocracy4.projects.mixins import ProjectMixin
 from adhocracy4.rules import mixins as rules_mixins
 from apps.contrib import forms as contrib_forms
 from apps.contrib.views import CanonicalURLDetailView
+from apps.contrib.views import KeysetPaginationMixin
 from apps.contrib.widgets import AplusOrderingWidget
 from apps.contrib.widgets import FreeTextFilterWidget
+from apps.exports.views import ExportDashboardMixin
 from apps.moderatorfeedback.forms import ModeratorFeedbackForm
 from apps.moderatorfeedback.models import ModeratorFeedback
 from apps.notifications.emails import NotifyCreatorOnModeratorFeedback
@@ -46,19 +48,25 @@ class IdeaFilterSet(a4_filters.DefaultsFilterSet):
         fields = ["search", "category"]
 
 
-class AbstractIdeaListView(ProjectMixin, filter_views.FilteredListView):
+class AbstractIdeaListView(
+    ProjectMixin, KeysetPaginationMixin, filter_views.FilteredListView
+):
     paginate_by = 15
 
     def get_queryset(self):
         qs = super().get_queryset().filter(module=self.module)
-        if qs and not hasattr(qs.first(), "comment_count"):
-            return self.annotate_queryset(qs)
-        return qs
+        return self.annotate_queryset(qs)
 
     def annotate_queryset(self, qs):
-        qs = qs.annotate_comment_count()
+        # the ordering filter may have added some of the annotations already
+        annotations = qs.query.annotations
+        if "comment_count" not in annotations:
+            qs = qs.annotate_comment_count()
         if hasattr(qs, "annotate_positive_rating_count"):
-            qs = qs.annotate_positive_rating_count().annotate_negative_rating_count()
+            if "positive_rating_count" not in annotations:
+                qs = qs.annotate_positive_rating_count()
+            if "negative_rating_count" not in annotations:
+                qs = qs.annotate_negative_rating_count()
         return qs
 
 
@@ -213,9 +221,7 @@ class IdeaModerateView(AbstractIdeaModerateView):
     moderateable_form_class = forms.IdeaModerateForm
 
 
-class IdeaDashboardExportView(DashboardExportView):
-    template_name = "a4exports/export_dashboard.html"
-
+class IdeaDashboardExportView(ExportDashboardMixin, DashboardExportView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["export"] = reverse(
@@ -1,15 +1,24 @@
 import json
 
+from django.conf import settings
 from django.contrib.sessions.models import Session
+from django.db.models import Exists
+from django.db.models import OuterRef
+from django.db.models import Value
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import mixins
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.filters import OrderingFilter
+from rest_framework.response import Response
 
 from adhocracy4.api.mixins import ModuleMixin
 from adhocracy4.api.permissions import ViewSetRulesPermission
 
+from . import live
+from .like_buffer import like_buffer
 from .models import Like
 from .models import LiveQuestion
 from .serializers import LikeSerializer
@@ -36,18 +45,61 @@ class LiveQuestionViewSet(
     def get_permission_object(self):
         return self.module
 
+    @property
+    def is_moderator(self):
+        return self.request.user.has_perm(
+            "a4_candy_livequestions.moderate_livequestions", self.module
+        )
+
     def get_queryset(self):
+        session_key = self.request.session.session_key
+        if session_key:
+            session_like = Exists(
+                Like.objects.filter(livequestion=OuterRef("pk"), session=session_key)
+            )
+        else:
+            session_like = Value(False)
         live_questions = (
             LiveQuestion.objects.filter(module=self.module)
+            .select_related("category")
             .order_by("created")
             .annotate_like_count()
+            .annotate(session_like=session_like)
         )
-        if not self.request.user.has_perm(
-            "a4_candy_livequestions.moderate_livequestions", self.module
-        ):
+        if not self.is_moderator:
             live_questions = live_questions.filter(is_hidden=False)
         return live_questions
 
+    def list(self, request, *args, **kwargs):
+        # taken before the list is queried, so no change gets lost in between
+        cursor = live.get_feed(self.module.pk).current_cursor()
+        response = super().list(request, *args, **kwargs)
+        if like_buffer.enabled:
+            like_buffer.overlay(response.data, request.session.session_key)
+        response["X-Live-Cursor"] = cursor
+        return response
+
+    @action(detail=False)
+    def updates(self, request, **kwargs):
+        """Long-poll for the changes after the cursor of a previous response.
+
+        Answers as soon as something changed or after the wait time, right
+        away if too many requests of the process are waiting already. If the
+        response has no diff the client has to fetch the list again.
+        """
+        timeout = settings.LIVEQUESTION_UPDATES_TIMEOUT
+        try:
+            timeout = min(int(request.query_params["wait"]), timeout)
+        except (KeyError, ValueError):
+            pass
+        with live.waiting_slot() as may_wait:
+            cursor, diff = live.get_feed(self.module.pk).updates(
+                request.query_params.get("cursor"),
+                is_moderator=self.is_moderator,
+                timeout=max(timeout, 0) if may_wait else 0,
+            )
+        return Response({"cursor": cursor, "diff": diff})
+
     def dispatch(self, request, *args, **kwargs):
         if request.method == "POST":
             body = json.loads(request.body.decode("utf-8"))
@@ -72,8 +124,13 @@ class LikesViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
     def perform_create(self, serializer):
         if not self.request.session.session_key:
             self.request.session.create()
-        session = Session.objects.get(session_key=self.request.session.session_key)
         like_value = bool(self.request.data["value"])
+        if like_buffer.enabled:
+            like_buffer.add(
+                self.request.session.session_key, self.livequestion.pk, like_value
+            )
+            return
+        session = Session.objects.get(session_key=self.request.session.session_key)
         if like_value:
             serializer.save(session=session, livequestion=self.livequestion)
         elif Like.objects.filter(
@@ -81,6 +138,6 @@ class LikesViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
         ).exists():
             Like.objects.get(session=session, livequestion=self.livequestion).delete()
 
-    @property
+    @cached_property
     def livequestion(self):
         return get_object_or_404(LiveQuestion, pk=self.livequestion_pk)
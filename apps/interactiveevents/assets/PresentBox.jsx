@@ -2,11 +2,13 @@
 import $ from 'jquery'
 import React from 'react'
 import QuestionPresent from './QuestionPresent'
+import { applyDiff, pollUpdates } from './helpers.js'
 
 export default class PresentBox extends React.Component {
   constructor (props) {
     super(props)
 
+    this.cursor = null
     this.state = {
       questions: []
     }
@@ -20,18 +22,35 @@ export default class PresentBox extends React.Component {
   }
 
   getItems () {
+    this.cursor = null
     fetch(this.props.questions_api_url + '?is_live=1&is_answered=0')
-      .then(response => response.json())
+      .then(response => {
+        this.cursor = response.headers.get('X-Live-Cursor')
+        return response.json()
+      })
       .then(data => this.getListAndFooter(data))
   }
 
+  applyUpdates (diff, cursor) {
+    this.cursor = cursor
+    const questions = applyDiff(this.state.questions, diff)
+      .filter(question => question.is_live && !question.is_answered)
+      .sort((a, b) => a.id - b.id)
+    this.getListAndFooter(questions)
+  }
+
   componentDidMount () {
     this.getItems()
-    this.timer = setInterval(() => this.getItems(), 5000)
+    this.stopUpdates = pollUpdates(
+      this.props.questions_api_url,
+      () => this.cursor,
+      (diff, cursor) => this.applyUpdates(diff, cursor),
+      () => this.getItems()
+    )
   }
 
   componentWillUnmount () {
-    this.timer = null
+    this.stopUpdates()
   }
 
   displayFooterOrInfo () {
@@ -1,6 +1,6 @@
 import django from 'django'
 import React from 'react'
-import { updateItem } from './helpers.js'
+import { applyDiff, pollUpdates, updateItem } from './helpers.js'
 import QuestionForm from './QuestionForm'
 import QuestionList from './QuestionList'
 import InfoBox from './InfoBox'
@@ -18,6 +18,7 @@ export default class QuestionBox extends React.Component {
     super(props)
 
     this.restartPolling = this.restartPolling.bind(this)
+    this.cursor = null
 
     this.state = {
       questions: [],
@@ -37,11 +38,17 @@ export default class QuestionBox extends React.Component {
   }
 
   componentDidMount () {
-    this.restartPolling()
+    this.getItems()
+    this.stopUpdates = pollUpdates(
+      this.props.questions_api_url,
+      () => this.state.pollingPaused ? null : this.cursor,
+      (diff, cursor) => this.applyUpdates(diff, cursor),
+      () => this.restartPolling()
+    )
   }
 
   componentWillUnmount () {
-    this.timer = null
+    this.stopUpdates()
   }
 
   componentDidUpdate () {
@@ -134,20 +141,40 @@ export default class QuestionBox extends React.Component {
     return url
   }
 
+  sortQuestions (questions) {
+    if (this.state.orderedByLikes) {
+      return questions.sort((a, b) => b.likes.count - a.likes.count)
+    }
+    return questions.sort((a, b) => a.id - b.id)
+  }
+
+  setQuestions (questions) {
+    this.setState({
+      questions,
+      filteredQuestions: this.filterQuestions(questions),
+      answeredQuestions: this.getAnsweredQuestions(questions),
+      orderingChanged: false,
+      questionCount: this.filterQuestions(questions).length
+    })
+  }
+
   getItems () {
     if (!this.state.pollingPaused) {
+      this.cursor = null
       fetch(this.getUrl())
-        .then(response => response.json())
-        .then(data => this.setState({
-          questions: data,
-          filteredQuestions: this.filterQuestions(data),
-          answeredQuestions: this.getAnsweredQuestions(data),
-          orderingChanged: false,
-          questionCount: this.filterQuestions(data).length
-        }))
+        .then(response => {
+          this.cursor = response.headers.get('X-Live-Cursor')
+          return response.json()
+        })
+        .then(data => this.setQuestions(data))
     }
   }
 
+  applyUpdates (diff, cursor) {
+    this.cursor = cursor
+    this.setQuestions(this.sortQuestions(applyDiff(this.state.questions, diff)))
+  }
+
   updateQuestion (data, id) {
     this.setState({
       pollingPaused: true
@@ -168,6 +195,23 @@ export default class QuestionBox extends React.Component {
     const url = this.props.likes_api_url.replace('LIVEQUESTIONID', id)
     const data = { value }
     return updateItem(data, url, 'POST')
+      .then(response => {
+        if (response.ok) {
+          this.setSessionLike(id, value)
+        }
+        return response
+      })
+  }
+
+  setSessionLike (id, value) {
+    const questions = this.state.questions.map(question => {
+      if (question.id !== id) {
+        return question
+      }
+      const count = question.likes.count + (value ? 1 : -1)
+      return { ...question, likes: { count, session_like: value } }
+    })
+    this.setQuestions(questions)
   }
 
   togglePollingPaused () {
@@ -179,8 +223,6 @@ export default class QuestionBox extends React.Component {
 
   restartPolling () {
     this.getItems()
-    clearInterval(this.timer)
-    this.timer = setInterval(() => this.getItems(), 5000)
   }
 
   render () {
@@ -0,0 +1,29 @@
+import { applyDiff } from '../helpers.js'
+
+const question = (id, count, extra) => ({
+  id,
+  text: 'question ' + id,
+  is_hidden: false,
+  likes: { count, session_like: false },
+  ...extra
+})
+
+test('applyDiff merges new, changed, removed and liked questions', () => {
+  const questions = [
+    question(1, 0, { likes: { count: 0, session_like: true } }),
+    question(2, 3),
+    question(3, 1)
+  ]
+  const diff = {
+    new: [{ id: 4, text: 'question 4', likes: { count: 0 } }],
+    changed: [{ id: 1, text: 'changed', likes: { count: 2 } }],
+    removed: [3],
+    likes: [{ id: 2, delta: 2, count: 5 }]
+  }
+  const result = applyDiff(questions, diff)
+  expect(result.map(q => q.id)).toEqual([1, 2, 4])
+  expect(result[0].text).toBe('changed')
+  expect(result[0].likes).toEqual({ count: 2, session_like: true })
+  expect(result[1].likes).toEqual({ count: 5, session_like: false })
+  expect(result[2].likes).toEqual({ count: 0, session_like: false })
+})
@@ -1,5 +1,8 @@
 import cookie from 'js-cookie'
 
+// Milliseconds to wait before polling again after an answer without changes
+const EMPTY_POLL_DELAY = 2000
+
 export function updateItem (data, url, method) {
   return fetch(url, {
     headers: {
@@ -11,3 +14,86 @@ export function updateItem (data, url, method) {
   }
   )
 }
+
+// Merge the diff of the live question updates api into a list of questions.
+// The session likes are only known by the full list and are kept.
+export function applyDiff (questions, diff) {
+  const removed = new Set(diff.removed)
+  const changed = new Map()
+  diff.new.concat(diff.changed).forEach(question => changed.set(question.id, question))
+  const likes = new Map(diff.likes.map(like => [like.id, like.count]))
+
+  const result = []
+  questions.forEach(question => {
+    if (removed.has(question.id)) {
+      return
+    }
+    let updated = question
+    if (changed.has(question.id)) {
+      updated = changed.get(question.id)
+      changed.delete(question.id)
+    } else if (likes.has(question.id)) {
+      updated = { ...question, likes: { count: likes.get(question.id) } }
+    }
+    if (updated !== question) {
+      updated.likes = { ...updated.likes, session_like: question.likes.session_like }
+    }
+    result.push(updated)
+  })
+  changed.forEach(question => {
+    question.likes = { ...question.likes, session_like: false }
+    result.push(question)
+  })
+  return result
+}
+
+// Long-poll the live question updates api, call onDiff with every diff and
+// onReset whenever the full list has to be fetched again. Hidden pages do not
+// poll, so they do not keep a server thread busy. Answers without changes,
+// e.g. from a busy server not letting more requests wait, are followed by a
+// pause.
+export function pollUpdates (url, getCursor, onDiff, onReset) {
+  let stopped = false
+  let resets = 0
+  const controller = new AbortController()
+
+  const next = (delay) => {
+    if (!stopped) {
+      setTimeout(poll, delay)
+    }
+  }
+
+  const poll = () => {
+    const cursor = getCursor()
+    if (cursor === null || document.hidden) {
+      return next(1000)
+    }
+    fetch(url + 'updates/?cursor=' + encodeURIComponent(cursor), { signal: controller.signal })
+      .then(response => {
+        if (!response.ok) {
+          throw Error(response.statusText)
+        }
+        return response.json()
+      })
+      .then(data => {
+        if (data.diff === null) {
+          // back off if the server keeps answering without a diff
+          resets += 1
+          onReset()
+          next(Math.min((resets - 1) * 1000, 5000))
+        } else {
+          resets = 0
+          onDiff(data.diff, data.cursor)
+          const changed = Object.values(data.diff).some(list => list.length > 0)
+          next(changed ? 0 : EMPTY_POLL_DELAY)
+        }
+      })
+      .catch(() => next(5000))
+  }
+
+  poll()
+  return () => {
+    stopped = true
+    controller.abort()
+  }
+}
@@ -0,0 +1,148 @@
+"""Write-behind buffer for live question likes.
+
+With ``LIVEQUESTION_LIKE_BUFFER_INTERVAL`` set, likes and unlikes are kept in
+memory per (session, question) and written every that many milliseconds with
+one bulk insert, one delete and one insight update per project. Repeated
+clicks of a session on the same question within an interval coalesce into
+their last value. The buffer belongs to the process, so pending likes are
+lost if it is killed before the next flush.
+"""
+
+import atexit
+import operator
+import threading
+from collections import Counter
+from functools import reduce
+
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+from django.db.models import Q
+
+from apps import logger
+from apps.projects import insights
+
+from . import live
+from .models import Like
+from .models import LiveQuestion
+
+
+class LikeBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._timer = None
+
+    @property
+    def enabled(self):
+        return bool(settings.LIVEQUESTION_LIKE_BUFFER_INTERVAL)
+
+    def add(self, session, livequestion_id, value):
+        """Remember the like value, it is written with the next flush.
+
+        The first value of a session for a question is compared with the
+        stored like, so repeated clicks with the same value count once.
+        """
+        key = (session, livequestion_id)
+        with self._lock:
+            entry = self._pending.get(key)
+        # a pending value flushed in the meantime is the stored one
+        persisted = (
+            entry[1]
+            if entry
+            else Like.objects.filter(
+                session=session, livequestion_id=livequestion_id
+            ).exists()
+        )
+        with self._lock:
+            entry = self._pending.get(key)
+            previous = entry[0] if entry else persisted
+            self._pending[key] = (previous, value)
+            if self._timer is None:
+                interval = settings.LIVEQUESTION_LIKE_BUFFER_INTERVAL / 1000
+                self._timer = threading.Timer(interval, self.flush_logged)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def overlay(self, data, session):
+        """Apply the pending likes to serialized live questions."""
+        with self._lock:
+            if not self._pending:
+                return data
+            deltas = Counter()
+            session_likes = {}
+            for (like_session, question_id), (previous, value) in self._pending.items():
+                deltas[question_id] += int(value) - int(previous)
+                if like_session == session:
+                    session_likes[question_id] = value
+        for item in data:
+            likes = item["likes"]
+            likes["count"] = max(likes["count"] + deltas[item["id"]], 0)
+            likes["session_like"] = session_likes.get(item["id"], likes["session_like"])
+        return data
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not pending:
+            return
+
+        added = {key for key, (_, value) in pending.items() if value}
+        removed = {key for key, (_, value) in pending.items() if not value}
+        question_ids = {question_id for _, question_id in pending}
+        sessions = {session for session, _ in pending}
+
+        existing = set(
+            Like.objects.filter(
+                livequestion_id__in=question_ids, session__in=sessions
+            ).values_list("session", "livequestion_id")
+        )
+        projects = {
+            question.pk: question.module.project
+            for question in LiveQuestion.objects.filter(
+                pk__in={question_id for _, question_id in added}
+            ).select_related("module__project")
+        }
+        # questions may have been deleted in the meantime
+        created = {key for key in added - existing if key[1] in projects}
+        with transaction.atomic():
+            Like.objects.bulk_create(
+                [
+                    Like(session=session, livequestion_id=question_id)
+                    for session, question_id in created
+                ],
+                ignore_conflicts=True,
+            )
+            deleted = removed & existing
+            if deleted:
+                Like.objects.filter(
+                    reduce(
+                        operator.or_,
+                        (
+                            Q(session=session, livequestion_id=question_id)
+                            for session, question_id in deleted
+                        ),
+                    )
+                ).delete()
+
+            counts = Counter(projects[question_id] for _, question_id in created)
+            for project, count in counts.items():
+                insights.increase_counts(project, ratings=count)
+        for question_id in question_ids:
+            live.mark_question_stale(question_id)
+
+    def flush_logged(self):
+        """Flush outside of a request, e.g. from the timer thread."""
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Writing buffered live question likes failed")
+        finally:
+            connection.close()
+
+
+like_buffer = LikeBuffer()
+atexit.register(like_buffer.flush_logged)
@@ -0,0 +1,331 @@
+"""Fan-out of live question changes shared by all processes.
+
+The serialized questions of a watched module and a short log of what changed
+between their versions are kept in the cache, so every process can answer
+with the diff since any cursor. The state is refreshed with a single query
+once it is stale, either because a question or like was saved or because
+``LIVEQUESTION_FEED_TTL`` seconds passed. Only one process refreshes it at a
+time, the others check the version in the cache every
+``HEAD_CHECK_INTERVAL`` seconds. Within a process all viewers of the module
+wait on one feed, so neither database nor cache load grows with the number
+of viewers.
+
+Every waiting update request holds a thread, so at most
+``LIVEQUESTION_UPDATES_MAX_WAITING`` of them wait per process, the others are
+answered right away and their clients poll again after a pause.
+"""
+
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import LiveQuestion
+
+NEW = "new"
+CHANGED = "changed"
+REMOVED = "removed"
+LIKES = "likes"
+
+# Number of versions kept per feed, older cursors get a reset
+LOG_SIZE = 500
+# Feeds nobody asked for within this many seconds are dropped
+IDLE_TIMEOUT = 600
+# Lower bound for waiting between two checks of a feed
+MIN_REFRESH_INTERVAL = 0.1
+# Seconds between two checks of the version in the cache
+HEAD_CHECK_INTERVAL = 0.5
+# Seconds a process may take to refresh a feed before another one takes over
+REFRESH_LOCK_TIMEOUT = 10
+
+_feeds = {}
+_feeds_lock = threading.Lock()
+_waiting = 0
+_waiting_lock = threading.Lock()
+
+
+def _head_key(module_id):
+    return "livequestion-feed-head:{}".format(module_id)
+
+
+def _state_key(module_id):
+    return "livequestion-feed:{}".format(module_id)
+
+
+def _dirty_key(module_id):
+    return "livequestion-feed-dirty:{}".format(module_id)
+
+
+def _lock_key(module_id):
+    return "livequestion-feed-lock:{}".format(module_id)
+
+
+def serialize_question(question):
+    """Mirror LiveQuestionSerializer without the session dependent fields."""
+    return {
+        "id": question.pk,
+        "text": question.text,
+        "category": str(question.category) if question.category else None,
+        "is_answered": question.is_answered,
+        "is_on_shortlist": question.is_on_shortlist,
+        "is_hidden": question.is_hidden,
+        "is_live": question.is_live,
+        "likes": {"count": question.like_count},
+    }
+
+
+def _without_likes(data):
+    return {key: value for key, value in data.items() if key != "likes"}
+
+
+def _refreshed_state(module_id, state):
+    """Query the questions and return the state with their changes logged."""
+    questions = {
+        question.pk: serialize_question(question)
+        for question in LiveQuestion.objects.filter(module_id=module_id)
+        .select_related("category")
+        .annotate_like_count()
+    }
+    if state is None:
+        return {
+            "epoch": uuid.uuid4().hex[:8],
+            "version": 0,
+            "questions": questions,
+            "log": [],
+            "refreshed": time.time(),
+        }
+
+    old_questions = state["questions"]
+    changes = []
+    for pk, data in questions.items():
+        old = old_questions.get(pk)
+        if old is None:
+            changes.append((pk, NEW, 0))
+        elif _without_likes(old) != _without_likes(data):
+            changes.append((pk, CHANGED, 0))
+        elif old["likes"] != data["likes"]:
+            delta = data["likes"]["count"] - old["likes"]["count"]
+            changes.append((pk, LIKES, delta))
+    for pk in old_questions.keys() - questions.keys():
+        changes.append((pk, REMOVED, 0))
+
+    version = state["version"]
+    log = state["log"]
+    if changes:
+        version += 1
+        log = (log + [(version, changes)])[-LOG_SIZE:]
+    return {
+        "epoch": state["epoch"],
+        "version": version,
+        "questions": questions,
+        "log": log,
+        "refreshed": time.time(),
+    }
+
+
+def _sync_state(module_id, force_refresh):
+    """Return the head and state in the cache, refreshed first if stale.
+
+    The state is None if it does not exist yet and another process is
+    creating it.
+    """
+    head = cache.get(_head_key(module_id))
+    is_stale = (
+        force_refresh
+        or head is None
+        or cache.get(_dirty_key(module_id))
+        or time.time() - head[2] >= settings.LIVEQUESTION_FEED_TTL
+    )
+    if is_stale and cache.add(_lock_key(module_id), True, REFRESH_LOCK_TIMEOUT):
+        try:
+            # changes saved from now on mark the state dirty again
+            cache.delete(_dirty_key(module_id))
+            state = _refreshed_state(module_id, cache.get(_state_key(module_id)))
+            cache.set(_state_key(module_id), state, IDLE_TIMEOUT)
+            head = (state["epoch"], state["version"], state["refreshed"])
+            cache.set(_head_key(module_id), head, IDLE_TIMEOUT)
+            return head, state
+        finally:
+            cache.delete(_lock_key(module_id))
+    return head, None
+
+
+class LiveQuestionFeed:
+    def __init__(self, module_id):
+        self.module_id = module_id
+        self.condition = threading.Condition()
+        self.questions = {}
+        self.epoch = None
+        self.version = 0
+        self.log = []
+        self.checked = None
+        self.syncing = False
+        self.stale = True
+        self.last_used = time.monotonic()
+
+    @property
+    def cursor(self):
+        return "{}:{}".format(self.epoch, self.version)
+
+    def mark_stale(self):
+        with self.condition:
+            self.stale = True
+            self.condition.notify_all()
+
+    def _time_to_sync(self):
+        if self.stale or self.checked is None or self.epoch is None:
+            return 0
+        return self.checked + HEAD_CHECK_INTERVAL - time.monotonic()
+
+    def _sync(self):
+        """Take over changes from the cache, refresh it first if stale.
+
+        Only one thread of the process syncs at a time and it does not hold
+        the condition while talking to the cache and database, so the other
+        viewers keep being answered from the current state meanwhile.
+        """
+        with self.condition:
+            if self.syncing or self._time_to_sync() > 0:
+                return
+            self.syncing = True
+            force_refresh = self.stale
+            self.stale = False
+
+        state = None
+        try:
+            head, state = _sync_state(self.module_id, force_refresh)
+            if state is None and head and head[:2] != (self.epoch, self.version):
+                state = cache.get(_state_key(self.module_id))
+        finally:
+            with self.condition:
+                if state is not None:
+                    self.epoch = state["epoch"]
+                    self.version = state["version"]
+                    self.questions = state["questions"]
+                    self.log = state["log"]
+                self.checked = time.monotonic()
+                self.syncing = False
+                self.condition.notify_all()
+
+    def _is_visible(self, data, is_moderator):
+        return data is not None and (is_moderator or not data["is_hidden"])
+
+    def _changes_since(self, version, is_moderator):
+        first_kinds = {}
+        like_deltas = {}
+        for changed_version, changes in self.log:
+            if changed_version <= version:
+                continue
+            for pk, kind, delta in changes:
+                if kind == LIKES:
+                    like_deltas[pk] = like_deltas.get(pk, 0) + delta
+                else:
+                    first_kinds.setdefault(pk, kind)
+
+        diff = {NEW: [], CHANGED: [], REMOVED: [], LIKES: []}
+        for pk, kind in first_kinds.items():
+            data = self.questions.get(pk)
+            if self._is_visible(data, is_moderator):
+                diff[NEW if kind == NEW else CHANGED].append(data)
+            elif kind != NEW:
+                diff[REMOVED].append(pk)
+        for pk, delta in like_deltas.items():
+            data = self.questions.get(pk)
+            if delta and pk not in first_kinds and self._is_visible(data, is_moderator):
+                diff[LIKES].append(
+                    {"id": pk, "delta": delta, "count": data["likes"]["count"]}
+                )
+        return diff
+
+    def _parse_cursor(self, cursor):
+        epoch, _, version = (cursor or "").partition(":")
+        try:
+            return epoch, int(version)
+        except ValueError:
+            return epoch, None
+
+    def updates(self, cursor, is_moderator=False, timeout=0):
+        """Wait up to timeout seconds for changes after the given cursor.
+
+        Returns the new cursor and the diff since the old one. The diff is
+        None if the cursor is unknown or too old, then the client has to
+        fetch the full list again.
+        """
+        epoch, version = self._parse_cursor(cursor)
+        deadline = time.monotonic() + timeout
+        while True:
+            self._sync()
+            with self.condition:
+                self.last_used = time.monotonic()
+                remaining = deadline - time.monotonic()
+                is_current = epoch == self.epoch and version == self.version
+                if self.epoch is not None and (not is_current or remaining <= 0):
+                    return self.cursor, self._diff(epoch, version, is_moderator)
+                if remaining <= 0:
+                    return self.cursor, None
+                self.condition.wait(
+                    min(remaining, max(self._time_to_sync(), MIN_REFRESH_INTERVAL))
+                )
+
+    def _diff(self, epoch, version, is_moderator):
+        if epoch != self.epoch or version is None or version > self.version:
+            return None
+        if version < self.version and (not self.log or self.log[0][0] > version + 1):
+            return None
+        return self._changes_since(version, is_moderator)
+
+    def current_cursor(self):
+        self._sync()
+        with self.condition:
+            self.last_used = time.monotonic()
+            return self.cursor
+
+
+def get_feed(module_id):
+    with _feeds_lock:
+        feed = _feeds.get(module_id)
+        if feed is None:
+            idle_since = time.monotonic() - IDLE_TIMEOUT
+            for key in [key for key, f in _feeds.items() if f.last_used < idle_since]:
+                del _feeds[key]
+            feed = _feeds[module_id] = LiveQuestionFeed(module_id)
+        return feed
+
+
+@contextmanager
+def waiting_slot():
+    """Yield whether one more update request of the process may wait."""
+    global _waiting
+    with _waiting_lock:
+        may_wait = _waiting < settings.LIVEQUESTION_UPDATES_MAX_WAITING
+        if may_wait:
+            _waiting += 1
+    try:
+        yield may_wait
+    finally:
+        if may_wait:
+            with _waiting_lock:
+                _waiting -= 1
+
+
+def mark_module_stale(module_id):
+    cache.set(_dirty_key(module_id), True, IDLE_TIMEOUT)
+    feed = _feeds.get(module_id)
+    if feed is not None:
+        feed.mark_stale()
+
+
+def mark_question_stale(question_id):
+    # changes to modules not watched in this process are picked up after
+    # LIVEQUESTION_FEED_TTL by the process watching them
+    for feed in list(_feeds.values()):
+        if question_id in feed.questions:
+            mark_module_stale(feed.module_id)
+
+
+def clear():
+    with _feeds_lock:
+        _feeds.clear()
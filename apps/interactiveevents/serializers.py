@@ -16,10 +16,13 @@ class LiveQuestionSerializer(serializers.ModelSerializer):
         exclude = ("module", "created", "modified")
 
     def get_likes(self, livequestion):
-        session = self.context["request"].session.session_key
-        session_like = bool(
-            livequestion.livequestion_likes.filter(session=session).first()
-        )
+        if hasattr(livequestion, "session_like"):
+            session_like = livequestion.session_like
+        else:
+            session = self.context["request"].session.session_key
+            session_like = livequestion.livequestion_likes.filter(
+                session=session
+            ).exists()
         if hasattr(livequestion, "like_count"):
             like_count = livequestion.like_count
         else:
@@ -0,0 +1,21 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import signals
+from django.dispatch import receiver
+
+from . import live
+from .models import Like
+from .models import LiveQuestion
+
+
+@receiver(signals.post_save, sender=LiveQuestion)
+@receiver(signals.post_delete, sender=LiveQuestion)
+def mark_module_feed_stale(sender, instance, **kwargs):
+    transaction.on_commit(partial(live.mark_module_stale, instance.module_id))
+
+
+@receiver(signals.post_save, sender=Like)
+@receiver(signals.post_delete, sender=Like)
+def mark_question_feed_stale(sender, instance, **kwargs):
+    transaction.on_commit(partial(live.mark_question_stale, instance.livequestion_id))
@@ -5,12 +5,14 @@ from rules.contrib.views import PermissionRequiredMixin
 from adhocracy4.comments.models import Comment
 from adhocracy4.exports import mixins
 from adhocracy4.exports import views as a4_export_views
+from apps.exports import mixins as export_mixins
 
 from . import models
 
 
 class MapIdeaExportView(
     PermissionRequiredMixin,
+    export_mixins.StreamingExportMixin,
     mixins.ItemExportWithReferenceNumberMixin,
     mixins.ItemExportWithLinkMixin,
     mixins.ExportModelFieldsMixin,
@@ -28,6 +30,13 @@ class MapIdeaExportView(
     fields = ["name", "description"]
     html_fields = ["description"]
     permission_required = "a4_candy_mapideas.moderate_mapidea"
+    export_select_related = (
+        "creator",
+        "category",
+        "moderator_feedback_text",
+        "module__project__organisation",
+    )
+    export_prefetch_related = ("labels",)
 
     def get_queryset(self):
         return (
@@ -49,6 +58,7 @@ class MapIdeaExportView(
 
 class MapIdeaCommentExportView(
     PermissionRequiredMixin,
+    export_mixins.StreamingExportMixin,
     mixins.ItemExportWithLinkMixin,
     mixins.ExportModelFieldsMixin,
     mixins.UserGeneratedContentExportMixin,
@@ -62,6 +72,7 @@ class MapIdeaCommentExportView(
 
     fields = ["id", "comment", "created"]
     permission_required = "a4_candy_mapideas.moderate_mapidea"
+    export_select_related = ("creator",)
 
     def get_queryset(self):
         comments = Comment.objects.filter(
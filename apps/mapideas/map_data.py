@@ -0,0 +1,174 @@
+"""Compact GeoJSON of the points of a map idea or proposal module.
+
+The features only carry what the map needs to plot a point, details are
+loaded from the item pages. Below ``CLUSTER_MAX_ZOOM`` points are merged
+into clusters on a grid of ``CLUSTER_CELLS`` cells per web mercator tile, so
+modules with many points stay cheap to transfer and to draw.
+"""
+
+import hashlib
+import json
+import math
+
+from django.db.models import Count
+from django.db.models import Max
+from django.db.models import Q
+
+from adhocracy4.categories.models import Category
+from adhocracy4.comments.models import Comment
+from adhocracy4.ratings.models import Rating
+
+CLUSTER_MAX_ZOOM = 16
+CLUSTER_CELLS = 4
+CHUNK_SIZE = 2000
+
+
+def get_etag(model, module):
+    """Return an etag changing with the points and their counts.
+
+    Computed from a few aggregates, so a conditional request does not need
+    to load the points.
+    """
+    items = model.objects.filter(module=module).aggregate(
+        Count("pk"), Max("created"), Max("modified")
+    )
+    ratings_query = model._meta.get_field("ratings").related_query_name()
+    ratings = Rating.objects.filter(**{ratings_query + "__module": module}).aggregate(
+        Count("pk"), Max("modified")
+    )
+    # covers replies as well, at the price of changing with other modules
+    comments = Comment.objects.filter(root_project__project=module.project).aggregate(
+        Count("pk"), Max("created"), Max("modified")
+    )
+    categories = list(
+        Category.objects.filter(module=module).order_by("pk").values_list("pk", "name")
+    )
+    state = repr(
+        (
+            sorted(items.items()),
+            sorted(ratings.items()),
+            sorted(comments.items()),
+            categories,
+        )
+    )
+    return hashlib.sha256(state.encode()).hexdigest()[:32]
+
+
+def parse_bbox(value):
+    """Parse 'west,south,east,north' into floats, raise ValueError if invalid."""
+    west, south, east, north = (float(part) for part in value.split(","))
+    if not all(map(math.isfinite, (west, south, east, north))):
+        raise ValueError("bbox has to be finite")
+    return west, south, east, north
+
+
+def _coordinates(point):
+    if isinstance(point, str):
+        point = json.loads(point)
+    try:
+        lng, lat = point["geometry"]["coordinates"][:2]
+        return float(lng), float(lat)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def filter_bbox(queryset, bbox):
+    """Filter the queryset to the points in the bbox within the database."""
+    west, south, east, north = bbox
+    lng = "point__geometry__coordinates__0"
+    lat = "point__geometry__coordinates__1"
+    queryset = queryset.filter(**{lat + "__gte": south, lat + "__lte": north})
+    if west <= east:
+        return queryset.filter(**{lng + "__gte": west, lng + "__lte": east})
+    # bbox crossing the antimeridian
+    return queryset.filter(Q(**{lng + "__gte": west}) | Q(**{lng + "__lte": east}))
+
+
+def get_points(queryset, bbox=None, get_url=None, with_ratings=True):
+    """Yield the properties of all points in the bbox, queried in chunks.
+
+    get_url is called with the pk and creation date of each point in the bbox.
+    The rating counts are left out if with_ratings is False.
+    """
+    fields = ["pk", "point", "name", "created", "category__name", "comment_count"]
+    if with_ratings:
+        fields += ["positive_rating_count", "negative_rating_count"]
+    if bbox:
+        queryset = filter_bbox(queryset, bbox)
+    rows = queryset.values_list(*fields).order_by()
+    for pk, point, name, created, category, comments, *ratings in rows.iterator(
+        chunk_size=CHUNK_SIZE
+    ):
+        coordinates = _coordinates(point)
+        if coordinates is None:
+            continue
+        properties = {
+            "id": pk,
+            "coordinates": coordinates,
+            "name": name,
+            "category": category,
+            "comment_count": comments,
+        }
+        if get_url:
+            properties["url"] = get_url(pk, created)
+        if with_ratings:
+            positive, negative = ratings
+            properties["positive_rating_count"] = positive
+            properties["negative_rating_count"] = negative
+        yield properties
+
+
+def _tile_cell(lng, lat, zoom):
+    scale = 2**zoom * CLUSTER_CELLS
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = (lng + 180) / 360 * scale
+    y = (1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * scale
+    return int(x), int(y)
+
+
+def cluster(points, zoom):
+    """Merge points sharing a grid cell at the zoom level into clusters."""
+    cells = {}
+    for point in points:
+        lng, lat = point["coordinates"]
+        cell = cells.get(_tile_cell(lng, lat, zoom))
+        if cell is None:
+            cells[_tile_cell(lng, lat, zoom)] = [point, 1, lng, lat]
+        else:
+            cell[1] += 1
+            cell[2] += lng
+            cell[3] += lat
+    for point, count, lng_sum, lat_sum in cells.values():
+        if count == 1:
+            yield point
+        else:
+            yield {
+                "cluster": True,
+                "count": count,
+                "coordinates": (lng_sum / count, lat_sum / count),
+            }
+
+
+def to_feature(point):
+    properties = {key: value for key, value in point.items() if key != "coordinates"}
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": list(point["coordinates"])},
+        "properties": properties,
+    }
+
+
+def stream_feature_collection(points):
+    """Yield the feature collection as JSON in pieces."""
+    yield '{"type":"FeatureCollection","features":['
+    features = []
+    separator = ""
+    for point in points:
+        features.append(json.dumps(to_feature(point), separators=(",", ":")))
+        if len(features) == CHUNK_SIZE:
+            yield separator + ",".join(features)
+            features = []
+            separator = ","
+    if features:
+        yield separator + ",".join(features)
+    yield "]}"
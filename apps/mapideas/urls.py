@@ -18,6 +18,11 @@ urlpatterns = [
         views.MapIdeaCreateView.as_view(),
         name="mapidea-create",
     ),
+    re_path(
+        r"^module/(?P<module_slug>[-\w_]+)/map-data/$",
+        views.MapIdeaMapDataView.as_view(),
+        name="mapidea-map-data",
+    ),
     re_path(
         r"^(?P<year>\d{4})-(?P<pk>\d+)/update/$",
         views.MapIdeaUpdateView.as_view(),
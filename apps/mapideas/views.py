@@ -1,15 +1,25 @@
+from django.http import HttpResponseBadRequest
+from django.http import StreamingHttpResponse
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_cache_control
+from django.utils.http import quote_etag
 from django.utils.translation import gettext_lazy as _
+from django.views import generic
 
 from adhocracy4.categories import filters as category_filters
 from adhocracy4.exports.views import DashboardExportView
 from adhocracy4.filters import filters as a4_filters
 from adhocracy4.projects.mixins import DisplayProjectOrModuleMixin
+from adhocracy4.projects.mixins import ProjectMixin
+from adhocracy4.rules import mixins as rules_mixins
 from apps.contrib.widgets import AplusOrderingWidget
+from apps.exports.views import ExportDashboardMixin
 from apps.ideas import views as idea_views
 from apps.organisations.mixins import UserFormViewMixin
 
 from . import forms
+from . import map_data
 from . import models
 
 
@@ -39,10 +49,92 @@ class MapIdeaListView(idea_views.AbstractIdeaListView, DisplayProjectOrModuleMix
 
     def dispatch(self, request, **kwargs):
         self.mode = request.GET.get("mode", "map")
-        if self.mode == "map":
-            self.paginate_by = 0
         return super().dispatch(request, **kwargs)
 
+    def get_queryset(self):
+        if self.mode == "map":
+            # the map loads its points from the map data view
+            return super().get_queryset().none()
+        return super().get_queryset()
+
+
+class AbstractMapDataView(
+    ProjectMixin, rules_mixins.PermissionRequiredMixin, generic.View
+):
+    """Points of a module as compact GeoJSON for the map.
+
+    Takes an optional ``bbox`` (west,south,east,north) and ``zoom``, below
+    map_data.CLUSTER_MAX_ZOOM nearby points are returned as clusters.
+    """
+
+    permission_required = None
+    detail_url_name = None
+
+    def get_permission_object(self):
+        return self.module
+
+    @property
+    def with_ratings(self):
+        return self.module.has_feature("rate", self.model)
+
+    def get_queryset(self):
+        qs = self.model.objects.filter(module=self.module)
+        category = self.request.GET.get("category", "")
+        if category.isdigit():
+            qs = qs.filter(category_id=category)
+        qs = qs.annotate_comment_count()
+        if self.with_ratings:
+            qs = qs.annotate_positive_rating_count().annotate_negative_rating_count()
+        return qs
+
+    def get_item_url(self, pk, created):
+        return reverse(
+            self.detail_url_name,
+            kwargs=dict(
+                organisation_slug=self.project.organisation.slug,
+                pk="{:05d}".format(pk),
+                year=created.year,
+            ),
+        )
+
+    def get(self, request, *args, **kwargs):
+        try:
+            bbox = request.GET.get("bbox")
+            bbox = map_data.parse_bbox(bbox) if bbox else None
+            zoom = request.GET.get("zoom")
+            zoom = int(zoom) if zoom else None
+        except ValueError:
+            return HttpResponseBadRequest("Invalid bbox or zoom.")
+        if zoom is not None and not 0 <= zoom <= 30:
+            return HttpResponseBadRequest("Invalid bbox or zoom.")
+
+        etag = map_data.get_etag(self.model, self.module)
+        # the ratings are shown depending on the phase
+        etag = quote_etag("{}-{:d}".format(etag, self.with_ratings))
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            points = map_data.get_points(
+                self.get_queryset(),
+                bbox,
+                get_url=self.get_item_url,
+                with_ratings=self.with_ratings,
+            )
+            if zoom is not None and zoom < map_data.CLUSTER_MAX_ZOOM:
+                points = map_data.cluster(points, zoom)
+            response = StreamingHttpResponse(
+                map_data.stream_feature_collection(points),
+                content_type="application/geo+json",
+            )
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class MapIdeaMapDataView(AbstractMapDataView):
+    model = models.MapIdea
+    permission_required = "a4_candy_mapideas.view_mapidea"
+    detail_url_name = "a4_candy_mapideas:mapidea-detail"
+
 
 class MapIdeaDetailView(idea_views.AbstractIdeaDetailView):
     model = models.MapIdea
@@ -80,9 +172,7 @@ class MapIdeaModerateView(idea_views.AbstractIdeaModerateView):
     moderateable_form_class = forms.MapIdeaModerateForm
 
 
-class MapIdeaDashboardExportView(DashboardExportView):
-    template_name = "a4exports/export_dashboard.html"
-
+class MapIdeaDashboardExportView(ExportDashboardMixin, DashboardExportView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["export"] = reverse(
@@ -0,0 +1,174 @@
+/* Shows the points of a map list, loaded from its map data url.
+ *
+ * Only the points and clusters within the visible part of the map are
+ * requested, again after each move. The filters of the page are passed on,
+ * so the map shows the same items as the list.
+ */
+
+/* global django */
+import { maps } from 'adhocracy4'
+
+const RELOAD_DELAY = 250
+
+const polygonStyle = {
+  color: '#0076ae',
+  weight: 2,
+  opacity: 1,
+  fillOpacity: 0.2
+}
+
+function getBaseBounds (L, polygon, bbox) {
+  if (polygon) {
+    const layer = L.geoJson(polygon)
+    if (layer.getLayers().length > 0) {
+      return layer.getBounds()
+    }
+  }
+  return bbox
+}
+
+function escapeHtml (text) {
+  const div = document.createElement('div')
+  div.textContent = text
+  return div.innerHTML
+}
+
+function createPopup (properties) {
+  const counts = []
+  if (properties.positive_rating_count !== undefined) {
+    counts.push(
+      '<span class="map-popup-upvotes"><i class="fa fa-chevron-up" aria-hidden="true"></i> ' +
+      properties.positive_rating_count + '</span>',
+      '<span class="map-popup-downvotes"><i class="fa fa-chevron-down" aria-hidden="true"></i> ' +
+      properties.negative_rating_count + '</span>'
+    )
+  }
+  counts.push(
+    '<span class="map-popup-comments-count"><i class="far fa-comment" aria-hidden="true"></i> ' +
+    properties.comment_count + '</span>'
+  )
+  return '<div class="maps-popups-popup-text-content">' +
+    '<div class="maps-popups-popup-name">' +
+    '<a href="' + escapeHtml(properties.url) + '">' + escapeHtml(properties.name) + '</a>' +
+    '</div>' +
+    '<div class="maps-popups-popup-meta">' + counts.join('') + '</div>' +
+    '</div>'
+}
+
+function createMarker (L, feature, latlng, map, pinIcon) {
+  const properties = feature.properties
+  if (properties.cluster) {
+    const marker = L.marker(latlng, {
+      icon: L.divIcon({
+        html: '<div><span>' + properties.count + '</span></div>',
+        className: 'marker-cluster',
+        iconSize: L.point(40, 40)
+      }),
+      title: django.interpolate(django.gettext('%s items'), [properties.count])
+    })
+    marker.on('click', function () {
+      map.setView(latlng, map.getZoom() + 2)
+    })
+    return marker
+  }
+  return L.marker(latlng, { icon: pinIcon })
+    .bindPopup(createPopup(properties))
+}
+
+function init () {
+  const L = window.L
+
+  document.querySelectorAll('[data-map-data-url]').forEach(function (list) {
+    const e = list.querySelector('[data-map="display_points"]')
+    const polygon = JSON.parse(e.getAttribute('data-polygon'))
+    const bbox = JSON.parse(e.getAttribute('data-bbox'))
+    const url = list.getAttribute('data-map-data-url')
+    const pinIcon = L.icon({
+      iconUrl: list.getAttribute('data-pin-icon'),
+      shadowUrl: list.getAttribute('data-pin-shadow'),
+      iconSize: [30, 36],
+      iconAnchor: [15, 36],
+      shadowSize: [40, 54],
+      shadowAnchor: [20, 54],
+      popupAnchor: [0, -36]
+    })
+
+    const map = maps.createMap(L, e, {
+      baseUrl: e.getAttribute('data-baseurl'),
+      useVectorMap: e.getAttribute('data-usevectormap'),
+      attribution: e.getAttribute('data-attribution'),
+      mapboxToken: e.getAttribute('data-mapbox-token'),
+      omtToken: e.getAttribute('data-omt-token'),
+      zoomControl: false,
+      minZoom: 2
+    })
+
+    if (polygon) {
+      L.geoJson(polygon, { style: polygonStyle, interactive: false }).addTo(map)
+    }
+    const points = L.featureGroup().addTo(map)
+
+    const zoomIn = document.getElementById('zoom-in')
+    const zoomOut = document.getElementById('zoom-out')
+    const updateZoomControls = function () {
+      zoomIn.classList.toggle('leaflet-disabled', map.getZoom() >= map.getMaxZoom())
+      zoomOut.classList.toggle('leaflet-disabled', map.getZoom() <= map.getMinZoom())
+    }
+    zoomIn.addEventListener('click', function (event) {
+      event.preventDefault()
+      map.zoomIn()
+    })
+    zoomOut.addEventListener('click', function (event) {
+      event.preventDefault()
+      map.zoomOut()
+    })
+
+    let controller = null
+    let timeout = null
+    const load = function () {
+      if (controller) {
+        controller.abort()
+      }
+      controller = new AbortController()
+      const bounds = map.getBounds()
+      // the list filters, e.g. category and ordering
+      const params = new URLSearchParams(window.location.search)
+      params.delete('mode')
+      params.set('bbox', [
+        bounds.getWest(), bounds.getSouth(), bounds.getEast(), bounds.getNorth()
+      ].join(','))
+      params.set('zoom', Math.round(map.getZoom()))
+      fetch(url + '?' + params.toString(), { signal: controller.signal })
+        .then(function (response) {
+          if (!response.ok) {
+            throw new Error(response.statusText)
+          }
+          return response.json()
+        })
+        .then(function (data) {
+          points.clearLayers()
+          L.geoJson(data, {
+            pointToLayer: function (feature, latlng) {
+              return createMarker(L, feature, latlng, map, pinIcon)
+            }
+          }).eachLayer(function (layer) {
+            points.addLayer(layer)
+          })
+        })
+        .catch(function (error) {
+          if (error.name !== 'AbortError') {
+            console.error(error)
+          }
+        })
+    }
+
+    map.on('moveend', function () {
+      updateZoomControls()
+      clearTimeout(timeout)
+      timeout = setTimeout(load, RELOAD_DELAY)
+    })
+    map.fitBounds(getBaseBounds(L, polygon, bbox))
+  })
+}
+
+document.addEventListener('DOMContentLoaded', init, false)
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.utils.translation import gettext_lazy as _
 
 from adhocracy4.projects.admin import ProjectAdminFilter
 
@@ -10,3 +11,16 @@ class NewsletterAdmin(admin.ModelAdmin):
     list_display = ("subject", "sent", "project", "organisation")
     list_filter = ("project__organisation", "project__is_archived", ProjectAdminFilter)
     date_hierarchy = "sent"
+
+
+@admin.register(models.NewsletterDispatch)
+class NewsletterDispatchAdmin(admin.ModelAdmin):
+    list_display = ("newsletter", "created", "finished", "progress")
+    readonly_fields = ("newsletter", "email_class", "finished", "progress")
+    exclude = ("email_kwargs",)
+
+    @admin.display(description=_("Progress"))
+    def progress(self, obj):
+        return "{sent} sent, {failed} failed, {pending} pending".format(
+            **obj.get_progress()
+        )
@@ -3,23 +3,78 @@ from django.conf import settings
 from django.contrib import auth
 
 from adhocracy4.emails.mixins import ReportToAdminEmailMixin
+from apps import logger
 from apps.users.emails import EmailAplus as Email
 
+from . import models
+from . import tasks
+
 Organisation = apps.get_model(settings.A4_ORGANISATIONS_MODEL)
 User = auth.get_user_model()
 
 
 class NewsletterEmail(ReportToAdminEmailMixin, Email):
     template_name = "a4_candy_newsletters/emails/newsletter_email"
+    use_render_cache = True
+
+    @classmethod
+    def send(cls, object, *args, **kwargs):
+        """Send the newsletter in chunks of receivers.
+
+        The chunks are sent by background tasks, see `tasks.send_newsletter`.
+        NOTE: kwargs must be JSON serializable.
+        """
+        dispatch = models.NewsletterDispatch.objects.create(
+            newsletter=object, email_class=cls.__name__, email_kwargs=kwargs
+        )
+        tasks.send_newsletter.delay(dispatch.pk)
+        return []
 
     def dispatch(self, object, *args, **kwargs):
+        kwargs["organisation"] = self._pop_organisation(kwargs)
+        return super().dispatch(object, *args, **kwargs)
+
+    def dispatch_iter(self, object, receiver_ids, **kwargs):
+        """Send the newsletter to the receivers with the given ids.
+
+        Yields `(receiver, sent)` after every mail, so the caller can
+        record the progress before the next one is sent.
+        """
+        self.prepare(object, **kwargs)
+        receivers = list(
+            self.get_receivers().filter(id__in=receiver_ids).order_by("id")
+        )
+        self.resolve_languages(receivers)
+
+        context = self.get_context()
+        context.update(self.kwargs)
+        attachments = self.get_attachments()
+
+        for receiver in receivers:
+            try:
+                self.send_to(receiver, context, attachments)
+            except Exception:
+                logger.exception(
+                    "sending newsletter failed: {} {}".format(object.pk, receiver.pk)
+                )
+                yield receiver, False
+            else:
+                yield receiver, True
+
+    def get_receiver_ids(self, object, **kwargs):
+        self.prepare(object, **kwargs)
+        return self.get_receivers().order_by("id").values_list("id", flat=True)
+
+    def prepare(self, object, **kwargs):
+        kwargs["organisation"] = self._pop_organisation(kwargs)
+        self.object = object
+        self.kwargs = kwargs
+
+    def _pop_organisation(self, kwargs):
         organisation_pk = kwargs.pop("organisation_pk", None)
-        organisation = None
         if organisation_pk:
-            organisation = Organisation.objects.get(pk=organisation_pk)
-        kwargs["organisation"] = organisation
-
-        return super().dispatch(object, *args, **kwargs)
+            return Organisation.objects.get(pk=organisation_pk)
+        return None
 
     def get_reply_to(self):
         return [self.object.sender]
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from apps.newsletters.models import NewsletterDispatch
+from apps.newsletters.tasks import send_newsletter
+
+
+class Command(BaseCommand):
+    help = (
+        "Resume sending all newsletters which have not been sent completely, "
+        "e.g. after a worker crashed. Already sent receivers are skipped."
+    )
+
+    def handle(self, *args, **options):
+        dispatches = NewsletterDispatch.objects.filter(finished__isnull=True)
+
+        resumed = 0
+        for dispatch in dispatches:
+            progress = dispatch.get_progress()
+            self.stdout.write(
+                f"resuming newsletter {dispatch.newsletter_id}: "
+                f"{progress['sent']}/{progress['total']} sent, "
+                f"{progress['failed']} failed, {progress['pending']} pending"
+            )
+            send_newsletter.delay(dispatch.pk)
+            resumed += 1
+
+        self.stdout.write(f"resumed {resumed} newsletters")
@@ -0,0 +1,92 @@
+# Generated by Django 4.2.18 on 2026-10-18 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("a4_candy_newsletters", "0004_alter_newsletter_body"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NewsletterDispatch",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="Created",
+                    ),
+                ),
+                (
+                    "modified",
+                    models.DateTimeField(
+                        blank=True, editable=False, null=True, verbose_name="Modified"
+                    ),
+                ),
+                ("email_class", models.CharField(max_length=100)),
+                ("email_kwargs", models.JSONField(default=dict)),
+                ("finished", models.DateTimeField(blank=True, null=True)),
+                (
+                    "newsletter",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="dispatch",
+                        to="a4_candy_newsletters.newsletter",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="NewsletterChunk",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("first_id", models.PositiveIntegerField()),
+                ("last_id", models.PositiveIntegerField()),
+                ("receiver_ids", models.JSONField(default=list)),
+                ("cursor", models.PositiveIntegerField(default=0)),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("sent", models.PositiveIntegerField(default=0)),
+                ("failed", models.PositiveIntegerField(default=0)),
+                ("locked_until", models.DateTimeField(blank=True, null=True)),
+                ("finished", models.DateTimeField(blank=True, null=True)),
+                (
+                    "dispatch",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="chunks",
+                        to="a4_candy_newsletters.newsletterdispatch",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["first_id"],
+                "unique_together": {("dispatch", "first_id")},
+            },
+        ),
+    ]
@@ -2,12 +2,15 @@ import re
 
 from django.conf import settings
 from django.db import models
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from django_ckeditor_5.fields import CKEditor5Field
 
 from adhocracy4 import transforms
 from adhocracy4.images.validators import ImageAltTextValidator
+from adhocracy4.models import base
 from adhocracy4.models.base import UserGeneratedContentModel
 from adhocracy4.projects.models import Project
 
@@ -78,3 +81,58 @@ class Newsletter(UserGeneratedContentModel):
         if update_fields:
             update_fields = {"body"}.union(update_fields)
         super().save(update_fields=update_fields, *args, **kwargs)
+
+
+class NewsletterDispatch(base.TimeStampedModel):
+    """Sending state of a newsletter, split into chunks of receivers."""
+
+    newsletter = models.OneToOneField(
+        Newsletter, related_name="dispatch", on_delete=models.CASCADE
+    )
+    email_class = models.CharField(max_length=100)
+    email_kwargs = models.JSONField(default=dict)
+    finished = models.DateTimeField(blank=True, null=True)
+
+    def get_progress(self):
+        progress = self.chunks.aggregate(
+            total=Coalesce(Sum("total"), 0),
+            sent=Coalesce(Sum("sent"), 0),
+            failed=Coalesce(Sum("failed"), 0),
+        )
+        progress["pending"] = progress["total"] - progress["sent"] - progress["failed"]
+        return progress
+
+    def __str__(self):
+        return "Dispatch of newsletter {}".format(self.newsletter)
+
+
+class NewsletterChunk(models.Model):
+    """A range of receivers (ordered by user id) sent by a single task.
+
+    The cursor holds the id of the last receiver that was processed, so a
+    chunk interrupted by a crashed worker continues after that receiver.
+    """
+
+    dispatch = models.ForeignKey(
+        NewsletterDispatch, related_name="chunks", on_delete=models.CASCADE
+    )
+    first_id = models.PositiveIntegerField()
+    last_id = models.PositiveIntegerField()
+    receiver_ids = models.JSONField(default=list)
+    cursor = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    locked_until = models.DateTimeField(blank=True, null=True)
+    finished = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["first_id"]
+        unique_together = ("dispatch", "first_id")
+
+    @property
+    def remaining_ids(self):
+        return [pk for pk in self.receiver_ids if pk > self.cursor]
+
+    def __str__(self):
+        return "Receivers {s.first_id}-{s.last_id} of {s.dispatch}".format(s=self)
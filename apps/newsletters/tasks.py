@@ -0,0 +1,144 @@
+import time
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models import Q
+from django.utils import timezone
+
+from . import emails
+from .models import NewsletterChunk
+from .models import NewsletterDispatch
+
+# A chunk is locked by the task sending it. The lock is renewed after every
+# mail, so it only expires if the worker died while sending the chunk.
+CHUNK_LOCK_DURATION = timedelta(minutes=10)
+
+
+def get_send_interval():
+    """Return the seconds to wait between two mails of a newsletter."""
+    rate = settings.NEWSLETTER_SEND_RATE
+    return 1 / rate if rate else 0
+
+
+@shared_task
+def send_newsletter(dispatch_pk):
+    """Split the receivers into chunks and enqueue a task per chunk.
+
+    Running this again for the same dispatch (e.g. after a crash) keeps
+    the existing chunks and only enqueues the unfinished ones.
+    """
+    dispatch = NewsletterDispatch.objects.select_related("newsletter").get(
+        pk=dispatch_pk
+    )
+    if dispatch.finished:
+        return
+
+    if not dispatch.chunks.exists():
+        _create_chunks(dispatch)
+
+    chunk_pks = dispatch.chunks.filter(finished__isnull=True).values_list(
+        "pk", flat=True
+    )
+    # Chunks are started one after another, so the configured send rate is
+    # kept for the whole newsletter and not only within a single chunk.
+    chunk_duration = get_send_interval() * settings.NEWSLETTER_CHUNK_SIZE
+    for index, chunk_pk in enumerate(chunk_pks):
+        send_newsletter_chunk.apply_async((chunk_pk,), countdown=index * chunk_duration)
+
+    _finish_dispatch(dispatch)
+
+
+@shared_task(bind=True, acks_late=True, max_retries=None)
+def send_newsletter_chunk(self, chunk_pk):
+    if not _lock_chunk(chunk_pk):
+        locked_until = (
+            NewsletterChunk.objects.filter(pk=chunk_pk, finished__isnull=True)
+            .values_list("locked_until", flat=True)
+            .first()
+        )
+        if locked_until and not self.request.is_eager:
+            # redelivered after the worker sending it died, or sent by another
+            # worker right now: try again once its lock has expired
+            countdown = (locked_until - timezone.now()).total_seconds()
+            raise self.retry(countdown=max(countdown, 0) + 1)
+        return
+
+    chunk = NewsletterChunk.objects.select_related("dispatch__newsletter").get(
+        pk=chunk_pk
+    )
+    dispatch = chunk.dispatch
+    email = getattr(emails, dispatch.email_class)()
+    receiver_ids = chunk.remaining_ids
+    kwargs = dict(dispatch.email_kwargs, participant_ids=receiver_ids)
+
+    interval = get_send_interval()
+    for receiver, sent in email.dispatch_iter(
+        dispatch.newsletter, receiver_ids, **kwargs
+    ):
+        counter = "sent" if sent else "failed"
+        NewsletterChunk.objects.filter(pk=chunk_pk).update(
+            cursor=receiver.pk,
+            locked_until=timezone.now() + CHUNK_LOCK_DURATION,
+            **{counter: F(counter) + 1}
+        )
+        if interval:
+            time.sleep(interval)
+
+    # receivers who unsubscribed in the meantime are no longer pending
+    NewsletterChunk.objects.filter(pk=chunk_pk).update(
+        cursor=chunk.last_id,
+        total=F("sent") + F("failed"),
+        locked_until=None,
+        finished=timezone.now(),
+    )
+    _finish_dispatch(dispatch)
+
+
+def _create_chunks(dispatch):
+    email = getattr(emails, dispatch.email_class)()
+    receiver_ids = list(
+        email.get_receiver_ids(dispatch.newsletter, **dispatch.email_kwargs)
+    )
+
+    size = settings.NEWSLETTER_CHUNK_SIZE
+    chunks = []
+    for start in range(0, len(receiver_ids), size):
+        ids = receiver_ids[start : start + size]
+        chunks.append(
+            NewsletterChunk(
+                dispatch=dispatch,
+                first_id=ids[0],
+                last_id=ids[-1],
+                receiver_ids=ids,
+                total=len(ids),
+            )
+        )
+
+    # the participant ids are stored in the chunks from now on
+    email_kwargs = dict(dispatch.email_kwargs)
+    email_kwargs.pop("participant_ids", None)
+    with transaction.atomic():
+        NewsletterChunk.objects.bulk_create(chunks, ignore_conflicts=True)
+        NewsletterDispatch.objects.filter(pk=dispatch.pk).update(
+            email_kwargs=email_kwargs
+        )
+    dispatch.email_kwargs = email_kwargs
+
+
+def _lock_chunk(chunk_pk):
+    now = timezone.now()
+    return (
+        NewsletterChunk.objects.filter(pk=chunk_pk, finished__isnull=True)
+        .filter(Q(locked_until__isnull=True) | Q(locked_until__lt=now))
+        .update(locked_until=now + CHUNK_LOCK_DURATION)
+    ) == 1
+
+
+def _finish_dispatch(dispatch):
+    if not dispatch.chunks.filter(finished__isnull=True).exists():
+        NewsletterDispatch.objects.filter(pk=dispatch.pk, finished__isnull=True).update(
+            finished=timezone.now()
+        )
@@ -211,6 +211,7 @@ class NotifyInitiatorsOnProjectDeletedEmail(Email):
 
 class NotifyFollowersOnPhaseStartedEmail(Email):
     template_name = "a4_candy_notifications/emails" "/notify_followers_phase_started"
+    collapse_by_project = True
 
     def get_organisation(self):
         return self.object.project.organisation
@@ -227,6 +228,7 @@ class NotifyFollowersOnPhaseStartedEmail(Email):
 
 class NotifyFollowersOnPhaseIsOverSoonEmail(Email):
     template_name = "a4_candy_notifications/emails" "/notify_followers_phase_over_soon"
+    collapse_by_project = True
 
     def get_organisation(self):
         return self.object.project.organisation
@@ -243,6 +245,7 @@ class NotifyFollowersOnPhaseIsOverSoonEmail(Email):
 
 class NotifyFollowersOnUpcommingEventEmail(Email):
     template_name = "a4_candy_notifications/emails" "/notify_followers_event_upcomming"
+    collapse_by_project = True
 
     def get_organisation(self):
         return self.object.project.organisation
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from apps import logger
+from apps.notifications import outbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Send the pending notifications of the outbox, e.g. after a worker "
+        "crashed, delete old entries and log lag and throughput."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Only log the stats of the outbox, do not send anything.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["stats"]:
+            outbox.delete_old()
+            outbox.dispatch()
+        stats = outbox.get_stats()
+        logger.info(f"notification outbox: {stats=}")
@@ -0,0 +1,36 @@
+from django.db import models
+
+from adhocracy4.actions.models import Action
+from adhocracy4.models import base
+
+
+class OutboxEntry(base.TimeStampedModel):
+    """A notification email about an action waiting to be sent.
+
+    Entries are added in the transaction saving the action and sent by the
+    dispatcher, see `outbox.dispatch`. The cursor holds the id of the last
+    receiver of the last finished batch, so an entry interrupted by a
+    crashed worker continues after it.
+    """
+
+    action = models.ForeignKey(Action, related_name="+", on_delete=models.CASCADE)
+    email_class = models.CharField(max_length=100)
+    collapse_key = models.CharField(max_length=255)
+    cursor = models.PositiveIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    collapsed = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    locked_until = models.DateTimeField(blank=True, null=True)
+    finished = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["pk"]
+        indexes = [
+            models.Index(fields=["finished"], name="notification_outbox_finished"),
+            models.Index(
+                fields=["collapse_key", "created"], name="notification_outbox_collapse"
+            ),
+        ]
+
+    def __str__(self):
+        return "{s.email_class} for action {s.action_id}".format(s=self)
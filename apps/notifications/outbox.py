@@ -0,0 +1,221 @@
+"""Outbox of the notification emails about actions.
+
+Saving an action only adds an entry per notification email to the outbox,
+in the transaction saving the action, and starts the dispatcher once that
+transaction is committed. The dispatcher sends the entries in
+the order they were added: receivers are queried in batches of
+``NOTIFICATION_BATCH_SIZE`` ordered by id and mails are sent at
+``NOTIFICATION_SEND_RATE`` per second at most. Receivers of an entry with the
+same collapse key added within ``NOTIFICATION_COLLAPSE_WINDOW`` seconds
+before are skipped, so e.g. followers get a single mail if several phases of
+a project start at once.
+"""
+
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import Min
+from django.db.models import Q
+from django.db.models import Sum
+from django.utils import timezone
+
+from apps import logger
+from apps.contrib.instrumentation import bulk_operation
+
+from . import emails
+from .models import OutboxEntry
+
+# An entry is locked by the dispatcher sending it. The lock is renewed after
+# every batch, so it only expires if the worker died while sending.
+ENTRY_LOCK_DURATION = timedelta(minutes=10)
+# Finished entries are kept this long for collapsing and the stats
+ENTRY_RETENTION = timedelta(days=7)
+
+
+def get_send_interval():
+    """Return the seconds to wait between two notification mails."""
+    rate = settings.NOTIFICATION_SEND_RATE
+    return 1 / rate if rate else 0
+
+
+def get_collapse_key(email_class, action):
+    if getattr(email_class, "collapse_by_project", False):
+        return "{}:project:{}".format(email_class.__name__, action.project_id)
+    return "{}:{}:{}".format(
+        email_class.__name__, action.obj_content_type_id, action.obj_object_id
+    )
+
+
+def add(action, email_classes):
+    """Add an entry per email class and start the dispatcher after the commit.
+
+    Entries of a dispatcher started too early or lost with its worker are
+    picked up by the periodic run, see CELERY_BEAT_SCHEDULE.
+    """
+    from .tasks import dispatch_notifications
+
+    OutboxEntry.objects.bulk_create(
+        [
+            OutboxEntry(
+                action=action,
+                email_class=email_class.__name__,
+                collapse_key=get_collapse_key(email_class, action),
+            )
+            for email_class in email_classes
+        ]
+    )
+    transaction.on_commit(dispatch_notifications.delay)
+
+
+def _get_email(entry):
+    email = getattr(emails, entry.email_class)()
+    email.object = entry.action
+    email.kwargs = {}
+    return email
+
+
+def _receivers_after(email, cursor):
+    receivers = email.get_receivers()
+    if hasattr(receivers, "filter"):
+        return receivers.filter(id__gt=cursor).order_by("id")
+    return sorted(
+        (receiver for receiver in receivers if receiver.id > cursor),
+        key=lambda receiver: receiver.id,
+    )
+
+
+def _get_collapsed_ids(entry):
+    """Return the ids of the receivers of recent entries with the same key."""
+    window = settings.NOTIFICATION_COLLAPSE_WINDOW
+    if not window:
+        return set()
+    recent = OutboxEntry.objects.filter(
+        collapse_key=entry.collapse_key,
+        created__gte=entry.created - timedelta(seconds=window),
+        pk__lt=entry.pk,
+    ).select_related("action")
+    ids = set()
+    for other in recent:
+        receivers = _get_email(other).get_receivers()
+        if hasattr(receivers, "values_list"):
+            ids.update(receivers.values_list("id", flat=True))
+        else:
+            ids.update(receiver.id for receiver in receivers)
+    return ids
+
+
+def send_entry(entry):
+    """Send the mails of the entry, return the counts of this run."""
+    email = _get_email(entry)
+    collapsed_ids = _get_collapsed_ids(entry)
+    context = email.get_context()
+    attachments = email.get_attachments()
+    interval = get_send_interval()
+    size = settings.NOTIFICATION_BATCH_SIZE
+
+    counts = Counter()
+    cursor = entry.cursor
+    while True:
+        receivers = list(_receivers_after(email, cursor)[:size])
+        batch = Counter()
+        for receiver in receivers:
+            if receiver.id in collapsed_ids:
+                batch["collapsed"] += 1
+                continue
+            try:
+                email.send_to(receiver, context, attachments)
+            except Exception:
+                logger.exception(
+                    "sending notification failed: {} {}".format(entry.pk, receiver.pk)
+                )
+                batch["failed"] += 1
+            else:
+                batch["sent"] += 1
+            if interval:
+                time.sleep(interval)
+        if receivers:
+            cursor = receivers[-1].id
+            OutboxEntry.objects.filter(pk=entry.pk).update(
+                cursor=cursor,
+                locked_until=timezone.now() + ENTRY_LOCK_DURATION,
+                **{counter: F(counter) + value for counter, value in batch.items()}
+            )
+            counts.update(batch)
+        if len(receivers) < size:
+            break
+
+    OutboxEntry.objects.filter(pk=entry.pk).update(
+        locked_until=None, finished=timezone.now()
+    )
+    return counts
+
+
+def _lock_entry(entry_pk):
+    now = timezone.now()
+    return (
+        OutboxEntry.objects.filter(pk=entry_pk, finished__isnull=True)
+        .filter(Q(locked_until__isnull=True) | Q(locked_until__lt=now))
+        .update(locked_until=now + ENTRY_LOCK_DURATION)
+    ) == 1
+
+
+def dispatch():
+    """Send all pending entries, return the counts of this run.
+
+    Entries locked by another dispatcher are left to it. The lag is the
+    time the longest waiting entry spent in the outbox.
+    """
+    with bulk_operation("notification outbox") as stats:
+        stats.update(entries=0, sent=0, collapsed=0, failed=0, lag=0.0)
+        entry_pks = list(
+            OutboxEntry.objects.filter(finished__isnull=True).values_list(
+                "pk", flat=True
+            )
+        )
+        for entry_pk in entry_pks:
+            if not _lock_entry(entry_pk):
+                # finished or currently sent by another worker
+                continue
+            entry = OutboxEntry.objects.select_related("action").get(pk=entry_pk)
+            lag = (timezone.now() - entry.created).total_seconds()
+            stats["lag"] = max(stats["lag"], round(lag, 3))
+            stats["entries"] += 1
+            stats.update(
+                {key: stats[key] + value for key, value in send_entry(entry).items()}
+            )
+    return stats
+
+
+def delete_old():
+    OutboxEntry.objects.filter(finished__lt=timezone.now() - ENTRY_RETENTION).delete()
+
+
+def get_stats(period=timedelta(hours=1)):
+    """Return the size and lag of the outbox and its throughput.
+
+    The lag is the age of the oldest pending entry in seconds, the
+    throughput counts the mails of the entries finished within the period.
+    """
+    now = timezone.now()
+    pending = OutboxEntry.objects.filter(finished__isnull=True).aggregate(
+        pending=Count("pk"), oldest=Min("created")
+    )
+    finished = OutboxEntry.objects.filter(finished__gte=now - period).aggregate(
+        sent=Sum("sent"),
+        collapsed=Sum("collapsed"),
+        failed=Sum("failed"),
+    )
+    oldest = pending["oldest"]
+    return {
+        "pending": pending["pending"] or 0,
+        "lag": (now - oldest).total_seconds() if oldest else 0,
+        "sent": finished["sent"] or 0,
+        "collapsed": finished["collapsed"] or 0,
+        "failed": finished["failed"] or 0,
+        "sent_per_second": (finished["sent"] or 0) / period.total_seconds(),
+    }
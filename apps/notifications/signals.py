@@ -1,15 +1,18 @@
 from django.contrib.auth import get_user_model
 from django.db.models import signals
 from django.dispatch import receiver
+from django.utils import timezone
 
 from adhocracy4.actions.models import Action
 from adhocracy4.actions.verbs import Verbs
 from adhocracy4.dashboard import signals as dashboard_signals
 from adhocracy4.follows.models import Follow
 from adhocracy4.projects.models import Project
+from apps.contrib.instrumentation import bulk_operation
 from apps.moderatorfeedback.models import ModeratorCommentFeedback
 
 from . import emails
+from . import outbox
 
 User = get_user_model()
 
@@ -18,21 +21,26 @@ User = get_user_model()
 def send_notifications(instance, created, **kwargs):
     action = instance
     verb = Verbs(action.verb)
+    email_classes = []
 
     if action.type in ("item", "comment") and verb in (Verbs.CREATE, Verbs.ADD):
-        emails.NotifyCreatorEmail.send(action)
+        email_classes.append(emails.NotifyCreatorEmail)
 
         if action.project:
-            emails.NotifyModeratorsEmail.send(action)
+            email_classes.append(emails.NotifyModeratorsEmail)
 
     elif action.type == "phase":
         if verb == Verbs.START:
-            emails.NotifyFollowersOnPhaseStartedEmail.send(action)
+            email_classes.append(emails.NotifyFollowersOnPhaseStartedEmail)
         elif verb == Verbs.SCHEDULE:
-            emails.NotifyFollowersOnPhaseIsOverSoonEmail.send(action)
+            email_classes.append(emails.NotifyFollowersOnPhaseIsOverSoonEmail)
 
     elif action.type == "offlineevent" and verb == Verbs.START:
-        emails.NotifyFollowersOnUpcommingEventEmail.send(action)
+        email_classes.append(emails.NotifyFollowersOnUpcommingEventEmail)
+
+    if email_classes:
+        # sent by the dispatcher, see outbox.dispatch
+        outbox.add(action, email_classes)
 
 
 @receiver(dashboard_signals.project_created)
@@ -59,19 +67,25 @@ def autofollow_project_moderators(instance, action, pk_set, reverse, **kwargs):
 
 
 def autofollow_project(instance, pk_set, reverse):
+    """Let the users follow the projects with a single upsert."""
     if not reverse:
-        project = instance
-        users_pks = pk_set
-
-        for user_pk in users_pks:
-            Follow.objects.update_or_create(
-                project=project, creator_id=user_pk, defaults={"enabled": True}
-            )
+        follows = [Follow(project=instance, creator_id=user_pk) for user_pk in pk_set]
     else:
-        user = instance
-        project_pks = pk_set
-
-        for project_pk in project_pks:
-            Follow.objects.update_or_create(
-                project_id=project_pk, creator=user, defaults={"enabled": True}
-            )
+        follows = [
+            Follow(project_id=project_pk, creator=instance) for project_pk in pk_set
+        ]
+    if not follows:
+        return
+
+    now = timezone.now()
+    for follow in follows:
+        follow.enabled = True
+        follow.created = now
+        follow.modified = now
+    with bulk_operation("autofollow", rows=len(follows)):
+        Follow.objects.bulk_create(
+            follows,
+            update_conflicts=True,
+            unique_fields=["project", "creator"],
+            update_fields=["enabled", "modified"],
+        )
@@ -0,0 +1,8 @@
+from celery import shared_task
+
+from . import outbox
+
+
+@shared_task(acks_late=True)
+def dispatch_notifications():
+    outbox.dispatch()
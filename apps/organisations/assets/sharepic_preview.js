@@ -0,0 +1,26 @@
+/* Sharepics are rendered in the background. Until the image is ready its url
+   answers with 202, so the preview is loaded again until it succeeds. The src
+   is only set here, once the error listener is attached. */
+
+const MAX_ATTEMPTS = 30
+
+document.addEventListener('DOMContentLoaded', () => {
+  document.querySelectorAll('[data-image-preview]').forEach((preview) => {
+    const url = preview.dataset.imagePreview
+    let attempts = 0
+
+    const load = () => {
+      attempts += 1
+      fetch(url, { credentials: 'same-origin' }).then((response) => {
+        if (response.status === 202 && attempts < MAX_ATTEMPTS) {
+          setTimeout(load, 1000)
+        } else if (response.status === 200) {
+          preview.src = url + '?' + attempts
+        }
+      })
+    }
+
+    preview.addEventListener('error', load, { once: true })
+    preview.src = url
+  })
+})
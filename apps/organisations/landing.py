@@ -0,0 +1,131 @@
+"""Project tiles of the organisation landing page.
+
+Start and end of every project, i.e. of the phases of its published
+modules, are queried once for all projects of the organisation and cached
+until one of its projects, modules or phases is saved or deleted. Splitting
+them into active, future and past projects depends on the time and the
+user, so that is done for every request without any join.
+
+The cache is only cleared in all processes if it is shared by them, see
+CACHES in production.py. A viewable project missing from the timeline
+queries it again anyway, so new projects show up right away regardless.
+
+The rendered tiles only differ for users in whether they may participate in
+the project, so they are cached per visibility class:
+
+- `STAFF`: superusers and initiators of the organisation
+- `MEMBER`: members of the organisation, participants and moderators of
+  the project
+- `ANONYMOUS`: everyone else
+"""
+
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.db.models import Min
+from django.db.models import Q
+from django.utils import timezone
+
+from adhocracy4.projects.models import Project
+from apps.projects import query
+from apps.projects import visibility
+
+ANONYMOUS = "anonymous"
+MEMBER = "member"
+STAFF = "staff"
+
+
+def _cache_version_key(organisation_id):
+    return "organisation-landing-version:{}".format(organisation_id)
+
+
+def get_cache_version(organisation_id):
+    key = _cache_version_key(organisation_id)
+    cache.add(key, uuid.uuid4().hex, None)
+    return cache.get(key)
+
+
+def invalidate(organisation_id):
+    """Query the timeline and render the tiles again on next request."""
+    cache.delete(_cache_version_key(organisation_id))
+
+
+def get_timeline(organisation):
+    """Return (pk, start, end) of the projects of the organisation."""
+    key = "organisation-timeline:{}:{}".format(
+        organisation.pk, get_cache_version(organisation.pk)
+    )
+    timeline = cache.get(key)
+    if timeline is None:
+        published = Q(module__is_draft=False)
+        timeline = list(
+            organisation.projects.annotate(
+                project_start=Min("module__phase__start_date", filter=published),
+                project_end=Max("module__phase__end_date", filter=published),
+            )
+            .order_by("pk")
+            .values_list("pk", "project_start", "project_end")
+        )
+        cache.set(key, timeline, settings.ORGANISATION_TIMELINE_CACHE_TIMEOUT)
+    return timeline
+
+
+def get_projects_list(organisation, user):
+    """Return the active, future and past projects the user may see."""
+    now = timezone.now()
+    viewable = set(
+        query.ProjectQuerySet(Project)
+        .filter(organisation=organisation)
+        .viewable(user)
+        .values_list("pk", flat=True)
+    )
+    timeline = get_timeline(organisation)
+    if not viewable.issubset(pk for pk, start, end in timeline):
+        # cached before the project was created, e.g. by another process
+        invalidate(organisation.pk)
+        timeline = get_timeline(organisation)
+    timeline = {pk: (start, end) for pk, start, end in timeline if pk in viewable}
+    active, future, past = [], [], []
+    for pk, (start, end) in timeline.items():
+        if start is not None and start <= now < end:
+            active.append((end, pk))
+        elif start is None or start > now:
+            # projects without phases come last
+            future.append((start is None, start or now, pk))
+        elif end < now:
+            past.append((end, pk))
+    active.sort()
+    future.sort()
+    past.sort(reverse=True)
+
+    projects = Project.objects.in_bulk(timeline.keys())
+    for project in projects.values():
+        project.project_start, project.project_end = timeline[project.pk]
+    return tuple(
+        [projects[item[-1]] for item in bucket if item[-1] in projects]
+        for bucket in (active, future, past)
+    )
+
+
+def set_tile_classes(organisation, user, projects):
+    """Set the visibility class of the user on every project."""
+    if not user.is_authenticated:
+        user_class = ANONYMOUS
+        project_ids = set()
+    else:
+        project_ids, organisation_ids = visibility.get_ids(user)
+        if user.is_superuser:
+            user_class = STAFF
+        elif organisation.pk not in organisation_ids:
+            user_class = ANONYMOUS
+        elif organisation.has_initiator(user):
+            user_class = STAFF
+        else:
+            user_class = MEMBER
+    for project in projects:
+        if user_class == ANONYMOUS and project.pk in project_ids:
+            project.tile_class = MEMBER
+        else:
+            project.tile_class = user_class
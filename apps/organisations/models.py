@@ -3,7 +3,6 @@ from django.conf import settings
 from django.contrib.sites.models import Site
 from django.db import models
 from django.urls import reverse
-from django.utils import timezone
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from django_ckeditor_5.fields import CKEditor5Field
@@ -14,7 +13,8 @@ from parler.models import TranslatedFields
 from adhocracy4 import transforms
 from adhocracy4.images import fields as images_fields
 from adhocracy4.projects.models import Project
-from apps.projects import query
+
+from . import landing
 
 
 class Organisation(TranslatableModel):
@@ -190,37 +190,7 @@ class Organisation(TranslatableModel):
         )
 
     def get_projects_list(self, user):
-        projects = query.filter_viewable(self.projects, user)
-        now = timezone.now()
-
-        min_module_start = models.Min(
-            "module__phase__start_date", filter=models.Q(module__is_draft=False)
-        )
-        max_module_end = models.Max(
-            "module__phase__end_date", filter=models.Q(module__is_draft=False)
-        )
-
-        sorted_active_projects = (
-            projects.annotate(project_start=min_module_start)
-            .annotate(project_end=max_module_end)
-            .filter(project_start__lte=now, project_end__gt=now)
-            .order_by("project_end")
-        )
-
-        sorted_future_projects = (
-            projects.annotate(project_start=min_module_start)
-            .filter(models.Q(project_start__gt=now) | models.Q(project_start=None))
-            .order_by("project_start")
-        )
-
-        sorted_past_projects = (
-            projects.annotate(project_start=min_module_start)
-            .annotate(project_end=max_module_end)
-            .filter(project_end__lt=now)
-            .order_by("-project_end")
-        )
-
-        return sorted_active_projects, sorted_future_projects, sorted_past_projects
+        return landing.get_projects_list(self, user)
 
     def has_initiator(self, user):
         return self.initiators.filter(id=user.id).exists()
@@ -0,0 +1,241 @@
+"""Rendering of sharepics for social media.
+
+Fonts and logos are loaded once per process. Rendered sharepics are stored
+as files named by a hash of everything they are made of, so the same input
+is only rendered once and previews are served as files instead of being
+inlined into the page. Rendering itself runs in a celery task, the uploaded
+picture is handed over to it as a file in the sharepic storage.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import time
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from PIL import Image
+from PIL import ImageDraw
+from PIL import ImageFont
+
+from .forms import SOCIAL_MEDIA_SIZES
+from .models import Organisation
+
+# Part of every key, change it when the look of sharepics changes
+RENDER_VERSION = 1
+
+FONTS = {
+    "title": "adhocracy-plus/assets/fonts/SourceSansPro-Semibold.otf",
+    "description": "adhocracy-plus/assets/fonts/SourceSansPro-Regular.otf",
+}
+APLUS_LOGO = "adhocracy-plus/assets/images/logo.png"
+ORGANISATION_LOGO_SIZE = 144
+ORGANISATION_LOGO_BORDER = 8
+
+
+def get_sharepic_storage():
+    """Keep sharepics out of the public media folder."""
+    return FileSystemStorage(location=settings.SHAREPICS_ROOT)
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(name, size):
+    return ImageFont.truetype(os.path.join(settings.BASE_DIR, FONTS[name]), size)
+
+
+@functools.lru_cache(maxsize=None)
+def get_aplus_logo(width, height):
+    with Image.open(os.path.join(settings.BASE_DIR, APLUS_LOGO)) as logo:
+        return logo.resize((width, height))
+
+
+@functools.lru_cache(maxsize=32)
+def get_organisation_logo(name, mode):
+    """Return the logo with its white border, uploads never reuse a name."""
+    storage = Organisation._meta.get_field("logo").storage
+    size = ORGANISATION_LOGO_SIZE
+    border = ORGANISATION_LOGO_BORDER
+    with storage.open(name) as file, Image.open(file) as logo:
+        result = Image.new(mode, (border + size + border,) * 2, (255, 255, 255))
+        result.paste(logo.resize((size, size)), (border, border))
+        return result
+
+
+def calc_aspect_ratio(width, height, req_width, req_height):
+    # calculate aspect_ratio
+    aspect_ratio = width / float(height)
+    required_ratio = req_width / float(req_height)
+    if aspect_ratio > required_ratio:
+        new_width = int(required_ratio * height)
+        offset = (width - new_width) / 2
+        resize = (offset, 0, width - offset, height)
+    else:
+        new_height = int(width / required_ratio)
+        offset = (height - new_height) / 2
+        resize = (0, offset, width, height - offset)
+    return resize
+
+
+def render(image_file, options):
+    """Render the sharepic and return it as png."""
+    sharepic_format = SOCIAL_MEDIA_SIZES[options["format"]]
+    req_width = sharepic_format["img_min_width"]
+    req_height = sharepic_format["img_min_height"]
+
+    with Image.open(image_file) as image_get:
+        width, height = image_get.size
+        resize = calc_aspect_ratio(width, height, req_width, req_height)
+        # Use LANCZOS for resampling to keep better quality
+        image = image_get.crop(resize).resize(
+            (req_width, req_height), Image.Resampling.LANCZOS
+        )
+
+    # get required total size and add appropriate padding
+    result = Image.new(
+        image.mode,
+        (sharepic_format["img_min_width"], sharepic_format["overall_height"]),
+        (255, 255, 255),
+    )
+    result.paste(image, (0, 0))
+
+    # image is converted into editable form using Draw function
+    draw = ImageDraw.Draw(result)
+    font = get_font("title", sharepic_format["title_size"])
+    fontsm = get_font("description", sharepic_format["description_size"])
+    title = options["title"]
+    description = options["description"]
+    title_width = draw.textlength(title, font=font)
+    description_width = draw.textlength(description, font=fontsm)
+    # add text using width to center
+    draw.text(
+        (
+            (sharepic_format["img_min_width"] - title_width) / 2,
+            sharepic_format["title_y"],
+        ),
+        title,
+        fill=(0, 0, 0),
+        font=font,
+    )
+    draw.text(
+        (
+            (sharepic_format["img_min_width"] - description_width) / 2,
+            sharepic_format["description_y"],
+        ),
+        description,
+        fill=(0, 0, 0),
+        font=fontsm,
+    )
+
+    if options["organisation_logo"]:
+        logo_org = get_organisation_logo(options["organisation_logo"], result.mode)
+        result.paste(logo_org, (80, sharepic_format["org_logo_y"]))
+
+    if options["add_aplus_logo"]:
+        logo_aplus = get_aplus_logo(
+            sharepic_format["aplus_logo_width"], sharepic_format["aplus_logo_height"]
+        )
+        # position a+ logo
+        logo2_offset_y = sharepic_format["aplus_logo_y"]
+        logo2_offset_x = (
+            sharepic_format["img_min_width"] - sharepic_format["aplus_logo_width"]
+        ) // 2
+        result.paste(logo_aplus, (logo2_offset_x, logo2_offset_y), mask=logo_aplus)
+
+    buffered_image = BytesIO()
+    result.save(buffered_image, format="PNG")
+    return buffered_image.getvalue()
+
+
+def get_options(organisation, sharepic_format, data):
+    return {
+        "format": sharepic_format,
+        "title": data["title"],
+        "description": data["description"],
+        "organisation_logo": (
+            organisation.logo.name
+            if data["add_orga_logo"] and organisation.logo
+            else None
+        ),
+        "add_aplus_logo": bool(data["add_aplus_logo"]),
+    }
+
+
+def get_key(organisation, image_hash, options):
+    """Return the organisation pk and a hash of the input, joined by a dash.
+
+    The hash includes the organisation as well, the prefix is only there so
+    a key can be checked to belong to an organisation.
+    """
+    state = json.dumps(
+        [RENDER_VERSION, organisation.pk, image_hash, options], sort_keys=True
+    )
+    return "{}-{}".format(organisation.pk, hashlib.sha256(state.encode()).hexdigest())
+
+
+def is_key_of(key, organisation):
+    return key.partition("-")[0] == str(organisation.pk)
+
+
+def _result_name(key):
+    return "{}.png".format(key)
+
+
+def _source_name(key):
+    return "sources/{}".format(key)
+
+
+def is_rendered(key):
+    return get_sharepic_storage().exists(_result_name(key))
+
+
+def is_pending(key):
+    return get_sharepic_storage().exists(_source_name(key))
+
+
+def open_result(key):
+    return get_sharepic_storage().open(_result_name(key), "rb")
+
+
+def enqueue(organisation, sharepic_format, data):
+    """Start rendering the sharepic unless done already, return its key."""
+    from .tasks import render_sharepic
+
+    image = data["image"]
+    image.seek(0)
+    content = image.read()
+    options = get_options(organisation, sharepic_format, data)
+    key = get_key(organisation, hashlib.sha256(content).hexdigest(), options)
+    if not is_rendered(key) and not is_pending(key):
+        get_sharepic_storage().save(_source_name(key), ContentFile(content))
+        render_sharepic.delay(key, options)
+    return key
+
+
+def run(key, options):
+    """Render the sharepic of the key from its stored source."""
+    storage = get_sharepic_storage()
+    try:
+        if not storage.exists(_result_name(key)):
+            with storage.open(_source_name(key), "rb") as source:
+                png = render(source, options)
+            storage.save(_result_name(key), ContentFile(png))
+    finally:
+        storage.delete(_source_name(key))
+
+
+def delete_old():
+    """Delete sharepics and sources older than SHAREPIC_LIFETIME."""
+    storage = get_sharepic_storage()
+    if not os.path.isdir(storage.location):
+        return
+    deadline = time.time() - settings.SHAREPIC_LIFETIME
+    for directory in ("", "sources"):
+        if not storage.exists(directory):
+            continue
+        for name in storage.listdir(directory)[1]:
+            name = os.path.join(directory, name)
+            if storage.get_modified_time(name).timestamp() < deadline:
+                storage.delete(name)
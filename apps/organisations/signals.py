@@ -0,0 +1,114 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import signals
+from django.dispatch import receiver
+
+from adhocracy4.modules.models import Module
+from adhocracy4.phases.models import Phase
+from adhocracy4.projects.models import Project
+from apps.projects import visibility
+from apps.users.emails import logo_cache
+
+from . import landing
+from .models import Member
+from .models import Organisation
+from .sitemaps import invalidate_organisation_sitemap
+
+
+@receiver(signals.pre_save, sender=Organisation)
+def invalidate_changed_logo_attachment(sender, instance, update_fields=None, **kwargs):
+    if not instance.pk or (update_fields and "logo" not in update_fields):
+        return
+    old_logo = (
+        Organisation.objects.filter(pk=instance.pk)
+        .values_list("logo", flat=True)
+        .first()
+    )
+    if old_logo and old_logo != instance.logo.name:
+        logo_cache.invalidate(instance.logo.storage.path(old_logo))
+
+
+@receiver(signals.post_delete, sender=Organisation)
+def invalidate_logo_attachment(sender, instance, **kwargs):
+    if instance.logo:
+        logo_cache.invalidate(instance.logo.path)
+
+
+@receiver(signals.post_save, sender=Project)
+@receiver(signals.post_delete, sender=Project)
+def invalidate_project_caches(sender, instance, **kwargs):
+    invalidate_organisation_sitemap(instance.organisation_id)
+    landing.invalidate(instance.organisation_id)
+
+
+@receiver(signals.post_save, sender=Module)
+@receiver(signals.post_delete, sender=Module)
+def invalidate_module_caches(sender, instance, **kwargs):
+    organisation_id = (
+        Project.objects.filter(pk=instance.project_id)
+        .values_list("organisation_id", flat=True)
+        .first()
+    )
+    if organisation_id:
+        invalidate_organisation_sitemap(organisation_id)
+        landing.invalidate(organisation_id)
+
+
+@receiver(signals.post_save, sender=Phase)
+@receiver(signals.post_delete, sender=Phase)
+def invalidate_phase_caches(sender, instance, **kwargs):
+    organisation_id = (
+        Module.objects.filter(pk=instance.module_id)
+        .values_list("project__organisation_id", flat=True)
+        .first()
+    )
+    if organisation_id:
+        invalidate_organisation_sitemap(organisation_id)
+        landing.invalidate(organisation_id)
+
+
+@receiver(signals.post_save, sender=Organisation)
+def invalidate_organisation_caches(sender, instance, **kwargs):
+    invalidate_organisation_sitemap(instance.pk)
+    landing.invalidate(instance.pk)
+
+
+def _invalidate_user_visibility(user_ids):
+    # requests until the commit may cache the old memberships again, so the
+    # ids are deleted once more after it
+    visibility.invalidate(*user_ids)
+    transaction.on_commit(partial(visibility.invalidate, *user_ids))
+
+
+def _invalidate_visibility(instance, action, reverse, pk_set, field_name):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if reverse:
+        _invalidate_user_visibility([instance.pk])
+    elif action == "pre_clear":
+        user_ids = getattr(instance, field_name).values_list("pk", flat=True)
+        _invalidate_user_visibility(list(user_ids))
+    elif pk_set:
+        _invalidate_user_visibility(list(pk_set))
+
+
+@receiver(signals.m2m_changed, sender=Project.participants.through)
+def invalidate_visibility_participants(instance, action, reverse, pk_set, **kwargs):
+    _invalidate_visibility(instance, action, reverse, pk_set, "participants")
+
+
+@receiver(signals.m2m_changed, sender=Project.moderators.through)
+def invalidate_visibility_moderators(instance, action, reverse, pk_set, **kwargs):
+    _invalidate_visibility(instance, action, reverse, pk_set, "moderators")
+
+
+@receiver(signals.m2m_changed, sender=Organisation.initiators.through)
+def invalidate_visibility_initiators(instance, action, reverse, pk_set, **kwargs):
+    _invalidate_visibility(instance, action, reverse, pk_set, "initiators")
+
+
+@receiver(signals.post_save, sender=Member)
+@receiver(signals.post_delete, sender=Member)
+def invalidate_visibility_member(sender, instance, **kwargs):
+    _invalidate_user_visibility([instance.member_id])
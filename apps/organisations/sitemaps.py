@@ -1,14 +1,27 @@
+import math
+import uuid
+
+from django.conf import settings
 from django.contrib.sitemaps.views import x_robots_tag
 from django.contrib.sites.shortcuts import get_current_site
+from django.core.cache import cache
+from django.db.models import Max
+from django.db.models import Q
 from django.http import Http404
+from django.http import HttpResponse
+from django.template.loader import render_to_string
 from django.template.response import TemplateResponse
 from django.urls import reverse
+from django.utils import timezone
 
 from adhocracy4.projects.enums import Access
 from adhocracy4.projects.models import Project
 
 from .models import Organisation
 
+# Maximum number of urls in a sitemap file, see sitemaps.org
+SITEMAP_LIMIT = 50000
+
 
 @x_robots_tag
 def organisations_sitemap_index(request):
@@ -17,18 +30,20 @@ def organisations_sitemap_index(request):
     template_name = "sitemap_index.xml"
 
     urls = []
-    organisations = Organisation.objects.all().order_by("id")
-
-    for organisation in organisations:
-        if not organisation.site or organisation.site is get_current_site(request):
-            urls.append(
-                request.build_absolute_uri(
-                    reverse(
-                        "organisation-sitemap-index",
-                        kwargs=dict(organisation_slug=organisation.slug),
-                    )
+    current_site_id = get_current_site(request).pk
+    organisations = Organisation.objects.filter(
+        Q(site__isnull=True) | Q(site_id=current_site_id)
+    ).order_by("id")
+
+    for organisation_slug in organisations.values_list("slug", flat=True):
+        urls.append(
+            request.build_absolute_uri(
+                reverse(
+                    "organisation-sitemap-index",
+                    kwargs=dict(organisation_slug=organisation_slug),
                 )
             )
+        )
 
     return TemplateResponse(
         request, template_name, {"sitemaps": urls}, content_type=content_type
@@ -41,15 +56,22 @@ def organisation_sitemap_index(request, organisation_slug):
     content_type = "application/xml"
     template_name = "sitemap_index.xml"
 
-    urls = []
-    sitemaps = ["organisation-sitemap-static", "organisation-sitemap-projects"]
-
-    for sitemap in sitemaps:
-        urls.append(
-            request.build_absolute_uri(
-                reverse(sitemap, kwargs=dict(organisation_slug=organisation_slug))
-            )
+    organisation = _get_organisation(organisation_slug)
+    kwargs = dict(organisation_slug=organisation_slug)
+    urls = [
+        request.build_absolute_uri(
+            reverse("organisation-sitemap-static", kwargs=kwargs)
         )
+    ]
+    projects_url = request.build_absolute_uri(
+        reverse("organisation-sitemap-projects", kwargs=kwargs)
+    )
+    pages = max(
+        1, math.ceil(_get_public_projects(organisation).count() / SITEMAP_LIMIT)
+    )
+    urls.append(projects_url)
+    for page in range(2, pages + 1):
+        urls.append("{}?p={}".format(projects_url, page))
 
     return TemplateResponse(
         request, template_name, {"sitemaps": urls}, content_type=content_type
@@ -86,33 +108,101 @@ def organisation_sitemap_static(request, organisation_slug):
 @x_robots_tag
 def organisation_sitemap_projects(request, organisation_slug):
 
+    content_type = "application/xml"
+    organisation = _get_organisation(organisation_slug)
+    try:
+        page = int(request.GET.get("p", 1))
+    except ValueError:
+        raise Http404("No page '{}'".format(request.GET["p"]))
+    if page < 1:
+        raise Http404("No page '{}'".format(page))
+
+    key = "organisation-sitemap:{}:{}:{}:{}".format(
+        organisation.pk,
+        _get_cache_version(organisation.pk),
+        request.build_absolute_uri("/"),
+        page,
+    )
+    content = cache.get(key)
+    if content is None:
+        content = _render_projects_sitemap(request, organisation, page)
+        cache.set(key, content, settings.SITEMAP_CACHE_TIMEOUT)
+
+    return HttpResponse(content, content_type=content_type)
+
+
+def _render_projects_sitemap(request, organisation, page):
     changefreq = "weekly"
     priority = 0.8
-    content_type = "application/xml"
     template_name = "sitemap.xml"
-    organisation = None
-
-    try:
-        organisation = Organisation.objects.get(slug=organisation_slug)
-    except Organisation.DoesNotExist:
-        raise Http404("Organisation does not exist")
 
-    projects = Project.objects.filter(
-        organisation=organisation,
-        is_archived=False,
-        is_draft=False,
-        access=Access.PUBLIC,
-    )
+    offset = (page - 1) * SITEMAP_LIMIT
+    projects = _get_public_projects(organisation)[offset : offset + SITEMAP_LIMIT]
 
     urls = []
-    for project in projects:
+    for slug, created, modified, phase_started in projects:
         url = {
-            "location": request.build_absolute_uri(project.get_absolute_url()),
+            "location": request.build_absolute_uri(
+                reverse(
+                    "project-detail",
+                    kwargs=dict(organisation_slug=organisation.slug, slug=slug),
+                )
+            ),
+            "lastmod": max(date for date in (created, modified, phase_started) if date),
             "changefreq": changefreq,
             "priority": priority,
         }
         urls.append(url)
+    if not urls and page > 1:
+        raise Http404("Page {} empty".format(page))
 
-    return TemplateResponse(
-        request, template_name, {"urlset": urls}, content_type=content_type
+    return render_to_string(template_name, {"urlset": urls}, request=request)
+
+
+def _get_organisation(organisation_slug):
+    try:
+        return Organisation.objects.only("pk", "slug").get(slug=organisation_slug)
+    except Organisation.DoesNotExist:
+        raise Http404("Organisation does not exist")
+
+
+def _get_public_projects(organisation):
+    """Slug and modification dates of the public projects in one query.
+
+    A project also changes for visitors when one of its modules enters a new
+    phase, so the start of the latest started phase counts as modification.
+    """
+    return (
+        Project.objects.filter(
+            organisation=organisation,
+            is_archived=False,
+            is_draft=False,
+            access=Access.PUBLIC,
+        )
+        .annotate(
+            phase_started=Max(
+                "module__phase__start_date",
+                filter=Q(
+                    module__is_draft=False,
+                    module__phase__start_date__lte=timezone.now(),
+                ),
+            )
+        )
+        .order_by("pk")
+        .values_list("slug", "created", "modified", "phase_started")
     )
+
+
+def _cache_version_key(organisation_id):
+    return "organisation-sitemap-version:{}".format(organisation_id)
+
+
+def _get_cache_version(organisation_id):
+    key = _cache_version_key(organisation_id)
+    cache.add(key, uuid.uuid4().hex, None)
+    return cache.get(key)
+
+
+def invalidate_organisation_sitemap(organisation_id):
+    """Render the project sitemaps of the organisation again on next request."""
+    cache.delete(_cache_version_key(organisation_id))
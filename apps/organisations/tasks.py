@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from . import sharepics
+
+
+@shared_task
+def render_sharepic(key, options):
+    sharepics.delete_old()
+    sharepics.run(key, options)
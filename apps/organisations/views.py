@@ -1,26 +1,25 @@
-import base64
 import json
-import os
-from io import BytesIO
 
 from django.conf import settings
 from django.contrib.messages.views import SuccessMessageMixin
 from django.core.exceptions import ImproperlyConfigured
+from django.http import FileResponse
+from django.http import Http404
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.views import generic
 from django.views.generic import DetailView
-from PIL import Image
-from PIL import ImageDraw
-from PIL import ImageFont
 
 from adhocracy4.dashboard import mixins as a4dashboard_mixins
 from apps.projects.models import Project
 
 from . import forms
-from .forms import SOCIAL_MEDIA_SIZES
+from . import landing
+from . import sharepics
 from .forms import CommunicationContentCreationForm
 from .models import Organisation
 
@@ -33,7 +32,12 @@ class OrganisationView(DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         active, future, past = self.object.get_projects_list(self.request.user)
+        landing.set_tile_classes(self.object, self.request.user, active + future + past)
 
+        context["tile_cache_version"] = landing.get_cache_version(self.object.pk)
+        # the remaining time and progress of the tiles change with the time
+        context["tile_cache_hour"] = timezone.now().strftime("%Y%m%d%H")
+        context["tile_cache_timeout"] = settings.ORGANISATION_TILE_CACHE_TIMEOUT
         context["active_projects"] = active
         context["future_projects"] = future
         context["past_projects"] = past
@@ -175,6 +179,30 @@ class DashboardCommunicationProjectChoiceView(
         return kwargs
 
 
+class DashboardSharepicView(a4dashboard_mixins.DashboardBaseMixin, generic.View):
+    permission_required = "a4_candy_organisations.change_organisation"
+
+    def get_permission_object(self):
+        return self.organisation
+
+    def get(self, request, *args, **kwargs):
+        key = self.kwargs["key"]
+        if not sharepics.is_key_of(key, self.organisation):
+            raise Http404("Sharepic does not exist")
+        if sharepics.is_rendered(key):
+            return FileResponse(
+                sharepics.open_result(key),
+                as_attachment="download" in request.GET,
+                filename="sharepic.png",
+                content_type="image/png",
+            )
+        if sharepics.is_pending(key):
+            response = HttpResponse(status=202)
+            response["Retry-After"] = 1
+            return response
+        raise Http404("Sharepic does not exist")
+
+
 class DashboardCommunicationContentCreateView(
     a4dashboard_mixins.DashboardBaseMixin, generic.FormView
 ):
@@ -219,130 +247,20 @@ class DashboardCommunicationContentCreateView(
     def form_valid(self, form):
         data = form.cleaned_data
         context = self.get_context_data()
-        img = self.generate_image(data)
+        key = sharepics.enqueue(self.organisation, self.format, data)
         # get the content form with unchanged cleaned data, as image generation
         # changes the image data (why?)
         content_form = CommunicationContentCreationForm(
             initial=data, project=self.project, format=self.format
         )
-        context["image_preview"] = img
+        context["image_preview"] = reverse(
+            "a4dashboard:communication-content-sharepic",
+            kwargs={"organisation_slug": self.organisation.slug, "key": key},
+        )
         context["content_form"] = content_form
         return self.render_to_response(context)
 
-    @staticmethod
-    def calc_aspect_ratio(width, height, req_width, req_height):
-        # calculate aspect_ratio
-        aspect_ratio = width / float(height)
-        required_ratio = req_width / float(req_height)
-        if aspect_ratio > required_ratio:
-            new_width = int(required_ratio * height)
-            offset = (width - new_width) / 2
-            resize = (offset, 0, width - offset, height)
-        else:
-            new_height = int(width / required_ratio)
-            offset = (height - new_height) / 2
-            resize = (0, offset, width, height - offset)
-        return resize
-
-    def generate_image(self, data):
-        # Get required image size and image
-        sharepic_format = SOCIAL_MEDIA_SIZES[self.format]
-        req_width = sharepic_format["img_min_width"]
-        req_height = sharepic_format["img_min_height"]
-
-        image_get = Image.open(data["image"].file)
-        width, height = image_get.size
-        resize = self.calc_aspect_ratio(width, height, req_width, req_height)
-        # Use LANCZOS for resampling to keep better quality
-        image = image_get.crop(resize).resize(
-            (req_width, req_height), Image.Resampling.LANCZOS
-        )
-
-        # get required total size and add appropriate padding
-        result = Image.new(
-            image.mode,
-            (sharepic_format["img_min_width"], sharepic_format["overall_height"]),
-            (255, 255, 255),
-        )
-        result.paste(image, (0, 0))
-
-        # image is converted into editable form using Draw function
-        image = ImageDraw.Draw(result)
-
-        # text dimension, color and font
-        font = ImageFont.truetype(
-            os.path.join(
-                settings.BASE_DIR,
-                "adhocracy-plus/assets/fonts/SourceSansPro-Semibold.otf",
-            ),
-            sharepic_format["title_size"],
-        )
-        fontsm = ImageFont.truetype(
-            os.path.join(
-                settings.BASE_DIR,
-                "adhocracy-plus/assets/fonts/SourceSansPro-Regular.otf",
-            ),
-            sharepic_format["description_size"],
-        )
-        title = data["title"]
-        description = data["description"]
-        title_width = image.textlength(title, font=font)
-        description_width = image.textlength(description, font=fontsm)
-        # add text using width to center
-        image.text(
-            (
-                (sharepic_format["img_min_width"] - title_width) / 2,
-                sharepic_format["title_y"],
-            ),
-            title,
-            fill=(0, 0, 0),
-            font=font,
-        )
-        image.text(
-            (
-                (sharepic_format["img_min_width"] - description_width) / 2,
-                sharepic_format["description_y"],
-            ),
-            description,
-            fill=(0, 0, 0),
-            font=fontsm,
-        )
-
-        if data["add_orga_logo"] and self.organisation.logo:
-            # get organisations logo
-            logo_org_get = Image.open(self.organisation.logo)
-            logo_org_size = (144, 144)
-            logo_org = logo_org_get.resize(logo_org_size)
-            border = 8
-            logo_org_result = Image.new(
-                image.mode,
-                ((border + 144 + border), (border + 144 + border)),
-                (255, 255, 255),
-            )
-            logo_org_result.paste(logo_org, (border, border))
-            result.paste(logo_org_result, (80, sharepic_format["org_logo_y"]))
-
-        if data["add_aplus_logo"]:
-            # get aplus logo
-            logo_aplus_get = Image.open(
-                os.path.join(settings.BASE_DIR, "adhocracy-plus/assets/images/logo.png")
-            )
-            logo_aplus_size = (
-                sharepic_format["aplus_logo_width"],
-                sharepic_format["aplus_logo_height"],
-            )
-            logo_aplus = logo_aplus_get.resize(logo_aplus_size)
-            # position a+ logo
-            logo2_offset_y = sharepic_format["aplus_logo_y"]
-            logo2_offset_x = (
-                sharepic_format["img_min_width"] - sharepic_format["aplus_logo_width"]
-            ) // 2
-            result.paste(logo_aplus, (logo2_offset_x, logo2_offset_y), mask=logo_aplus)
-
-        buffered_image = BytesIO()
-        result.save(buffered_image, format="PNG")
-
-        return base64.b64encode(buffered_image.getvalue()).decode("utf-8")
+    calc_aspect_ratio = staticmethod(sharepics.calc_aspect_ratio)
 
     @property
     def project(self):
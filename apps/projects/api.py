@@ -1,9 +1,20 @@
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Exists
+from django.db.models import OuterRef
+from django.db.models import Prefetch
 from django.db.models import Q
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_cache_control
+from django.utils.http import quote_etag
 from rest_framework import permissions
 from rest_framework import viewsets
 
 from adhocracy4.modules.models import Module
+from adhocracy4.phases.models import Phase
 from adhocracy4.projects.enums import Access
 from adhocracy4.projects.models import Project
 
@@ -12,31 +23,70 @@ from .serializers import AppProjectSerializer
 from .serializers import ModerationProjectSerializer
 
 
+class ETagMixin:
+    """Answer GET requests with 304 if the data has not changed.
+
+    The etag is a hash of the serialized data, so the data is still built
+    for every request, but clients polling for changes do not have to
+    download it again.
+    """
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method not in ("GET", "HEAD") or response.status_code != 200:
+            return response
+        state = json.dumps(response.data, sort_keys=True, cls=DjangoJSONEncoder)
+        etag = quote_etag(hashlib.sha256(state.encode()).hexdigest()[:32])
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return get_conditional_response(request, etag=etag, response=response)
+
+
 # FIXME:rename it from AppProjectsViewSet to ProjectViewSet
-class AppProjectsViewSet(viewsets.ReadOnlyModelViewSet):
+class AppProjectsViewSet(ETagMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = AppProjectSerializer
     permission_classes = (permissions.IsAuthenticated,)
     lookup_field = "slug"
 
     def get_queryset(self):
         now = timezone.now()
-        return Project.objects.filter(
-            Q(access=Access.PUBLIC) | Q(access=Access.SEMIPUBLIC),
-            Q(module__phase__start_date__lte=now)
-            | Q(module__phase__start_date__gt=now),
-            module__phase__end_date__gt=now,
-            is_draft=False,
-            is_archived=False,
-            organisation__enable_geolocation=True,  # TODO: replace with a django filter later
+        # exists instead of a join, which returned projects once per phase
+        unfinished_phases = Phase.objects.filter(
+            module__project=OuterRef("pk"),
+            start_date__isnull=False,
+            end_date__gt=now,
+        )
+        return (
+            Project.objects.filter(
+                Q(access=Access.PUBLIC) | Q(access=Access.SEMIPUBLIC),
+                Exists(unfinished_phases),
+                is_draft=False,
+                is_archived=False,
+                organisation__enable_geolocation=True,  # TODO: replace with a django filter later
+            )
+            .select_related("organisation")
+            .prefetch_related(
+                Prefetch(
+                    "module_set",
+                    queryset=Module.objects.filter(is_draft=False).prefetch_related(
+                        "phase_set"
+                    ),
+                    to_attr="app_published_modules",
+                )
+            )
         )
 
 
-class AppModuleViewSet(viewsets.ReadOnlyModelViewSet):
+class AppModuleViewSet(ETagMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = AppModuleSerializer
     permission_classes = (permissions.IsAuthenticated,)
 
     def get_queryset(self):
-        return Module.objects.filter(is_draft=False, project__is_app_accessible=True)
+        return (
+            Module.objects.filter(is_draft=False, project__is_app_accessible=True)
+            .select_related("project__organisation")
+            .prefetch_related("phase_set", "label_set", "category_set")
+        )
 
 
 class ModerationProjectsViewSet(viewsets.ReadOnlyModelViewSet):
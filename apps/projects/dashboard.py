@@ -36,7 +36,13 @@ class ParticipantsComponent(DashboardComponent):
                 r"^projects/(?P<project_slug>[-\w_]+)/participants/$",
                 views.DashboardProjectParticipantsView.as_view(component=self),
                 "dashboard-participants-edit",
-            )
+            ),
+            (
+                r"^projects/(?P<project_slug>[-\w_]+)/participants/"
+                r"invites/(?P<pk>\d+)/$",
+                views.DashboardInviteDispatchView.as_view(component=self),
+                "dashboard-participants-invites",
+            ),
         ]
 
 
@@ -63,7 +69,13 @@ class ModeratorsComponent(DashboardComponent):
                 r"^projects/(?P<project_slug>[-\w_]+)/moderators/$",
                 views.DashboardProjectModeratorsView.as_view(component=self),
                 "dashboard-moderators-edit",
-            )
+            ),
+            (
+                r"^projects/(?P<project_slug>[-\w_]+)/moderators/"
+                r"invites/(?P<pk>\d+)/$",
+                views.DashboardInviteDispatchView.as_view(component=self),
+                "dashboard-moderators-invites",
+            ),
         ]
 
 
@@ -27,6 +27,7 @@ class InviteModeratorEmail(Email):
 
 class WelcomeToPrivateProjectEmail(Email):
     template_name = "a4_candy_projects/emails/welcome_participant"
+    use_render_cache = True
 
     def get_organisation(self):
         return self.object.organisation
@@ -2,19 +2,96 @@ from datetime import timedelta
 
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Count
+from django.db.models import F
 from django.db.models import Q
 from django.utils import timezone
+from django.utils.functional import cached_property
 
 from adhocracy4.comments.models import Comment
+from adhocracy4.modules.models import Module
+from adhocracy4.phases.models import Phase
 from adhocracy4.reports.models import Report
 
+from .models import CommentRootProject
+
 
 def get_all_comments_project(project):
-    return Comment.objects.filter(
-        Q(project=project) | Q(parent_comment__project=project)
+    return Comment.objects.filter(root_project__project=project)
+
+
+def _comment_content_type_id():
+    return ContentType.objects.get_for_model(Comment).pk
+
+
+def get_comment_root_project_id(comment):
+    if (
+        comment.project_id
+        or comment.content_type_id != _comment_content_type_id()
+        or not str(comment.object_pk).isdigit()
+    ):
+        return comment.project_id
+    return (
+        Comment.objects.filter(pk=comment.object_pk)
+        .values_list("project", flat=True)
+        .first()
     )
 
 
+def update_comment_root_projects(comments, batch_size=5000):
+    """Store the root projects of the comments in batches.
+
+    The root project is the project of the comment or, for replies without
+    one, the project of the comment replied to. Yields the number of
+    comments done after every batch.
+    """
+    comment_ct_id = _comment_content_type_id()
+
+    def is_reply(project_id, content_type_id, object_pk):
+        return (
+            not project_id and content_type_id == comment_ct_id and object_pk.isdigit()
+        )
+
+    last_pk = 0
+    done = 0
+    while True:
+        rows = list(
+            comments.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", "project", "content_type", "object_pk")[:batch_size]
+        )
+        if not rows:
+            return
+        last_pk = rows[-1][0]
+
+        parent_projects = dict(
+            Comment.objects.filter(
+                pk__in={int(row[3]) for row in rows if is_reply(*row[1:])}
+            ).values_list("pk", "project")
+        )
+        root_projects = []
+        without_project = []
+        for pk, project_id, content_type_id, object_pk in rows:
+            if is_reply(project_id, content_type_id, object_pk):
+                project_id = parent_projects.get(int(object_pk))
+            if project_id:
+                root_projects.append(
+                    CommentRootProject(comment_id=pk, project_id=project_id)
+                )
+            else:
+                without_project.append(pk)
+
+        CommentRootProject.objects.bulk_create(
+            root_projects,
+            update_conflicts=True,
+            unique_fields=["comment"],
+            update_fields=["project"],
+        )
+        if without_project:
+            CommentRootProject.objects.filter(comment__in=without_project).delete()
+        done += len(rows)
+        yield done
+
+
 def get_num_comments_project(project):
     return get_all_comments_project(project).count()
 
@@ -41,3 +118,79 @@ def get_num_reported_unread_comments(project):
         .filter(num_reports__gt=0)
         .count()
     )
+
+
+def _first_per_project(queryset):
+    first = {}
+    for obj in queryset:
+        first.setdefault(obj.project_id, obj)
+    return first
+
+
+class ModerationProjectStats:
+    """Comment counts and participation status of many projects at once.
+
+    Everything is computed with a fixed number of grouped queries on first
+    access, so an instance should only live as long as a request.
+    """
+
+    def __init__(self, projects):
+        self.projects = projects
+
+    def __getitem__(self, project):
+        return self._stats.get(project.pk) or self._empty_stats()
+
+    @staticmethod
+    def _empty_stats():
+        return {
+            "comment_count": 0,
+            "num_reported_unread_comments": 0,
+            "has_active_phase": False,
+            "future_phase": None,
+            "running_module": None,
+            "future_module": None,
+            "past_module": None,
+        }
+
+    @cached_property
+    def _stats(self):
+        project_ids = [project.pk for project in self.projects]
+        stats = {project_id: self._empty_stats() for project_id in project_ids}
+
+        comment_counts = (
+            Comment.objects.filter(root_project__project__in=project_ids)
+            .values(moderation_project=F("root_project__project"))
+            .annotate(
+                comment_count=Count("pk", distinct=True),
+                num_reported_unread_comments=Count(
+                    "pk",
+                    filter=Q(is_reviewed=False, reports__isnull=False),
+                    distinct=True,
+                ),
+            )
+        )
+        for counts in comment_counts:
+            project_stats = stats.get(counts.pop("moderation_project"))
+            if project_stats is not None:
+                project_stats.update(counts)
+
+        phases = Phase.objects.filter(module__project__in=project_ids)
+        for project_id in phases.active_phases().values_list(
+            "module__project", flat=True
+        ):
+            stats[project_id]["has_active_phase"] = True
+        future_phases = _first_per_project(
+            phases.future_phases().annotate(project_id=F("module__project"))
+        )
+        for project_id, phase in future_phases.items():
+            stats[project_id]["future_phase"] = phase
+
+        modules = Module.objects.filter(project__in=project_ids, is_draft=False)
+        for key, queryset in (
+            ("running_module", modules.running_modules().order_by("module_end")),
+            ("future_module", modules.future_modules()),
+            ("past_module", modules.past_modules()),
+        ):
+            for project_id, module in _first_per_project(queryset).items():
+                stats[project_id][key] = module
+        return stats
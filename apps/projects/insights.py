@@ -1,8 +1,18 @@
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict
 from typing import Iterable
 from typing import List
+from typing import Tuple
 
 from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models import Count
+from django.db.models import F
+from django.utils import timezone
 
+from adhocracy4.comments.models import Comment
 from adhocracy4.polls.models import Answer
 from adhocracy4.polls.models import Poll
 from adhocracy4.polls.models import Vote
@@ -106,3 +116,235 @@ def model_field_exists(cls, field):
         return True
     except FieldDoesNotExist:
         return False
+
+
+INSIGHT_COUNTERS = (
+    "comments",
+    "ratings",
+    "written_ideas",
+    "poll_answers",
+    "live_questions",
+    "unregistered_participants",
+)
+
+
+def _insight_sources():
+    """Return the objects counted in the insights.
+
+    Every source is a tuple of the queryset, the lookup of its project, the
+    counter it is added to and whether its creators are active participants.
+    This mirrors the querysets used in `create_insight`.
+    """
+    ratings = Rating.objects.filter(value__in=[Rating.POSITIVE, Rating.NEGATIVE])
+    return [
+        (Comment.objects.all(), "root_project__project", "comments", True),
+        (ratings, "comment__root_project__project", "ratings", True),
+        (ratings, "idea__module__project", "ratings", True),
+        (ratings, "mapidea__module__project", "ratings", True),
+        (ratings, "topic__module__project", "ratings", True),
+        (Like.objects.all(), "livequestion__module__project", "ratings", False),
+        (Idea.objects.all(), "module__project", "written_ideas", True),
+        (MapIdea.objects.all(), "module__project", "written_ideas", True),
+        (Proposal.objects.all(), "module__project", "written_ideas", True),
+        (Topic.objects.all(), "module__project", "written_ideas", False),
+        (
+            Vote.objects.all(),
+            "choice__question__poll__module__project",
+            "poll_answers",
+            True,
+        ),
+        (Answer.objects.all(), "question__poll__module__project", "poll_answers", True),
+        (LiveQuestion.objects.all(), "module__project", "live_questions", False),
+    ]
+
+
+def compute_insights(project_ids: Iterable[int]) -> Dict[int, dict]:
+    """Compute the insights of many projects with grouped queries.
+
+    Returns the counters and the set of active participants per project id.
+    The number of queries does not depend on the number of projects.
+    """
+    project_ids = list(project_ids)
+    results = {
+        project_id: {**dict.fromkeys(INSIGHT_COUNTERS, 0), "participants": set()}
+        for project_id in project_ids
+    }
+    unregistered = {project_id: set() for project_id in project_ids}
+
+    for queryset, project_lookup, counter, has_participants in _insight_sources():
+        queryset = queryset.filter(**{project_lookup + "__in": project_ids}).order_by()
+
+        counts = queryset.values_list(project_lookup).annotate(count=Count("pk"))
+        for project_id, count in counts:
+            results[project_id][counter] += count
+
+        if not has_participants:
+            continue
+
+        creators = (
+            queryset.filter(creator__isnull=False)
+            .values_list(project_lookup, "creator")
+            .distinct()
+        )
+        for project_id, creator_id in creators:
+            results[project_id]["participants"].add(creator_id)
+
+        # content from unregistered users doesn't have a creator but a content_id
+        if model_field_exists(queryset.model, "content_id"):
+            content_ids = (
+                queryset.filter(content_id__isnull=False)
+                .values_list(project_lookup, "content_id")
+                .distinct()
+            )
+            for project_id, content_id in content_ids:
+                unregistered[project_id].add(content_id)
+
+    for project_id, content_ids in unregistered.items():
+        results[project_id]["unregistered_participants"] = len(content_ids)
+    return results
+
+
+def write_insights(results: Dict[int, dict]) -> None:
+    """Replace the stored insights of the projects with the given results."""
+    through = ProjectInsight.active_participants.through
+    now = timezone.now()
+
+    with transaction.atomic():
+        ProjectInsight.objects.bulk_create(
+            [ProjectInsight(project_id=project_id) for project_id in results],
+            ignore_conflicts=True,
+        )
+        insights = list(ProjectInsight.objects.filter(project_id__in=results))
+        for insight in insights:
+            for counter in INSIGHT_COUNTERS:
+                setattr(insight, counter, results[insight.project_id][counter])
+            insight.modified = now
+        ProjectInsight.objects.bulk_update(insights, INSIGHT_COUNTERS + ("modified",))
+
+        through.objects.filter(projectinsight__in=insights).delete()
+        through.objects.bulk_create(
+            [
+                through(projectinsight_id=insight.pk, user_id=user_id)
+                for insight in insights
+                for user_id in results[insight.project_id]["participants"]
+            ],
+            batch_size=1000,
+        )
+
+
+def diff_insights(results: Dict[int, dict]) -> List[Tuple[int, str, int, int]]:
+    """Compare the results with the stored insights.
+
+    Returns `(project_id, field, stored value, computed value)` for every
+    value that differs.
+    """
+    stored = {
+        insight.project_id: insight
+        for insight in ProjectInsight.objects.filter(project_id__in=results).annotate(
+            participant_count=Count("active_participants")
+        )
+    }
+
+    differences = []
+    for project_id, result in results.items():
+        insight = stored.get(project_id)
+        fields = [(counter, result[counter]) for counter in INSIGHT_COUNTERS]
+        fields.append(("active_participants", len(result["participants"])))
+        for field, value in fields:
+            if field == "active_participants":
+                old = insight.participant_count if insight else 0
+            else:
+                old = getattr(insight, field) if insight else 0
+            if old != value:
+                differences.append((project_id, field, old, value))
+    return differences
+
+
+def rebuild_insights(project_ids: Iterable[int]) -> Dict[int, dict]:
+    results = compute_insights(project_ids)
+    write_insights(results)
+    return results
+
+
+_batch = threading.local()
+
+
+def increase_counts(project: Project, **counts: int) -> None:
+    """Atomically increase the insight counters of a project.
+
+    The counters are increased in the database without reading them first,
+    so concurrent contributions don't overwrite each others' increments.
+    Within a batch the increments are added up and written when it ends.
+    """
+    pending = getattr(_batch, "counts", None)
+    if pending is not None:
+        pending.setdefault(project.pk, Counter()).update(counts)
+    else:
+        _increase_counts(project.pk, counts)
+
+
+def add_active_participant(project: Project, user_id: int) -> None:
+    pairs = getattr(_batch, "pairs", None)
+    if pairs is not None:
+        pairs.add((project.pk, user_id))
+    else:
+        _add_active_participants({(project.pk, user_id)})
+
+
+@contextmanager
+def batch():
+    """Write the insight changes made within the block at once.
+
+    Counter increments are written with one update per project, active
+    participants are deduplicated and written with a single query when the
+    block is left. Nothing is written if the block raises an exception.
+    """
+    if getattr(_batch, "counts", None) is not None:
+        # join the outer batch
+        yield
+        return
+
+    counts = _batch.counts = {}
+    pairs = _batch.pairs = set()
+    try:
+        yield
+    finally:
+        _batch.counts = _batch.pairs = None
+    for project_id, project_counts in counts.items():
+        _increase_counts(project_id, project_counts)
+    _add_active_participants(pairs)
+
+
+def _increase_counts(project_id, counts):
+    if not counts:
+        return
+    updates = {field: F(field) + value for field, value in counts.items()}
+    updates["modified"] = timezone.now()
+    insights = ProjectInsight.objects.filter(project_id=project_id)
+    if not insights.update(**updates):
+        ProjectInsight.objects.get_or_create(project_id=project_id)
+        insights.update(**updates)
+
+
+def _add_active_participants(pairs):
+    if not pairs:
+        return
+
+    project_ids = {project_id for project_id, _ in pairs}
+    insight_ids = dict(
+        ProjectInsight.objects.filter(project_id__in=project_ids).values_list(
+            "project_id", "pk"
+        )
+    )
+    for project_id in project_ids.difference(insight_ids):
+        insight, _ = ProjectInsight.objects.get_or_create(project_id=project_id)
+        insight_ids[project_id] = insight.pk
+
+    through = ProjectInsight.active_participants.through
+    through.objects.bulk_create(
+        [
+            through(projectinsight_id=insight_ids[project_id], user_id=user_id)
+            for project_id, user_id in pairs
+        ],
+        ignore_conflicts=True,
+    )
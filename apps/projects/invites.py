@@ -0,0 +1,68 @@
+"""Invites of many addresses to a project at once.
+
+Addresses of users who already are in the project and addresses with a
+pending invite are sorted out with one query each. The invites are created
+with a single bulk insert and their emails are sent in chunks by background
+tasks once the transaction is committed, see `tasks.send_invites`.
+"""
+
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+
+from . import tasks
+from .models import InviteChunk
+from .models import InviteDispatch
+from .models import ModeratorInvite
+
+BULK_CREATE_BATCH_SIZE = 1000
+
+
+def invite(project, creator, invite_model, related_users, emails, site):
+    """Invite the addresses to the project and return the dispatch."""
+    emails = set(emails)
+    existing = set(
+        related_users.filter(email__in=emails).values_list("email", flat=True)
+    )
+    pending = set(
+        invite_model.objects.filter(
+            project=project, email__in=emails - existing
+        ).values_list("email", flat=True)
+    )
+    new = sorted(emails - existing - pending)
+
+    size = settings.INVITE_CHUNK_SIZE
+    with transaction.atomic():
+        invite_model.objects.bulk_create(
+            [
+                invite_model(creator=creator, project=project, email=email, site=site)
+                for email in new
+            ],
+            batch_size=BULK_CREATE_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        dispatch = InviteDispatch.objects.create(
+            project=project,
+            creator=creator,
+            invite_type=(
+                InviteDispatch.MODERATOR
+                if invite_model is ModeratorInvite
+                else InviteDispatch.PARTICIPANT
+            ),
+            existing=sorted(existing),
+            pending=sorted(pending),
+        )
+        InviteChunk.objects.bulk_create(
+            [
+                InviteChunk(
+                    dispatch=dispatch,
+                    emails=new[start : start + size],
+                    total=len(new[start : start + size]),
+                )
+                for start in range(0, len(new), size)
+            ]
+        )
+
+    transaction.on_commit(partial(tasks.send_invites.delay, dispatch.pk))
+    return dispatch
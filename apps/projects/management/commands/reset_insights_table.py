@@ -1,12 +1,32 @@
+import multiprocessing
+import time
 from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 from django.core.management.base import BaseCommand
+from django.db import connections
 
 from apps import logger
-from apps.projects.insights import create_insights
+from apps.projects.insights import compute_insights
+from apps.projects.insights import diff_insights
+from apps.projects.insights import write_insights
 from apps.projects.models import Project
 
 
+def rebuild_batch(project_ids, dry_run):
+    """Rebuild the insights of the given projects.
+
+    Returns the differences to the stored insights if `dry_run` is set,
+    otherwise the new insights are written and nothing is returned.
+    """
+    results = compute_insights(project_ids)
+    if dry_run:
+        return diff_insights(results)
+    write_insights(results)
+    return []
+
+
 class Command(BaseCommand):
     help = "Resets the insights and participation tables."
 
@@ -15,25 +35,80 @@ class Command(BaseCommand):
             "--project",
             help="project slug, resets data for this project only",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="number of projects whose insights are computed together",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="number of processes rebuilding batches of projects in parallel",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="only show the differences to the current insights",
+        )
 
     def handle(self, *args, **options):
         slug = options["project"]
+        batch_size = max(options["batch_size"], 1)
+        processes = max(options["processes"], 1)
+        dry_run = options["dry_run"]
 
+        projects = Project.objects.all()
         if slug:
-            project = Project.objects.filter(slug=slug).first()
-            if not project:
+            projects = projects.filter(slug=slug)
+            if not projects.exists():
                 known = Project.objects.order_by("slug").values_list("slug", flat=True)
                 logger.warning(f"unknown project slug: {slug=}, {list(known)=}")
                 return
 
-            projects = [project]
-        else:
-            projects = Project.objects.all()
-
-        if not projects:
+        project_ids = list(projects.order_by("pk").values_list("pk", flat=True))
+        if not project_ids:
             logger.info("no projects found")
             return
 
-        insights = create_insights(projects=projects)
+        batches = [
+            project_ids[index : index + batch_size]
+            for index in range(0, len(project_ids), batch_size)
+        ]
+        start = time.monotonic()
+        if processes == 1:
+            results = map(rebuild_batch, batches, repeat(dry_run))
+            differences = self.collect(results, batches, start)
+        else:
+            # forked processes must not share the database connection
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=processes, mp_context=multiprocessing.get_context("fork")
+            ) as executor:
+                results = executor.map(rebuild_batch, batches, repeat(dry_run))
+                differences = self.collect(results, batches, start)
+
+        duration = time.monotonic() - start
+        self.stdout.write(
+            f"{'checked' if dry_run else 'reset'} insights of {len(project_ids)} "
+            f"projects in {duration:.1f}s "
+            f"({len(project_ids) / max(duration, 0.001):.1f} projects/s)"
+        )
+
+        if dry_run:
+            for project_id, field, old, new in sorted(differences):
+                self.stdout.write(f"project {project_id}: {field} {old} -> {new}")
+            self.stdout.write(f"{len(differences)} differences found")
 
-        logger.info(f"created insights: {len(projects)=}, {len(insights)=}")
+    def collect(self, results, batches, start):
+        """Show the progress while the batches finish, return all differences."""
+        differences = []
+        total = sum(len(batch) for batch in batches)
+        done = 0
+        for batch, batch_differences in zip(batches, results):
+            differences += batch_differences
+            done += len(batch)
+            rate = done / max(time.monotonic() - start, 0.001)
+            self.stdout.write(f"{done}/{total} projects ({rate:.1f} projects/s)")
+        return differences
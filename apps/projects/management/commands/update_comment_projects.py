@@ -0,0 +1,34 @@
+import time
+from argparse import ArgumentParser
+
+from django.core.management.base import BaseCommand
+
+from adhocracy4.comments.models import Comment
+from apps.projects.helpers import update_comment_root_projects
+
+
+class Command(BaseCommand):
+    help = "Stores the root project of every comment, e.g. after a data import."
+
+    def add_arguments(self, parser: ArgumentParser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="number of comments updated together",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options["batch_size"], 1)
+        total = Comment.objects.count()
+
+        start = time.monotonic()
+        done = 0
+        for done in update_comment_root_projects(Comment.objects.all(), batch_size):
+            rate = done / max(time.monotonic() - start, 0.001)
+            self.stdout.write(f"{done}/{total} comments ({rate:.0f} comments/s)")
+
+        duration = time.monotonic() - start
+        self.stdout.write(
+            f"updated the root projects of {done} comments in {duration:.1f}s"
+        )
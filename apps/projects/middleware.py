@@ -0,0 +1,18 @@
+from . import insights
+
+
+class InsightBatchMiddleware:
+    """Write the insight changes of a request at once when it is done.
+
+    A request adding several contributions, e.g. all votes and answers of
+    a poll, updates the insight of the project only once.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method in ("GET", "HEAD", "OPTIONS"):
+            return self.get_response(request)
+        with insights.batch():
+            return self.get_response(request)
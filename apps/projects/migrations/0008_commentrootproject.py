@@ -0,0 +1,86 @@
+# Generated by Django 4.2.18 on 2026-10-18 10:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+BATCH_SIZE = 5000
+
+
+def add_root_projects(apps, schema_editor):
+    Comment = apps.get_model("a4comments", "Comment")
+    CommentRootProject = apps.get_model("a4_candy_projects", "CommentRootProject")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+
+    comments = Comment.objects.exclude(project=None).values_list("pk", "project")
+    root_projects = []
+    for pk, project_id in comments.iterator(chunk_size=BATCH_SIZE):
+        root_projects.append(CommentRootProject(comment_id=pk, project_id=project_id))
+        if len(root_projects) == BATCH_SIZE:
+            CommentRootProject.objects.bulk_create(root_projects)
+            root_projects = []
+    CommentRootProject.objects.bulk_create(root_projects)
+
+    # replies without a project of their own belong to the project of the
+    # comment they reply to
+    comment_ct = ContentType.objects.filter(
+        app_label="a4comments", model="comment"
+    ).first()
+    replies = list(
+        Comment.objects.filter(project=None, content_type=comment_ct).values_list(
+            "pk", "object_pk"
+        )
+    )
+    for index in range(0, len(replies), BATCH_SIZE):
+        batch = replies[index : index + BATCH_SIZE]
+        parent_projects = dict(
+            Comment.objects.filter(
+                pk__in=[int(object_pk) for _, object_pk in batch if object_pk.isdigit()]
+            )
+            .exclude(project=None)
+            .values_list("pk", "project")
+        )
+        CommentRootProject.objects.bulk_create(
+            CommentRootProject(
+                comment_id=pk, project_id=parent_projects[int(object_pk)]
+            )
+            for pk, object_pk in batch
+            if object_pk.isdigit() and int(object_pk) in parent_projects
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("a4comments", "0013_set_project"),
+        ("a4projects", "0039_add_alt_text_to_field"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("a4_candy_projects", "0007_projectinsight_unregistered_participants"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CommentRootProject",
+            fields=[
+                (
+                    "comment",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="root_project",
+                        serialize=False,
+                        to="a4comments.comment",
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="a4projects.project",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(add_root_projects, migrations.RunPython.noop),
+    ]
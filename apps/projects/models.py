@@ -2,9 +2,12 @@ import uuid
 
 from django.conf import settings
 from django.db import models
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
+from adhocracy4.comments.models import Comment
 from adhocracy4.models import base
 from adhocracy4.projects.models import Project
 
@@ -38,6 +41,8 @@ class ParticipantInviteManager(models.Manager):
 
 
 class ParticipantInvite(Invite):
+    email_class = emails.InviteParticipantEmail
+
     objects = ParticipantInviteManager()
 
     def __str__(self):
@@ -68,6 +73,8 @@ class ModeratorInviteManager(models.Manager):
 
 
 class ModeratorInvite(Invite):
+    email_class = emails.InviteModeratorEmail
+
     objects = ModeratorInviteManager()
 
     def __str__(self):
@@ -88,6 +95,103 @@ class ModeratorInvite(Invite):
         unique_together = ("email", "project")
 
 
+class InviteDispatch(base.TimeStampedModel):
+    """Sending state of the invites added to a project at once.
+
+    Addresses of users already in the project and addresses with a pending
+    invite are kept for the report, the new invites are sent in chunks.
+    """
+
+    PARTICIPANT = "participant"
+    MODERATOR = "moderator"
+    INVITE_TYPE_CHOICES = (
+        (PARTICIPANT, _("Participants")),
+        (MODERATOR, _("Moderators")),
+    )
+
+    project = models.ForeignKey(
+        Project, related_name="invite_dispatches", on_delete=models.CASCADE
+    )
+    creator = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    invite_type = models.CharField(max_length=20, choices=INVITE_TYPE_CHOICES)
+    existing = models.JSONField(default=list)
+    pending = models.JSONField(default=list)
+    finished = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["-created"]
+
+    @property
+    def invite_model(self):
+        if self.invite_type == self.MODERATOR:
+            return ModeratorInvite
+        return ParticipantInvite
+
+    def get_absolute_url(self):
+        return reverse(
+            "a4dashboard:dashboard-{}s-invites".format(self.invite_type),
+            kwargs={
+                "organisation_slug": self.project.organisation.slug,
+                "project_slug": self.project.slug,
+                "pk": self.pk,
+            },
+        )
+
+    def get_progress(self):
+        progress = self.chunks.aggregate(
+            total=Coalesce(Sum("total"), 0),
+            sent=Coalesce(Sum("sent"), 0),
+            failed=Coalesce(Sum("failed_count"), 0),
+        )
+        progress["pending"] = progress["total"] - progress["sent"] - progress["failed"]
+        return progress
+
+    def get_report(self):
+        """Yield every address with the result of inviting it."""
+        for email in self.existing:
+            yield email, _("already accepted an invitation")
+        for email in self.pending:
+            yield email, _("already invited")
+        for chunk in self.chunks.all():
+            failed = set(chunk.failed_emails)
+            for index, email in enumerate(chunk.emails):
+                if email in failed:
+                    yield email, _("sending failed")
+                elif chunk.finished or index < chunk.cursor:
+                    yield email, _("invited")
+                else:
+                    yield email, _("sending")
+
+    def __str__(self):
+        return "Invites of {s.invite_type}s to {s.project}".format(s=self)
+
+
+class InviteChunk(models.Model):
+    """Invites of a dispatch sent by a single task.
+
+    The cursor holds the number of processed addresses, so a chunk
+    interrupted by a crashed worker continues after the last one.
+    """
+
+    dispatch = models.ForeignKey(
+        InviteDispatch, related_name="chunks", on_delete=models.CASCADE
+    )
+    emails = models.JSONField(default=list)
+    cursor = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    failed_emails = models.JSONField(default=list)
+    locked_until = models.DateTimeField(blank=True, null=True)
+    finished = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["pk"]
+
+    def __str__(self):
+        return "{s.total} invites of {s.dispatch}".format(s=self)
+
+
 class ProjectInsight(base.TimeStampedModel):
     project = models.OneToOneField(
         Project, related_name="insight", on_delete=models.CASCADE
@@ -112,6 +216,25 @@ class ProjectInsight(base.TimeStampedModel):
         return "Insights for project %s" % self.project.name
 
 
+class CommentRootProject(models.Model):
+    """The project of a comment or of the comment it replies to.
+
+    Lets the comments of a project be filtered with one indexed equality
+    instead of or-ing the project of the comment and of its parent.
+    """
+
+    comment = models.OneToOneField(
+        Comment,
+        primary_key=True,
+        related_name="root_project",
+        on_delete=models.CASCADE,
+    )
+    project = models.ForeignKey(Project, related_name="+", on_delete=models.CASCADE)
+
+    def __str__(self):
+        return "Comment {s.comment_id} in project {s.project_id}".format(s=self)
+
+
 def create_insight_context(insight: ProjectInsight) -> dict:
     """
     ("BS", _("brainstorming")),
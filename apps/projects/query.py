@@ -1,6 +1,6 @@
-from django.db.models import Q
+from django.db import models
 
-from adhocracy4.projects.enums import Access
+from . import visibility
 
 
 def filter_viewable(queryset, user):
@@ -10,14 +10,15 @@ def filter_viewable(queryset, user):
     #        be overwritten and the Project model is not swappable.
     if user.is_superuser:
         return queryset
-    elif user.is_authenticated:
-        return queryset.filter(
-            Q(access=Access.PUBLIC)
-            | Q(access=Access.SEMIPUBLIC)
-            | Q(participants__in=[user.id])
-            | Q(organisation__initiators__id__in=[user.id])
-            | Q(moderators__in=[user.id])
-            | Q(organisation__member__member__id=user.id)
-        ).distinct()
-    else:
-        return queryset.filter(Q(access=Access.PUBLIC) | Q(access=Access.SEMIPUBLIC))
+    return queryset.filter(visibility.get_viewable_filter(user))
+
+
+class ProjectQuerySet(models.QuerySet):
+    """Projects with the filters of this app.
+
+    The Project model and its manager belong to adhocracy4, so this is used
+    on its own, e.g. ProjectQuerySet(Project).viewable(user).
+    """
+
+    def viewable(self, user):
+        return filter_viewable(self, user)
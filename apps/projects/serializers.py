@@ -1,14 +1,11 @@
-from functools import lru_cache
-
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from easy_thumbnails.files import get_thumbnailer
 from rest_framework import serializers
 
 from adhocracy4.api.dates import get_date_display
 from adhocracy4.api.dates import get_datetime_display
-from adhocracy4.categories.models import Category
-from adhocracy4.labels.models import Label
 from adhocracy4.modules.models import Module
 from adhocracy4.phases.models import Phase
 from adhocracy4.projects.models import Project
@@ -19,7 +16,7 @@ class AppProjectSerializer(serializers.ModelSerializer):
     information = serializers.SerializerMethodField()
     result = serializers.SerializerMethodField()
     # todo: remove many=True once AppProjects are restricted to single module
-    published_modules = serializers.PrimaryKeyRelatedField(read_only=True, many=True)
+    published_modules = serializers.SerializerMethodField()
     organisation = serializers.SerializerMethodField()
     organisation_logo = serializers.SerializerMethodField()
     access = serializers.SerializerMethodField()
@@ -57,6 +54,62 @@ class AppProjectSerializer(serializers.ModelSerializer):
             "contact_url",
         )
 
+    def _get_modules(self, project):
+        """Return the published modules of the project by status.
+
+        Computed once per project from the modules and phases prefetched by
+        the view set, the start and end of the modules are set on them as
+        the module querysets of a4 would annotate them.
+        """
+        if "app_modules" not in project.__dict__:
+            modules = getattr(project, "app_published_modules", None)
+            if modules is None:
+                modules = list(project.published_modules.prefetch_related("phase_set"))
+            now = timezone.now()
+            running, future, past = [], [], []
+            for module in modules:
+                phases = module.phase_set.all()
+                starts = [phase.start_date for phase in phases if phase.start_date]
+                ends = [phase.end_date for phase in phases if phase.end_date]
+                start = min(starts) if starts else None
+                end = max(ends) if ends else None
+                module.__dict__["module_start"] = start
+                module.__dict__["module_end"] = end
+                if start is None or end is None:
+                    continue
+                if start <= now < end:
+                    running.append((end, module))
+                elif start > now:
+                    future.append((start, module))
+                else:
+                    past.append((end, module))
+            running, future, past = (
+                [module for _, module in sorted(status, key=lambda item: item[0])]
+                for status in (running, future, past)
+            )
+            # the progress properties of the project are based on this module
+            project.__dict__.setdefault(
+                "running_module_ends_next", running[0] if running else None
+            )
+            project.__dict__["app_modules"] = {
+                "published": modules,
+                "running": running,
+                "future": future,
+                "past": past,
+            }
+        return project.__dict__["app_modules"]
+
+    def to_representation(self, project):
+        # before module_running_progress is read from the project
+        self._get_modules(project)
+        return super().to_representation(project)
+
+    def _get_single_module(self, project, blueprint_type):
+        modules = self._get_modules(project)["published"]
+        if len(modules) == 1 and modules[0].blueprint_type == blueprint_type:
+            return modules[0].pk
+        return False
+
     def get_url(self, project: Project) -> str:
         return project.get_absolute_url()
 
@@ -80,37 +133,29 @@ class AppProjectSerializer(serializers.ModelSerializer):
     def get_access(self, project):
         return project.access.name
 
+    def get_published_modules(self, project):
+        return [module.pk for module in self._get_modules(project)["published"]]
+
     def get_single_idea_collection_module(self, project):
-        if (
-            project.published_modules.count() == 1
-            and project.published_modules.first().blueprint_type == "IC"
-        ):
-            return project.published_modules.first().pk
-        return False
+        return self._get_single_module(project, "IC")
 
     def get_single_poll_module(self, project):
-        if (
-            project.published_modules.count() == 1
-            and project.published_modules.first().blueprint_type == "PO"
-        ):
-            return project.published_modules.first().pk
-        return False
+        return self._get_single_module(project, "PO")
 
     def get_participation_time_display(self, project):
-        if project.running_modules:
+        modules = self._get_modules(project)
+        if modules["running"]:
             if project.module_running_days_left < 365:
                 return _("%(time_left)s remaining") % {
                     "time_left": project.module_running_time_left
                 }
             else:
                 return _("more than 1 year remaining")
-        elif project.future_modules:
+        elif modules["future"]:
             return _("Participation: from %(project_start)s") % {
-                "project_start": get_date_display(
-                    project.future_modules.first().module_start
-                )
+                "project_start": get_date_display(modules["future"][0].module_start)
             }
-        elif project.past_modules:
+        elif modules["past"]:
             return _("Participation ended. Read result.")
         return ""
 
@@ -161,32 +206,75 @@ class AppModuleSerializer(serializers.ModelSerializer):
             "has_idea_adding_permission",
         )
 
+    def _get_phases(self, module):
+        """Return the phases of the module by status from the prefetched ones.
+
+        The active phase is also set on the module, so the rules checking it
+        do not query it again.
+        """
+        if "app_phases" not in module.__dict__:
+            now = timezone.now()
+            # phases without a start are future phases as in a4
+            phases = sorted(
+                module.phase_set.all(),
+                key=lambda phase: (
+                    phase.start_date is None,
+                    phase.start_date,
+                    phase.pk,
+                ),
+            )
+            active = [
+                phase
+                for phase in phases
+                if phase.start_date
+                and phase.end_date
+                and phase.start_date <= now < phase.end_date
+            ]
+            future = [
+                phase
+                for phase in phases
+                if not phase.start_date or phase.start_date > now
+            ]
+            past = [
+                phase for phase in phases if phase.end_date and phase.end_date <= now
+            ]
+            module.__dict__.setdefault("active_phase", active[0] if active else None)
+            module.__dict__["app_phases"] = {
+                "active": module.__dict__["active_phase"],
+                "future": future,
+                "past": past,
+            }
+        return module.__dict__["app_phases"]
+
     def get_active_phase(self, module):
-        if module.active_phase:
-            serializer = AppPhaseSerializer(instance=module.active_phase)
+        active_phase = self._get_phases(module)["active"]
+        if active_phase:
+            serializer = AppPhaseSerializer(instance=active_phase)
             return serializer.data
         return None
 
     def get_future_phases(self, module):
-        if module.future_phases:
-            serializer = AppPhaseSerializer(instance=module.future_phases, many=True)
+        future_phases = self._get_phases(module)["future"]
+        if future_phases:
+            serializer = AppPhaseSerializer(instance=future_phases, many=True)
             return serializer.data
         return None
 
     def get_past_phases(self, module):
-        if module.past_phases:
-            serializer = AppPhaseSerializer(instance=module.past_phases, many=True)
+        past_phases = self._get_phases(module)["past"]
+        if past_phases:
+            serializer = AppPhaseSerializer(instance=past_phases, many=True)
             return serializer.data
         return None
 
     def get_labels(self, instance):
-        labels = Label.objects.filter(module=instance)
+        labels = instance.label_set.all()
         if labels:
             return [{"id": label.pk, "name": label.name} for label in labels]
         return False
 
     def get_categories(self, instance):
-        categories = Category.objects.filter(module=instance)
+        categories = instance.category_set.all()
         if categories:
             return [
                 {"id": category.pk, "name": category.name} for category in categories
@@ -236,20 +324,32 @@ class ModerationProjectSerializer(serializers.ModelSerializer):
             "moderation_detail_url",
         ]
 
-    @lru_cache(maxsize=1)
+    def _get_stats(self, instance):
+        """Return the numbers of the project from the per-request memo.
+
+        The memo covers all projects of the list being serialized, so they
+        are computed together with one set of grouped queries.
+        """
+        if "moderation_stats" not in self.context:
+            if isinstance(self.parent, serializers.ListSerializer):
+                projects = self.parent.instance
+            else:
+                projects = [instance]
+            self.context["moderation_stats"] = helpers.ModerationProjectStats(projects)
+        return self.context["moderation_stats"][instance]
+
     def _get_participation_status_project(self, instance):
-        project_phases = instance.phases
+        stats = self._get_stats(instance)
 
-        if project_phases.active_phases():
+        if stats["has_active_phase"]:
             return _("running"), True
 
-        if project_phases.future_phases():
+        future_phase = stats["future_phase"]
+        if future_phase:
             try:
                 return (
                     _("starts on {}").format(
-                        project_phases.future_phases()
-                        .first()
-                        .start_date.strftime("%d.%m.%y")
+                        future_phase.start_date.strftime("%d.%m.%y")
                     ),
                     True,
                 )
@@ -294,8 +394,8 @@ class ModerationProjectSerializer(serializers.ModelSerializer):
             return None
 
     def get_status(self, instance):
-        project_phases = instance.phases
-        if project_phases.active_phases() or project_phases.future_phases():
+        stats = self._get_stats(instance)
+        if stats["has_active_phase"] or stats["future_phase"]:
             return 0
         return 1
 
@@ -314,12 +414,18 @@ class ModerationProjectSerializer(serializers.ModelSerializer):
         return str(participation_string)
 
     def get_future_phase(self, instance):
-        if instance.future_modules and instance.future_modules.first().module_start:
-            return str(instance.future_modules.first().module_start)
+        future_module = self._get_stats(instance)["future_module"]
+        if future_module and future_module.module_start:
+            return str(future_module.module_start)
         return False
 
     def get_active_phase(self, instance):
-        if instance.active_phase_ends_next:
+        stats = self._get_stats(instance)
+        if stats["has_active_phase"]:
+            # the progress properties of the project are based on this module
+            instance.__dict__.setdefault(
+                "running_module_ends_next", stats["running_module"]
+            )
             progress = instance.module_running_progress
             time_left = instance.module_running_time_left
             end_date = str(instance.running_module_ends_next.module_end)
@@ -327,15 +433,16 @@ class ModerationProjectSerializer(serializers.ModelSerializer):
         return False
 
     def get_past_phase(self, instance):
-        if instance.past_modules and instance.past_modules.first().module_end:
-            return str(instance.past_modules.first().module_end)
+        past_module = self._get_stats(instance)["past_module"]
+        if past_module and past_module.module_end:
+            return str(past_module.module_end)
         return False
 
     def get_num_reported_unread_comments(self, instance):
-        return helpers.get_num_reported_unread_comments(instance)
+        return self._get_stats(instance)["num_reported_unread_comments"]
 
     def get_comment_count(self, instance):
-        return helpers.get_num_comments_project(instance)
+        return self._get_stats(instance)["comment_count"]
 
     def get_moderation_detail_url(self, instance):
         return reverse(
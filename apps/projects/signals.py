@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.db.models import signals
 from django.dispatch import receiver
 
@@ -8,6 +9,7 @@ from adhocracy4.polls.signals import poll_voted
 from adhocracy4.projects.models import Project
 from adhocracy4.ratings.models import Rating
 from apps.budgeting.models import Proposal
+from apps.contrib.instrumentation import bulk_operation
 from apps.ideas.models import Idea
 from apps.interactiveevents.models import Like
 from apps.interactiveevents.models import LiveQuestion
@@ -15,27 +17,50 @@ from apps.mapideas.models import MapIdea
 from apps.topicprio.models import Topic
 
 from . import emails
-from .models import ProjectInsight
+from . import helpers
+from . import insights
+from .models import CommentRootProject
 
 
 @receiver(signals.m2m_changed, sender=Project.participants.through)
 def send_welcome_to_private_project_email(action, **kwargs):
     if action == "post_add":
         project = kwargs.get("instance")
-        participant_pks = list(kwargs.get("pk_set"))
+        participant_pks = sorted(kwargs.get("pk_set"))
+        size = settings.WELCOME_EMAIL_CHUNK_SIZE
 
-        emails.WelcomeToPrivateProjectEmail.send(
-            project, participant_pks=participant_pks
-        )
+        # one background task per chunk instead of a single large one
+        with bulk_operation("welcome emails", receivers=len(participant_pks)) as stats:
+            stats["chunks"] = 0
+            for start in range(0, len(participant_pks), size):
+                emails.WelcomeToPrivateProjectEmail.send(
+                    project, participant_pks=participant_pks[start : start + size]
+                )
+                stats["chunks"] += 1
 
 
 @receiver(signals.post_save, sender=Comment)
 def increase_comments_count(sender, instance, created, **kwargs):
     if created and instance.project:
-        insight, _ = ProjectInsight.objects.get_or_create(project=instance.project)
-        insight.comments += 1
-        insight.save()
-        insight.active_participants.add(instance.creator.id)
+        insights.increase_counts(instance.project, comments=1)
+        insights.add_active_participant(instance.project, instance.creator.id)
+
+
+@receiver(signals.post_save, sender=Comment)
+def update_comment_root_project(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    if update_fields and "project" not in update_fields:
+        return
+    project_id = helpers.get_comment_root_project_id(instance)
+    if created and project_id:
+        CommentRootProject.objects.create(comment=instance, project_id=project_id)
+    elif project_id:
+        CommentRootProject.objects.update_or_create(
+            comment=instance, defaults={"project_id": project_id}
+        )
+    elif not created:
+        CommentRootProject.objects.filter(comment=instance).delete()
 
 
 @receiver(signals.post_save, sender=Idea)
@@ -46,41 +71,31 @@ def increase_idea_count(sender, instance, created, **kwargs):
     if not created:
         return
 
-    insight, _ = ProjectInsight.objects.get_or_create(project=instance.module.project)
-    insight.written_ideas += 1
-    insight.save()
+    project = instance.module.project
+    insights.increase_counts(project, written_ideas=1)
 
     if sender != Topic:
-        insight.active_participants.add(instance.creator.id)
+        insights.add_active_participant(project, instance.creator.id)
 
 
 @receiver(signals.post_save, sender=Rating)
 def increase_rating_count(sender, instance, created, **kwargs):
     if created:
-        insight, _ = ProjectInsight.objects.get_or_create(
-            project=instance.module.project
-        )
-        insight.ratings += 1
-        insight.active_participants.add(instance.creator.id)
-        insight.save()
+        project = instance.module.project
+        insights.increase_counts(project, ratings=1)
+        insights.add_active_participant(project, instance.creator.id)
 
 
 @receiver(signals.post_save, sender=LiveQuestion)
 def increase_live_questions_count(sender, instance, created, **kwargs):
     if created:
-        project = instance.module.project
-        insight, _ = ProjectInsight.objects.get_or_create(project=project)
-        insight.live_questions += 1
-        insight.save()
+        insights.increase_counts(instance.module.project, live_questions=1)
 
 
 @receiver(signals.post_save, sender=Like)
 def increase_ratings_count_for_likes(sender, instance, created, **kwargs):
     if created:
-        project = instance.livequestion.module.project
-        insight, _ = ProjectInsight.objects.get_or_create(project=project)
-        insight.ratings += 1
-        insight.save()
+        insights.increase_counts(instance.livequestion.module.project, ratings=1)
 
 
 @receiver(signals.post_save, sender=Vote)
@@ -92,16 +107,13 @@ def increase_poll_answers_count(sender, instance, created, **kwargs):
         else:
             project = instance.project
 
-        insight, _ = ProjectInsight.objects.get_or_create(project=project)
-        insight.poll_answers += 1
-        insight.save()
+        insights.increase_counts(project, poll_answers=1)
 
 
 @receiver(poll_voted)
 def increase_poll_participant_count(sender, poll, creator, content_id, **kwargs):
-    insight, _ = ProjectInsight.objects.get_or_create(project=poll.module.project)
+    project = poll.module.project
     if creator:
-        insight.active_participants.add(creator.id)
+        insights.add_active_participant(project, creator.id)
     else:
-        insight.unregistered_participants += 1
-    insight.save()
+        insights.increase_counts(project, unregistered_participants=1)
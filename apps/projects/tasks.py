@@ -1,6 +1,19 @@
 import importlib
+from datetime import timedelta
 
 from celery import shared_task
+from django.db.models import F
+from django.db.models import Q
+from django.utils import timezone
+
+from apps import logger
+
+from .models import InviteChunk
+from .models import InviteDispatch
+
+# A chunk is locked by the task sending it. The lock is renewed after every
+# mail, so it only expires if the worker died while sending the chunk.
+CHUNK_LOCK_DURATION = timedelta(minutes=10)
 
 
 @shared_task
@@ -8,3 +21,76 @@ def send_async_no_object(email_module_name, email_class_name, object, args, kwar
     email_module = importlib.import_module(email_module_name)
     email_class = getattr(email_module, email_class_name)
     email_class().dispatch(object, *args, **kwargs)
+
+
+@shared_task
+def send_invites(dispatch_pk):
+    """Enqueue a task per unfinished chunk of invites of the dispatch."""
+    chunk_pks = InviteChunk.objects.filter(
+        dispatch_id=dispatch_pk, finished__isnull=True
+    ).values_list("pk", flat=True)
+    for chunk_pk in chunk_pks:
+        send_invite_chunk.delay(chunk_pk)
+    _finish_dispatch(dispatch_pk)
+
+
+@shared_task(acks_late=True)
+def send_invite_chunk(chunk_pk):
+    if not _lock_chunk(chunk_pk):
+        # finished or currently sent by another worker
+        return
+
+    chunk = InviteChunk.objects.select_related("dispatch").get(pk=chunk_pk)
+    dispatch = chunk.dispatch
+    invite_model = dispatch.invite_model
+    remaining = chunk.emails[chunk.cursor :]
+    invites = {
+        invite.email: invite
+        for invite in invite_model.objects.filter(
+            project_id=dispatch.project_id, email__in=remaining
+        ).select_related("project__organisation")
+    }
+    email = invite_model.email_class()
+    email.resolve_languages(remaining)
+
+    failed_emails = list(chunk.failed_emails)
+    for cursor, address in enumerate(remaining, start=chunk.cursor + 1):
+        counter = "sent"
+        invite = invites.get(address)
+        # invites removed in the meantime are not sent
+        if invite is not None:
+            try:
+                email.dispatch(invite)
+            except Exception:
+                logger.exception("Sending the invite to {} failed".format(address))
+                failed_emails.append(address)
+                counter = "failed_count"
+        InviteChunk.objects.filter(pk=chunk_pk).update(
+            cursor=cursor,
+            locked_until=timezone.now() + CHUNK_LOCK_DURATION,
+            failed_emails=failed_emails,
+            **{counter: F(counter) + 1}
+        )
+
+    InviteChunk.objects.filter(pk=chunk_pk).update(
+        locked_until=None, finished=timezone.now()
+    )
+    _finish_dispatch(dispatch.pk)
+
+
+def _lock_chunk(chunk_pk):
+    now = timezone.now()
+    return (
+        InviteChunk.objects.filter(pk=chunk_pk, finished__isnull=True)
+        .filter(Q(locked_until__isnull=True) | Q(locked_until__lt=now))
+        .update(locked_until=now + CHUNK_LOCK_DURATION)
+    ) == 1
+
+
+def _finish_dispatch(dispatch_pk):
+    if not InviteChunk.objects.filter(
+        dispatch_id=dispatch_pk, finished__isnull=True
+    ).exists():
+        InviteDispatch.objects.filter(pk=dispatch_pk, finished__isnull=True).update(
+            finished=timezone.now()
+        )
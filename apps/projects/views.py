@@ -1,8 +1,10 @@
+import csv
 import itertools
 
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.sites.shortcuts import get_current_site
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
@@ -26,6 +28,7 @@ from apps.projects.models import ProjectInsight
 
 from . import dashboard
 from . import forms
+from . import invites
 from . import models
 
 User = get_user_model()
@@ -136,72 +139,56 @@ class AbstractProjectUserInviteListView(
         self._send_component_updated_signal()
         return response
 
-    def filter_existing(self, emails):
-        related_users = getattr(self.object, self.related_users_field)
-        related_emails = [u.email for u in related_users.all()]
-        existing = []
-        filtered_emails = []
-        for email in emails:
-            if email in related_emails:
-                existing.append(email)
-            else:
-                filtered_emails.append(email)
-        return filtered_emails, existing
-
-    def filter_pending(self, emails):
-        pending = []
-        filtered_emails = []
-        for email in emails:
-            if self.invite_model.objects.filter(
-                email=email, project=self.project
-            ).exists():
-                pending.append(email)
-            else:
-                filtered_emails.append(email)
-        return filtered_emails, pending
-
     def form_valid(self, form):
-        emails = list(
-            set(
-                itertools.chain(
-                    form.cleaned_data["add_users"],
-                    form.cleaned_data["add_users_upload"],
-                )
-            )
+        emails = itertools.chain(
+            form.cleaned_data["add_users"],
+            form.cleaned_data["add_users_upload"],
+        )
+        dispatch = invites.invite(
+            project=self.project,
+            creator=self.request.user,
+            invite_model=self.invite_model,
+            related_users=getattr(self.object, self.related_users_field),
+            emails=emails,
+            site=get_current_site(self.request),
         )
 
-        emails, existing = self.filter_existing(emails)
-        if existing:
+        if dispatch.existing:
             messages.error(
                 self.request,
                 _("Following users already accepted an invitation: ")
-                + ", ".join(existing),
+                + ", ".join(dispatch.existing),
             )
-
-        emails, pending = self.filter_pending(emails)
-        if pending:
+        if dispatch.pending:
             messages.error(
                 self.request,
-                _("Following users are already invited: ") + ", ".join(pending),
-            )
-
-        for email in emails:
-            self.invite_model.objects.invite(
-                creator=self.request.user,
-                project=self.project,
-                email=email,
-                site=get_current_site(self.request),
+                _("Following users are already invited: ")
+                + ", ".join(dispatch.pending),
             )
 
+        invited = dispatch.get_progress()["total"]
         messages.success(
             self.request,
-            ngettext(
-                self.success_message[0], self.success_message[1], len(emails)
-            ).format(len(emails)),
+            ngettext(self.success_message[0], self.success_message[1], invited).format(
+                invited
+            ),
         )
 
         return redirect(self.get_success_url())
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["invite_dispatches"] = self.project.invite_dispatches.filter(
+            invite_type=self.invite_type
+        )[:5]
+        return context
+
+    @property
+    def invite_type(self):
+        if self.invite_model is models.ModeratorInvite:
+            return models.InviteDispatch.MODERATOR
+        return models.InviteDispatch.PARTICIPANT
+
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
         kwargs["labels"] = (self.add_user_field_label, self.add_user_upload_field_label)
@@ -254,6 +241,52 @@ class DashboardProjectParticipantsView(AbstractProjectUserInviteListView):
         return self.project
 
 
+class DashboardInviteDispatchView(
+    ProjectMixin,
+    a4dashboard_mixins.DashboardBaseMixin,
+    a4dashboard_mixins.DashboardComponentMixin,
+    generic.DetailView,
+):
+    """Progress and per address result of invites added at once."""
+
+    template_name = "a4_candy_projects/invite_dispatch_detail.html"
+    permission_required = "a4projects.change_project"
+    menu_item = "project"
+    context_object_name = "dispatch"
+
+    def get_queryset(self):
+        return models.InviteDispatch.objects.filter(project=self.project)
+
+    def get_permission_object(self):
+        return self.project
+
+    def get(self, request, *args, **kwargs):
+        if request.GET.get("format") == "csv":
+            return self.render_csv(self.get_object())
+        return super().get(request, *args, **kwargs)
+
+    def render_csv(self, dispatch):
+        response = HttpResponse(content_type="text/csv")
+        response["Content-Disposition"] = (
+            'attachment; filename="invites-{}.csv"'.format(dispatch.pk)
+        )
+        writer = csv.writer(response)
+        writer.writerow([_("Email"), _("Result")])
+        for email, result in dispatch.get_report():
+            writer.writerow([email, result])
+        return response
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["progress"] = self.object.get_progress()
+        context["failed_emails"] = [
+            email
+            for chunk in self.object.chunks.exclude(failed_count=0)
+            for email in chunk.failed_emails
+        ]
+        return context
+
+
 class ProjectDeleteView(PermissionRequiredMixin, generic.DeleteView):
     model = project_models.Project
     permission_required = "a4projects.delete_project"
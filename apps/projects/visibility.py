@@ -0,0 +1,92 @@
+"""Projects a user may see besides the public and semipublic ones.
+
+Users see private projects they participate in or moderate and all projects
+of the organisations they are initiator or member of. Both sets of ids are
+queried with a single UNION of lookups on the membership tables and cached
+per user until one of the memberships of the user changes. Filtering by
+them needs neither joins nor `distinct()`.
+
+The membership receivers delete the cached ids in the process making the
+change, right away and after the commit, so the cache has to be shared by
+all web and celery processes, see `CACHES` in the production settings.
+"""
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import IntegerField
+from django.db.models import Q
+from django.db.models import Value
+
+from adhocracy4.projects.enums import Access
+from adhocracy4.projects.models import Project
+
+PROJECT = 0
+ORGANISATION = 1
+
+
+def _cache_key(user_id):
+    return "project-visibility:{}".format(user_id)
+
+
+def _through_ids(model, field_name, kind, user_id):
+    """Return (id, kind) of the relations of the user in an m2m table."""
+    field = model._meta.get_field(field_name)
+    return (
+        field.remote_field.through.objects.filter(
+            **{field.m2m_reverse_field_name() + "_id": user_id}
+        )
+        .annotate(kind=Value(kind, output_field=IntegerField()))
+        .values_list(field.m2m_field_name() + "_id", "kind")
+    )
+
+
+def _query_ids(user_id):
+    organisation_model = apps.get_model(settings.A4_ORGANISATIONS_MODEL)
+    member_model = apps.get_model("a4_candy_organisations", "Member")
+    members = (
+        member_model.objects.filter(member_id=user_id)
+        .annotate(kind=Value(ORGANISATION, output_field=IntegerField()))
+        .values_list("organisation_id", "kind")
+    )
+    rows = (
+        _through_ids(Project, "participants", PROJECT, user_id)
+        .union(
+            _through_ids(Project, "moderators", PROJECT, user_id),
+            _through_ids(organisation_model, "initiators", ORGANISATION, user_id),
+            members,
+        )
+        .order_by()
+    )
+    ids = {PROJECT: set(), ORGANISATION: set()}
+    for pk, kind in rows:
+        ids[kind].add(pk)
+    return frozenset(ids[PROJECT]), frozenset(ids[ORGANISATION])
+
+
+def get_ids(user):
+    """Return the ids of the projects and organisations the user belongs to."""
+    key = _cache_key(user.pk)
+    ids = cache.get(key)
+    if ids is None:
+        ids = _query_ids(user.pk)
+        cache.set(key, ids, settings.PROJECT_VISIBILITY_CACHE_TIMEOUT)
+    return ids
+
+
+def invalidate(*user_ids):
+    cache.delete_many([_cache_key(user_id) for user_id in user_ids])
+
+
+def get_viewable_filter(user):
+    """Return the condition for the projects the user may see."""
+    public = Q(access__in=[Access.PUBLIC, Access.SEMIPUBLIC])
+    if not user.is_authenticated:
+        return public
+    project_ids, organisation_ids = get_ids(user)
+    condition = public
+    if project_ids:
+        condition |= Q(pk__in=project_ids)
+    if organisation_ids:
+        condition |= Q(organisation_id__in=organisation_ids)
+    return condition
@@ -5,12 +5,14 @@ from rules.contrib.views import PermissionRequiredMixin
 from adhocracy4.comments.models import Comment
 from adhocracy4.exports import mixins
 from adhocracy4.exports import views as a4_export_views
+from apps.exports import mixins as export_mixins
 
 from . import models
 
 
 class TopicExportView(
     PermissionRequiredMixin,
+    export_mixins.StreamingExportMixin,
     mixins.ItemExportWithReferenceNumberMixin,
     mixins.ItemExportWithLinkMixin,
     mixins.ExportModelFieldsMixin,
@@ -25,6 +27,12 @@ class TopicExportView(
     fields = ["name", "description"]
     html_fields = ["description"]
     permission_required = "a4_candy_topicprio.change_topic"
+    export_select_related = (
+        "creator",
+        "category",
+        "module__project__organisation",
+    )
+    export_prefetch_related = ("labels",)
 
     def get_permission_object(self):
         return self.module
@@ -46,6 +54,7 @@ class TopicExportView(
 
 class TopicCommentExportView(
     PermissionRequiredMixin,
+    export_mixins.StreamingExportMixin,
     mixins.ItemExportWithLinkMixin,
     mixins.ExportModelFieldsMixin,
     mixins.UserGeneratedContentExportMixin,
@@ -59,6 +68,7 @@ class TopicCommentExportView(
 
     fields = ["id", "comment", "created"]
     permission_required = "a4_candy_topicprio.change_topic"
+    export_select_related = ("creator",)
 
     def get_permission_object(self):
         return self.module
@@ -11,6 +11,7 @@ from adhocracy4.filters.filters import FreeTextFilter
 from adhocracy4.projects.mixins import DisplayProjectOrModuleMixin
 from adhocracy4.projects.mixins import ProjectMixin
 from apps.contrib.widgets import AplusOrderingWidget
+from apps.exports.views import ExportDashboardMixin
 from apps.ideas import views as idea_views
 
 from . import forms
@@ -164,9 +165,7 @@ class TopicDeleteView(
         return self.get_object()
 
 
-class TopicDashboardExportView(DashboardExportView):
-    template_name = "a4exports/export_dashboard.html"
-
+class TopicDashboardExportView(ExportDashboardMixin, DashboardExportView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["export"] = reverse(
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class Config(AppConfig):
     name = "apps.userdashboard"
     label = "a4_candy_userdashboard"
+
+    def ready(self):
+        from . import signals  # noqa
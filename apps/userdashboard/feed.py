@@ -0,0 +1,160 @@
+"""Activity feed of the user dashboard.
+
+The feed holds the comments on content of the user and the moderator
+feedback on their comments, merged and ordered by the database. It is
+paginated by a cursor of timestamp and pk of the last action shown. The
+first page is what the dashboard shows most, the pks of its actions are
+cached per user in the shared cache until a new action for the user is
+saved. Reading the cached page also queries actions newer than its first
+one, so actions saved without the signal, e.g. by bulk_create, still show up
+and replace the cached page.
+"""
+
+from datetime import datetime
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db.models import Exists
+from django.db.models import IntegerField
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import prefetch_related_objects
+from django.db.models.functions import Cast
+
+from adhocracy4.actions.models import Action
+from adhocracy4.comments.models import Comment
+from adhocracy4.polls.models import Poll
+from apps.documents.models import Chapter
+from apps.documents.models import Paragraph
+from apps.moderatorfeedback.models import ModeratorCommentFeedback
+
+PAGE_SIZE = 20
+FIRST_PAGE_CACHE_TIMEOUT = 60 * 60
+
+
+def _content_types():
+    return ContentType.objects.get_for_models(
+        Comment, ModeratorCommentFeedback, Poll, Chapter, Paragraph
+    )
+
+
+def get_queryset(user):
+    """Return the actions of the feed of the user.
+
+    Do not return actions on comments for polls and documents to not spam
+    initiators.
+    """
+    content_types = _content_types()
+    comment_type = content_types[Comment]
+    blocked_comments = Comment.objects.filter(
+        pk=Cast(OuterRef("obj_object_id"), output_field=IntegerField()),
+        is_blocked=True,
+    )
+    comment_actions = (
+        Q(obj_content_type=comment_type, verb="add", target_creator=user)
+        & ~Q(
+            target_content_type__in=[
+                content_types[Poll],
+                content_types[Chapter],
+                content_types[Paragraph],
+            ]
+        )
+        & ~Exists(blocked_comments)
+    )
+    feedback_actions = Q(
+        obj_content_type=content_types[ModeratorCommentFeedback],
+        obj_comment_creator=user,
+    )
+    return (
+        Action.objects.filter(comment_actions | feedback_actions)
+        .exclude(actor=user)
+        .order_by("-timestamp", "-pk")
+    )
+
+
+def _prefetch(actions):
+    comment_type = _content_types()[Comment]
+    comment_actions = [a for a in actions if a.obj_content_type_id == comment_type.pk]
+    feedback_actions = [a for a in actions if a.obj_content_type_id != comment_type.pk]
+    prefetch_related_objects(comment_actions, "obj", "target__creator")
+    prefetch_related_objects(
+        feedback_actions, "obj__comment__creator", "obj__comment__content_object"
+    )
+    return actions
+
+
+def _select(queryset):
+    return queryset.select_related("actor", "project", "project__organisation")
+
+
+def encode_cursor(action):
+    return "{}_{}".format(action.timestamp.isoformat(), action.pk)
+
+
+def decode_cursor(cursor):
+    timestamp, _, pk = cursor.rpartition("_")
+    try:
+        return datetime.fromisoformat(timestamp), int(pk)
+    except ValueError:
+        return None, None
+
+
+def get_page(user, cursor=None, page_size=PAGE_SIZE):
+    """Return the actions after the cursor and the cursor of the next page."""
+    queryset = get_queryset(user)
+    if cursor:
+        timestamp, pk = decode_cursor(cursor)
+        if timestamp is not None:
+            queryset = queryset.filter(
+                Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, pk__lt=pk)
+            )
+    actions = list(_select(queryset)[: page_size + 1])
+    next_cursor = None
+    if len(actions) > page_size:
+        actions = actions[:page_size]
+        next_cursor = encode_cursor(actions[-1])
+    return _prefetch(actions), next_cursor
+
+
+def _cache_key(user_id):
+    return "userdashboard-feed:{}".format(user_id)
+
+
+def _cache_first_page(user, actions, next_cursor):
+    head = encode_cursor(actions[0]) if actions else None
+    cache.set(
+        _cache_key(user.pk),
+        ([action.pk for action in actions], head, next_cursor),
+        FIRST_PAGE_CACHE_TIMEOUT,
+    )
+
+
+def get_first_page(user):
+    """Return the first page of the feed, cached until it changes."""
+    cached = cache.get(_cache_key(user.pk))
+    if cached is None:
+        actions, next_cursor = get_page(user)
+        _cache_first_page(user, actions, next_cursor)
+        return actions, next_cursor
+
+    pks, head, next_cursor = cached
+    # comments blocked in the meantime are left out
+    query = Q(pk__in=pks)
+    timestamp, pk = decode_cursor(head) if head else (None, None)
+    if timestamp is None:
+        query = Q()
+    else:
+        query |= Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, pk__gt=pk)
+    actions = list(_select(get_queryset(user).filter(query))[: PAGE_SIZE + 1])
+    cached_pks = set(pks)
+    if any(action.pk not in cached_pks for action in actions):
+        # saved without invalidating the cache
+        if len(actions) > PAGE_SIZE:
+            actions = actions[:PAGE_SIZE]
+            next_cursor = encode_cursor(actions[-1])
+        _cache_first_page(user, actions, next_cursor)
+    return _prefetch(actions), next_cursor
+
+
+def invalidate(user_id):
+    cache.delete(_cache_key(user_id))
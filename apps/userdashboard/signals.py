@@ -0,0 +1,26 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import signals
+from django.dispatch import receiver
+
+from adhocracy4.actions.models import Action
+from apps.moderatorfeedback.models import ModeratorCommentFeedback
+
+from . import feed
+
+
+@receiver(signals.post_save, sender=Action)
+def invalidate_feed(sender, instance, created, **kwargs):
+    if not created:
+        return
+    if instance.target_creator_id:
+        feed.invalidate(instance.target_creator_id)
+    if instance.obj_content_type == ContentType.objects.get_for_model(
+        ModeratorCommentFeedback
+    ):
+        comment_creator_id = (
+            ModeratorCommentFeedback.objects.filter(pk=instance.obj_object_id)
+            .values_list("comment__creator_id", flat=True)
+            .first()
+        )
+        if comment_creator_id:
+            feed.invalidate(comment_creator_id)
@@ -1,20 +1,16 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.contrib.contenttypes.models import ContentType
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.functional import cached_property
 from django.views import generic
 
-from adhocracy4.actions.models import Action
-from adhocracy4.comments.models import Comment
-from adhocracy4.polls.models import Poll
 from adhocracy4.projects.models import Project
 from adhocracy4.rules import mixins as rules_mixins
-from apps.documents.models import Chapter
-from apps.documents.models import Paragraph
-from apps.moderatorfeedback.models import ModeratorCommentFeedback
 from apps.organisations.models import Organisation
 from apps.users.models import User
 
+from . import feed
+
 
 class UserDashboardBaseMixin(
     LoginRequiredMixin,
@@ -53,51 +49,13 @@ class UserDashboardOverviewView(UserDashboardBaseMixin):
     template_name = "a4_candy_userdashboard/userdashboard_overview.html"
     menu_item = "overview"
 
+    @cached_property
+    def feed_page(self):
+        return feed.get_first_page(self.request.user)
+
     @property
     def actions(self):
-        """Return comment/feedback actions that are  on content the user created.
-
-        Do not return actions on comments for polls and documents to not spam
-        initiators.
-        """
-        user = self.request.user
-        comment_actions = (
-            Action.objects.filter(
-                obj_content_type=ContentType.objects.get_for_model(Comment),
-                verb="add",
-                target_creator=user,
-            )
-            .exclude(
-                target_content_type__in=[
-                    ContentType.objects.get_for_model(Poll),
-                    ContentType.objects.get_for_model(Chapter),
-                    ContentType.objects.get_for_model(Paragraph),
-                ]
-            )
-            .exclude(actor=user)
-            .select_related("actor", "project")
-            .prefetch_related("obj", "target__creator")
-        )
-        filtered_comment_actions = [
-            action for action in comment_actions if not action.obj.is_blocked
-        ]
-        feedback_actions = (
-            Action.objects.filter(
-                obj_content_type=ContentType.objects.get_for_model(
-                    ModeratorCommentFeedback
-                ),
-                obj_comment_creator=user,
-            )
-            .exclude(actor=user)
-            .select_related("project", "project__organisation")
-            .prefetch_related("obj__comment__creator", "obj__comment__content_object")
-        )
-
-        return sorted(
-            filtered_comment_actions + list(feedback_actions),
-            key=lambda action: action.timestamp,
-            reverse=True,
-        )
+        return self.feed_page[0]
 
     @property
     def projects_carousel(self):
@@ -119,54 +77,20 @@ class UserDashboardActivitiesView(UserDashboardBaseMixin):
     template_name = "a4_candy_userdashboard/userdashboard_activities.html"
     menu_item = "overview"
 
+    @cached_property
+    def feed_page(self):
+        cursor = self.request.GET.get("cursor")
+        if cursor:
+            return feed.get_page(self.request.user, cursor)
+        return feed.get_first_page(self.request.user)
+
     @property
     def actions(self):
-        """Return comment/feedback actions that are  on content the user created.
-
-        Do not return actions on comments for polls and documents to not spam
-        initiators.
-        """
-        user = self.request.user
-        comment_actions = (
-            Action.objects.filter(
-                obj_content_type=ContentType.objects.get_for_model(Comment),
-                verb="add",
-                target_creator=user,
-            )
-            .exclude(
-                target_content_type__in=[
-                    ContentType.objects.get_for_model(Poll),
-                    ContentType.objects.get_for_model(Chapter),
-                    ContentType.objects.get_for_model(Paragraph),
-                ]
-            )
-            .exclude(
-                actor=user,
-            )
-            .select_related("actor", "project")
-            .prefetch_related("obj", "target__creator")
-        )
-
-        filtered_comment_actions = [
-            action for action in comment_actions if not action.obj.is_blocked
-        ]
-        feedback_actions = (
-            Action.objects.filter(
-                obj_content_type=ContentType.objects.get_for_model(
-                    ModeratorCommentFeedback
-                ),
-                obj_comment_creator=user,
-            )
-            .exclude(actor=user)
-            .select_related("project")
-            .prefetch_related("obj__comment__creator")
-        )
+        return self.feed_page[0]
 
-        return sorted(
-            filtered_comment_actions + list(feedback_actions),
-            key=lambda action: action.timestamp,
-            reverse=True,
-        )
+    @property
+    def next_cursor(self):
+        return self.feed_page[1]
 
 
 class UserDashboardFollowingView(UserDashboardBaseMixin):
@@ -1,10 +1,16 @@
+import os
+import re
+import threading
+from collections import OrderedDict
 from email.mime.image import MIMEImage
 
 import magic
 from django.conf import settings
+from django.core.mail.message import EmailMultiAlternatives
 from django.template.loader import get_template
 from django.urls import reverse
 from django.utils import translation
+from django.utils.html import escape
 from django.utils.translation import gettext_lazy as _
 from sentry_sdk import capture_message
 
@@ -22,12 +28,130 @@ PROJECT_LINK_TEXT = _(
 )
 
 
+RECEIVER_PLACEHOLDER = "\ue000{}\ue000"
+RECEIVER_PLACEHOLDER_PATTERN = re.compile("\ue000(\\w*)\ue000")
+
+
+class ReceiverPlaceholder:
+    """Stand-in for the receiver when rendering the cached parts of an email.
+
+    Every attribute renders as a placeholder, which is replaced with the
+    attribute of the actual receiver for every single mail.
+    """
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return RECEIVER_PLACEHOLDER.format(name)
+
+    def __str__(self):
+        return RECEIVER_PLACEHOLDER.format("")
+
+
+def fill_receiver_placeholders(text, receiver):
+    def replace(match):
+        name = match.group(1)
+        value = getattr(receiver, name, "") if name else receiver
+        return escape(value)
+
+    return RECEIVER_PLACEHOLDER_PATTERN.sub(replace, text)
+
+
+def create_logo_attachment(organisation):
+    logo = None
+    with open(organisation.logo.path, "rb") as f:
+        data = f.read()
+        try:
+            logo = MIMEImage(data)
+        except TypeError:
+            capture_message(
+                "warning: MIMEImage failed to detect mime type:\n"
+                "organisation:" + organisation.name + "\nfile:" + organisation.logo.path
+            )
+            mime_type = magic.from_buffer(data, mime=True)
+            logo = MIMEImage(data, _subtype=mime_type)
+    if logo:
+        logo.add_header("Content-ID", "<{}>".format("organisation_logo"))
+    return logo
+
+
+class LogoAttachmentCache:
+    """Process wide cache of the organisation logos as MIME parts.
+
+    Entries are keyed by the logo path and only used while the modification
+    time of the file did not change. The least recently used entries are
+    dropped once more than `maxsize` logos are cached.
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, organisation):
+        path = organisation.logo.path
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self.invalidate(path)
+            raise
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == mtime:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        logo = create_logo_attachment(organisation)
+        with self._lock:
+            self._entries[path] = (mtime, logo)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return logo
+
+    def invalidate(self, path):
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+logo_cache = LogoAttachmentCache()
+
+
 class EmailAplus(Email):
+    # Render the receiver independent parts of the email only once per
+    # language. Only enable this for templates which use the receiver for
+    # plain output, not in conditions or filters.
+    use_render_cache = False
+
+    _rendered_parts = None
+    _receiver_languages = None
+
     def get_languages(self, receiver):
         languages = super().get_languages(receiver)
         organisation = self.get_organisation()
-        if User.objects.filter(email=receiver).exists():
-            languages.insert(0, User.objects.get(email=receiver).language)
+        user_language = self._get_user_language(receiver)
+        if user_language:
+            languages.insert(0, user_language)
         elif organisation is not None:
             languages.insert(0, organisation.language)
         elif hasattr(settings, "DEFAULT_USER_LANGUAGE_CODE"):
@@ -35,6 +159,24 @@ class EmailAplus(Email):
 
         return languages
 
+    def _get_user_language(self, receiver):
+        if isinstance(receiver, User):
+            return receiver.language
+        if self._receiver_languages is not None:
+            return self._receiver_languages.get(receiver)
+        return (
+            User.objects.filter(email=receiver)
+            .values_list("language", flat=True)
+            .first()
+        )
+
+    def resolve_languages(self, receivers):
+        """Look up the languages of all receivers given by email at once."""
+        emails = [receiver for receiver in receivers if not isinstance(receiver, User)]
+        self._receiver_languages = dict(
+            User.objects.filter(email__in=emails).values_list("email", "language")
+        )
+
     def get_receiver_language(self, receiver):
         return self.get_languages(receiver)[0]
 
@@ -48,23 +190,8 @@ class EmailAplus(Email):
 
         organisation = self.get_organisation()
         if organisation and organisation.logo:
-            logo = None
-            with open(organisation.logo.path, "rb") as f:
-                data = f.read()
-                try:
-                    logo = MIMEImage(data)
-                except TypeError:
-                    capture_message(
-                        "warning: MIMEImage failed to detect mime type:\n"
-                        "organisation:"
-                        + organisation.name
-                        + "\nfile:"
-                        + organisation.logo.path
-                    )
-                    mime_type = magic.from_buffer(data, mime=True)
-                    logo = MIMEImage(data, _subtype=mime_type)
+            logo = logo_cache.get(organisation)
             if logo:
-                logo.add_header("Content-ID", "<{}>".format("organisation_logo"))
                 attachments += [logo]
             # need to remove standard email logo bc some email clients
             # display all attachments, even if not used
@@ -73,8 +200,25 @@ class EmailAplus(Email):
         return attachments
 
     def render(self, template_name, context):
+        receiver = context["receiver"]
+        language = self.get_receiver_language(receiver)
+        if not self.use_render_cache:
+            return self._render(template_name, context, language)
+
+        if self._rendered_parts is None:
+            self._rendered_parts = {}
+        key = (template_name, language)
+        if key not in self._rendered_parts:
+            context["receiver"] = ReceiverPlaceholder()
+            self._rendered_parts[key] = self._render(template_name, context, language)
+            context["receiver"] = receiver
+        return tuple(
+            fill_receiver_placeholders(part, receiver)
+            for part in self._rendered_parts[key]
+        )
+
+    def _render(self, template_name, context, language):
         template = get_template(template_name + ".en.email")
-        language = self.get_receiver_language(context["receiver"])
         with translation.override(language):
             context["account_link"] = self.get_html_link(
                 ACCOUNT_LINK_TEXT, reverse("account")
@@ -93,6 +237,31 @@ class EmailAplus(Email):
                 context.pop("part_type")
         return tuple(parts)
 
+    def send_to(self, receiver, context, attachments):
+        """Render and send the email to a single receiver.
+
+        This is the per receiver part of `dispatch`, used by bulk senders
+        which keep track of every single mail themselves.
+        """
+        context["receiver"] = receiver
+        subject, text, html = self.render(self.template_name, context)
+        context.pop("receiver")
+
+        to_address = receiver.email if hasattr(receiver, "email") else receiver
+        mail = EmailMultiAlternatives(
+            subject=re.sub(r"[\r\n]", "", subject).strip(),
+            body=text.strip(),
+            to=[to_address],
+            reply_to=self.get_reply_to(),
+        )
+        if attachments:
+            mail.mixed_subtype = "related"
+            for attachment in attachments:
+                mail.attach(attachment)
+        mail.attach_alternative(html, "text/html")
+        mail.send()
+        return mail
+
     def get_html_link(self, link_text, url):
 
         link = link_text.format(
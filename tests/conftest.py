@@ -3,6 +3,7 @@ from io import BytesIO
 import factory
 import pytest
 from celery import Celery
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from PIL import Image
@@ -11,6 +12,7 @@ from rest_framework.test import APIClient
 
 from adhocracy4.test import factories as a4_factories
 from adhocracy4.test.factories.maps import AreaSettingsFactory
+from apps.contrib import predicate_cache
 
 from . import factories
 
@@ -36,10 +38,57 @@ register(a4_factories.ModuleFactory)
 register(AreaSettingsFactory)
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmarks",
+        action="store_true",
+        help="run the tests marked as benchmark, they create a lot of data",
+    )
+
+
 def pytest_configure():
     Celery(task_always_eager=True)
 
 
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="benchmark, run with --benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+def pytest_generate_tests(metafunc):
+    """Run the rules tests with and without the predicate cache.
+
+    Both runs have to pass to show the cache does not change any rule.
+    """
+    if "rules" in metafunc.definition.path.parts:
+        metafunc.fixturenames.append("predicate_cache_scope")
+        metafunc.parametrize(
+            "predicate_cache_scope",
+            [False, True],
+            indirect=True,
+            ids=["uncached", "cached"],
+        )
+
+
+@pytest.fixture
+def predicate_cache_scope(request):
+    if not getattr(request, "param", True):
+        yield None
+        return
+    with predicate_cache.request_scope() as scope:
+        yield scope
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # cached values refer to pks, which are reused by later tests
+    cache.clear()
+
+
 @pytest.fixture
 def apiclient():
     return APIClient()
@@ -1,6 +1,8 @@
 import pytest
 from django.core import mail
 
+from apps.users.emails import logo_cache
+
 
 @pytest.mark.django_db
 def test_aplus_email_attachment_valid_image(
@@ -42,3 +44,29 @@ def test_aplus_email_attachment_invalid_image(
     attachments = mail.outbox[0].attachments[0]
     assert "image/jpeg" not in str(attachments)
     assert "image/text/plain" in str(attachments)
+
+
+@pytest.mark.django_db
+def test_aplus_email_logo_attachment_cache(
+    organisation_factory,
+    project_factory,
+    module_factory,
+    idea_factory,
+    small_image,
+    image_factory,
+):
+    logo_cache.clear()
+    organisation = organisation_factory(logo=small_image)
+    project = project_factory(organisation=organisation)
+    module = module_factory(project=project)
+    idea_factory(module=module)
+    idea_factory(module=module)
+
+    assert len(mail.outbox) == 2
+    assert logo_cache.info()["misses"] == 1
+    assert logo_cache.info()["hits"] == 1
+    assert str(mail.outbox[0].attachments[0]) == str(mail.outbox[1].attachments[0])
+
+    organisation.logo = image_factory(400, 400)
+    organisation.save()
+    assert logo_cache.info()["size"] == 0
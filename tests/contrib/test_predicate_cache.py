@@ -0,0 +1,83 @@
+import pytest
+import rules
+from django.db import connection
+from django.http import HttpResponse
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from adhocracy4.test.helpers import freeze_phase
+from adhocracy4.test.helpers import setup_phase
+from adhocracy4.test.helpers import setup_users
+from apps.contrib import predicate_cache
+from apps.contrib.middleware import PredicateCacheMiddleware
+from apps.ideas import phases
+
+perm_name = "a4_candy_ideas.change_idea"
+moderate_perm_name = "a4_candy_ideas.moderate_idea"
+
+
+@pytest.mark.django_db
+def test_predicate_cache_saves_evaluations(phase_factory, idea_factory):
+    phase, module, project, item = setup_phase(
+        phase_factory, idea_factory, phases.CollectPhase
+    )
+    other_item = idea_factory(module=module)
+    anonymous, moderator, initiator = setup_users(project)
+
+    with freeze_phase(phase):
+        with predicate_cache.request_scope() as scope:
+            with CaptureQueriesContext(connection) as first:
+                assert rules.has_perm(perm_name, moderator, item)
+                assert not rules.has_perm(perm_name, anonymous, item)
+            assert scope.info()["saved"] == 0
+            with CaptureQueriesContext(connection) as second:
+                assert rules.has_perm(perm_name, moderator, other_item)
+                assert not rules.has_perm(perm_name, anonymous, other_item)
+                assert module.active_phase == phase
+            assert scope.info()["saved"] > 0
+            assert len(second.captured_queries) < len(first.captured_queries)
+
+
+@pytest.mark.django_db
+def test_predicate_cache_cleared_on_change(idea, user):
+    with predicate_cache.request_scope() as scope:
+        assert not rules.has_perm(moderate_perm_name, user, idea)
+        idea.project.moderators.add(user)
+        assert rules.has_perm(moderate_perm_name, user, idea)
+        assert scope.info()["saved"] == 0
+
+
+@pytest.mark.django_db
+def test_predicate_cache_only_within_scope(idea, user):
+    assert not rules.has_perm(moderate_perm_name, user, idea)
+    with predicate_cache.request_scope() as scope:
+        assert not rules.has_perm(moderate_perm_name, user, idea)
+        assert scope.info()["evaluated"] > 0
+    assert predicate_cache._scope.get() is None
+    idea.project.moderators.add(user)
+    assert rules.has_perm(moderate_perm_name, user, idea)
+
+
+@pytest.mark.django_db
+def test_predicate_cache_middleware(rf, idea, user, caplog):
+    def get_response(request):
+        assert not rules.has_perm(moderate_perm_name, request.user, idea)
+        assert not rules.has_perm(moderate_perm_name, request.user, idea)
+        return HttpResponse()
+
+    request = rf.get("/")
+    request.user = user
+    with caplog.at_level("DEBUG", logger="apps"):
+        PredicateCacheMiddleware(get_response)(request)
+
+    assert predicate_cache._scope.get() is None
+    (record,) = [r for r in caplog.records if hasattr(r, "predicate_cache")]
+    assert record.predicate_cache["saved"] > 0
+
+
+@pytest.mark.django_db
+def test_predicate_cache_middleware_on_api(apiclient, idea):
+    url = reverse("ideas-list", kwargs={"module_pk": idea.module.pk})
+    response = apiclient.get(url, format="json")
+    assert response.status_code == 200
+    assert predicate_cache._scope.get() is None
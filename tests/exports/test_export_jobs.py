@@ -0,0 +1,177 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.exports import jobs
+from apps.exports.models import ExportJob
+
+
+def _export_url(module):
+    return reverse(
+        "a4dashboard:idea-comment-export",
+        kwargs={
+            "organisation_slug": module.project.organisation.slug,
+            "module_slug": module.slug,
+        },
+    )
+
+
+def _request_export(client, module, **data):
+    return client.post(_export_url(module), data)
+
+
+@pytest.mark.django_db
+def test_export_job(client, idea, comment_factory, django_capture_on_commit_callbacks):
+    comment = comment_factory(content_object=idea, comment="exported comment")
+    module = idea.module
+    initiator = module.project.organisation.initiators.first()
+    client.login(username=initiator.email, password="password")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = _request_export(client, module, format="csv", next="/next/")
+    assert response.status_code == 302
+    assert response["Location"] == "/next/"
+
+    job = ExportJob.objects.get()
+    assert job.creator == initiator
+    assert job.url.endswith(_export_url(module) + "?format=csv")
+    assert job.status == ExportJob.FINISHED
+    assert job.rows_total == job.rows_done == 1
+    assert job.progress == 100
+    assert job.is_available
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == [initiator.email]
+    assert job.get_absolute_url() in mail.outbox[0].body
+
+    response = client.get(job.get_status_url())
+    assert response.json()["status"] == ExportJob.FINISHED
+    assert response.json()["download"] == job.get_absolute_url()
+
+    response = client.get(job.get_absolute_url())
+    assert response.status_code == 200
+    content = b"".join(response.streaming_content).decode()
+    assert comment.comment in content
+
+
+@pytest.mark.django_db
+def test_export_job_only_for_creator(
+    client, idea, user, django_capture_on_commit_callbacks
+):
+    module = idea.module
+    initiator = module.project.organisation.initiators.first()
+    client.login(username=initiator.email, password="password")
+    with django_capture_on_commit_callbacks(execute=True):
+        _request_export(client, module)
+    job = ExportJob.objects.get()
+
+    client.login(username=user.email, password="password")
+    assert client.get(job.get_status_url()).status_code == 404
+    assert client.get(job.get_absolute_url()).status_code == 404
+    response = _request_export(client, module)
+    assert response.status_code == 403
+    assert ExportJob.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_export_job_reuses_file_of_unchanged_module(
+    client, idea, comment_factory, django_capture_on_commit_callbacks
+):
+    module = idea.module
+    initiator = module.project.organisation.initiators.first()
+    client.login(username=initiator.email, password="password")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        _request_export(client, module, format="csv")
+        _request_export(client, module, format="csv")
+    first, second = ExportJob.objects.order_by("pk")
+    assert second.status == ExportJob.FINISHED
+    assert second.file.name == first.file.name
+    assert len(mail.outbox) == 1
+
+    comment_factory(content_object=idea)
+    with django_capture_on_commit_callbacks(execute=True):
+        _request_export(client, module, format="csv")
+    third = ExportJob.objects.order_by("pk").last()
+    assert third.file.name != first.file.name
+
+
+@pytest.mark.django_db
+def test_delete_expired_export_jobs(client, idea, django_capture_on_commit_callbacks):
+    module = idea.module
+    initiator = module.project.organisation.initiators.first()
+    client.login(username=initiator.email, password="password")
+    with django_capture_on_commit_callbacks(execute=True):
+        _request_export(client, module, format="csv")
+        _request_export(client, module, format="csv")
+    first, second = ExportJob.objects.order_by("pk")
+    storage = first.file.storage
+    name = first.file.name
+
+    ExportJob.objects.filter(pk=first.pk).update(
+        expires=timezone.now() - timedelta(seconds=1)
+    )
+    jobs.delete_expired()
+    assert storage.exists(name)
+
+    ExportJob.objects.update(expires=timezone.now() - timedelta(seconds=1))
+    jobs.delete_expired()
+    assert not ExportJob.objects.exists()
+    assert not storage.exists(name)
+
+
+@pytest.mark.django_db
+def test_stale_export_job_is_started_again(
+    client, idea, settings, django_capture_on_commit_callbacks
+):
+    module = idea.module
+    initiator = module.project.organisation.initiators.first()
+    client.login(username=initiator.email, password="password")
+    # the task never runs, as if the worker died
+    with django_capture_on_commit_callbacks(execute=False):
+        _request_export(client, module, format="csv")
+        _request_export(client, module, format="csv")
+    lost = ExportJob.objects.get()
+    assert lost.status == ExportJob.PENDING
+
+    ExportJob.objects.update(
+        modified=timezone.now() - timedelta(seconds=settings.EXPORT_JOB_STALE_AFTER + 1)
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        _request_export(client, module, format="csv")
+    lost.refresh_from_db()
+    assert lost.status == ExportJob.FAILED
+    job = ExportJob.objects.exclude(pk=lost.pk).get()
+    assert job.status == ExportJob.FINISHED
+
+
+@pytest.mark.django_db
+def test_module_fingerprint_changes_with_labels_categories_and_feedback(
+    idea, label_factory, category_factory, moderator_feedback_factory
+):
+    module = idea.module
+    fingerprint = jobs.get_module_fingerprint(module)
+
+    category = category_factory(module=module)
+    assert jobs.get_module_fingerprint(module) != fingerprint
+    fingerprint = jobs.get_module_fingerprint(module)
+    category.name = "renamed"
+    category.save()
+    assert jobs.get_module_fingerprint(module) != fingerprint
+
+    fingerprint = jobs.get_module_fingerprint(module)
+    label = label_factory(module=module)
+    assert jobs.get_module_fingerprint(module) != fingerprint
+    fingerprint = jobs.get_module_fingerprint(module)
+    idea.labels.add(label)
+    assert jobs.get_module_fingerprint(module) != fingerprint
+
+    feedback = moderator_feedback_factory()
+    idea.moderator_feedback_text = feedback
+    idea.save()
+    fingerprint = jobs.get_module_fingerprint(module)
+    feedback.feedback_text = "<p>changed</p>"
+    feedback.save()
+    assert jobs.get_module_fingerprint(module) != fingerprint
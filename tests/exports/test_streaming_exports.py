@@ -0,0 +1,154 @@
+import csv
+import io
+import math
+import os
+import tracemalloc
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from adhocracy4.comments.models import Comment
+from apps.exports.mixins import StreamingExportMixin
+
+# run with EXPORT_BENCHMARK_SIZE=1000000 for the numbers of a large platform
+BENCHMARK_ROWS = int(os.environ.get("EXPORT_BENCHMARK_SIZE", 100000))
+
+
+def _export_url(name, module):
+    return reverse(
+        "a4dashboard:" + name,
+        kwargs={
+            "organisation_slug": module.project.organisation.slug,
+            "module_slug": module.slug,
+        },
+    )
+
+
+def _read_csv(response):
+    content = b"".join(response.streaming_content).decode()
+    return list(csv.reader(io.StringIO(content)))
+
+
+@pytest.mark.django_db
+def test_csv_idea_export(client, idea_factory, comment_factory):
+    idea = idea_factory()
+    other = idea_factory(module=idea.module)
+    comment_factory(content_object=idea)
+    initiator = idea.module.project.organisation.initiators.first()
+    client.login(username=initiator.email, password="password")
+
+    response = client.get(_export_url("idea-export", idea.module), {"format": "csv"})
+    assert response.status_code == 200
+    assert response["Content-Type"] == "text/csv"
+    rows = _read_csv(response)
+    assert len(rows) == 3
+    assert idea.name in rows[1]
+    assert other.name in rows[2]
+
+    response = client.get(
+        _export_url("idea-comment-export", idea.module), {"format": "csv"}
+    )
+    rows = _read_csv(response)
+    assert len(rows) == 2
+
+
+@pytest.mark.django_db
+def test_csv_export_escapes_formulas(client, idea_factory):
+    idea = idea_factory(name='=HYPERLINK("http://example.com")')
+    other = idea_factory(module=idea.module, name="-1+2")
+    initiator = idea.module.project.organisation.initiators.first()
+    client.login(username=initiator.email, password="password")
+
+    response = client.get(_export_url("idea-export", idea.module), {"format": "csv"})
+    rows = _read_csv(response)
+    assert "'" + idea.name in rows[1]
+    assert idea.name not in rows[1]
+    assert "'" + other.name in rows[2]
+
+
+@pytest.mark.django_db
+def test_export_chunks(idea_factory, comment_factory, monkeypatch):
+    monkeypatch.setattr(StreamingExportMixin, "export_chunk_size", 2)
+    idea = idea_factory()
+    comments = [comment_factory(content_object=idea) for _ in range(5)]
+    view = StreamingExportMixin()
+    view.get_queryset = Comment.objects.all
+
+    assert list(view.get_export_items()) == comments
+
+
+@pytest.mark.django_db
+def test_export_queries_do_not_grow_with_rows(client, idea_factory, comment_factory):
+    idea = idea_factory()
+    initiator = idea.module.project.organisation.initiators.first()
+    client.login(username=initiator.email, password="password")
+    url = _export_url("idea-comment-export", idea.module)
+
+    def count_queries():
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, {"format": "csv"})
+            assert response.streaming
+            rows = _read_csv(response)
+        return len(rows), len(queries)
+
+    comment = comment_factory(content_object=idea)
+    comment_factory(content_object=comment)
+    rows, queries = count_queries()
+    assert rows == 3
+
+    for _ in range(3):
+        comment = comment_factory(content_object=idea)
+        comment_factory(content_object=comment)
+    rows, more_queries = count_queries()
+    assert rows == 9
+    assert more_queries == queries
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_benchmark_comment_export(client, idea, user):
+    idea_ct = ContentType.objects.get_for_model(idea)
+    comment_ct = ContentType.objects.get_for_model(Comment)
+    comments = Comment.objects.bulk_create(
+        Comment(
+            comment="comment",
+            creator=user,
+            content_type=idea_ct,
+            object_pk=str(idea.pk),
+            project=idea.project,
+        )
+        for _ in range(BENCHMARK_ROWS // 2)
+    )
+    Comment.objects.bulk_create(
+        Comment(
+            comment="reply",
+            creator=user,
+            content_type=comment_ct,
+            object_pk=str(comment.pk),
+            project=idea.project,
+        )
+        for comment in comments
+    )
+    initiator = idea.module.project.organisation.initiators.first()
+    client.login(username=initiator.email, password="password")
+    url = _export_url("idea-comment-export", idea.module)
+
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, {"format": "csv"})
+            assert response.streaming
+            rows = sum(chunk.count(b"\n") for chunk in response.streaming_content)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    chunks = math.ceil(BENCHMARK_ROWS / StreamingExportMixin.export_chunk_size)
+    assert rows == BENCHMARK_ROWS + 1
+    # a fixed number of queries per chunk, none per row
+    assert len(queries) <= 20 + chunks * 8
+    # the rows of one chunk have to fit, not the whole export
+    assert peak < 32 * 1024 * 1024
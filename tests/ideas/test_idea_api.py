@@ -1,6 +1,8 @@
 import tempfile
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from PIL import Image
 from rest_framework import status
@@ -75,6 +77,44 @@ def test_idea_serializer(idea_factory, comment_factory, apiclient, label_factory
     assert response.data[0]["has_deleting_permission"] is False
 
 
+@pytest.mark.django_db
+def test_idea_list_api_queries_do_not_grow_with_ideas(
+    apiclient, phase_factory, idea_factory, rating_factory, user
+):
+    phase, module, _, idea = setup_phase(
+        phase_factory, idea_factory, phases.CollectFeedbackPhase
+    )
+    own_idea = idea_factory(module=module, creator=user)
+    rating = rating_factory(content_object=own_idea, creator=user, value=1)
+    url = reverse("ideas-list", kwargs={"module_pk": module.pk})
+    apiclient.force_authenticate(user=user)
+
+    def count_queries():
+        with CaptureQueriesContext(connection) as context:
+            response = apiclient.get(url, format="json")
+        assert response.status_code == 200
+        return len(context.captured_queries), response.data
+
+    with freeze_phase(phase):
+        num_queries, _ = count_queries()
+        for i in range(8):
+            other = idea_factory(module=module)
+            rating_factory(content_object=other, creator=user, value=-1)
+            idea_factory(module=module, creator=user)
+        assert count_queries()[0] == num_queries
+        data = {item["pk"]: item for item in count_queries()[1]}
+
+    assert len(data) == 18
+    assert data[own_idea.pk]["user_rating"] == {"id": rating.pk, "value": 1}
+    assert data[own_idea.pk]["creator"] == user.username
+    assert data[own_idea.pk]["has_changing_permission"] is True
+    assert data[own_idea.pk]["has_deleting_permission"] is True
+    assert data[idea.pk]["user_rating"] is None
+    assert data[idea.pk]["has_changing_permission"] is False
+    assert data[idea.pk]["has_rating_permission"] is True
+    assert data[other.pk]["user_rating"]["value"] == -1
+
+
 @pytest.mark.django_db
 def test_anonymous_cannot_add_idea(apiclient, idea):
     url = reverse("ideas-list", kwargs={"module_pk": idea.module.pk})
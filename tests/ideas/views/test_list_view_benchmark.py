@@ -0,0 +1,162 @@
+import os
+import tracemalloc
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from pytest_factoryboy import register
+
+from adhocracy4.test.helpers import freeze_phase
+from adhocracy4.test.helpers import setup_phase
+from apps.budgeting import phases as budgeting_phases
+from apps.debate import phases as debate_phases
+from apps.ideas import phases as ideas_phases
+from apps.ideas.models import Idea
+from apps.ideas.views import AbstractIdeaListView
+from apps.mapideas import phases as mapideas_phases
+from apps.topicprio import phases as topicprio_phases
+from tests.budgeting import factories as budgeting_factories
+from tests.debate import factories as debate_factories
+from tests.mapideas import factories as mapideas_factories
+from tests.topicprio import factories as topicprio_factories
+
+register(mapideas_factories.MapIdeaFactory)
+register(budgeting_factories.ProposalFactory)
+register(topicprio_factories.TopicFactory)
+register(debate_factories.SubjectFactory)
+
+# run with LIST_BENCHMARK_SIZE=20000 for the numbers of a large module
+BENCHMARK_ITEMS = int(os.environ.get("LIST_BENCHMARK_SIZE", 5000))
+
+LIST_VIEWS = [
+    ("idea_factory", ideas_phases.FeedbackPhase, ""),
+    ("map_idea_factory", mapideas_phases.FeedbackPhase, "?mode=list"),
+    ("proposal_factory", budgeting_phases.RequestPhase, "?mode=list"),
+    ("topic_factory", topicprio_phases.PrioritizePhase, ""),
+    ("subject_factory", debate_phases.DebatePhase, ""),
+]
+
+
+def _count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("factory_name,phase_content,query", LIST_VIEWS)
+def test_list_view_queries_do_not_grow_with_items(
+    request, client, phase_factory, organisation, factory_name, phase_content, query
+):
+    factory = request.getfixturevalue(factory_name)
+    phase, module, project, item = setup_phase(phase_factory, factory, phase_content)
+    url = project.get_absolute_url() + query
+
+    with freeze_phase(phase):
+        client.get(url)
+        few_queries = _count_queries(client, url)
+        factory.create_batch(40, module=module)
+        many_queries = _count_queries(client, url)
+
+    assert many_queries <= few_queries
+
+
+def _measure(client, url):
+    tracemalloc.start()
+    try:
+        queries = _count_queries(client, url)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return queries, peak
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("factory_name,phase_content,query", LIST_VIEWS)
+def test_benchmark_list_view(
+    request, client, phase_factory, organisation, factory_name, phase_content, query
+):
+    factory = request.getfixturevalue(factory_name)
+    phase, module, project, item = setup_phase(phase_factory, factory, phase_content)
+    url = project.get_absolute_url() + query
+
+    with freeze_phase(phase):
+        client.get(url)
+        few_queries, few_peak = _measure(client, url)
+        factory.create_batch(BENCHMARK_ITEMS - 1, module=module)
+        many_queries, many_peak = _measure(client, url)
+
+    assert many_queries <= few_queries
+    # one page of items has to fit, not the whole module
+    assert many_peak < few_peak + 2 * 1024 * 1024
+
+
+@pytest.mark.django_db
+def test_idea_list_keyset_pagination(
+    client, phase_factory, idea_factory, organisation, monkeypatch
+):
+    monkeypatch.setattr(AbstractIdeaListView, "keyset_threshold", 20)
+    phase, module, project, idea = setup_phase(
+        phase_factory, idea_factory, ideas_phases.FeedbackPhase
+    )
+    idea_factory.create_batch(39, module=module)
+    url = project.get_absolute_url()
+    expected = list(Idea.objects.filter(module=module).order_by("-created", "-pk"))
+
+    with freeze_phase(phase):
+        response = client.get(url)
+        page = response.context_data["page_obj"]
+        assert page.is_keyset
+        assert list(page) == expected[:15]
+        assert not page.has_previous()
+
+        with CaptureQueriesContext(connection) as second_page_queries:
+            response = client.get(url, {"cursor": page.next_cursor})
+        page = response.context_data["page_obj"]
+        assert list(page) == expected[15:30]
+        assert page.has_previous()
+
+        with CaptureQueriesContext(connection) as last_page_queries:
+            response = client.get(url, {"cursor": page.next_cursor})
+        last_page = response.context_data["page_obj"]
+        assert list(last_page) == expected[30:]
+        assert not last_page.has_next()
+
+        response = client.get(url, {"cursor": last_page.previous_cursor})
+        page = response.context_data["page_obj"]
+        assert list(page) == expected[15:30]
+        assert page.has_next()
+
+        response = client.get(url, {"cursor": "invalid"})
+        page = response.context_data["page_obj"]
+        assert list(page) == expected[:15]
+
+    # later pages cost the same and seek by the cursor instead of skipping
+    assert len(last_page_queries) == len(second_page_queries)
+    idea_table = '"{}"'.format(Idea._meta.db_table)
+    for queries in (second_page_queries, last_page_queries):
+        sqls = [query["sql"] for query in queries.captured_queries]
+        assert not any("OFFSET" in sql.upper() for sql in sqls)
+        assert any(
+            idea_table in sql and '."created" < ' in sql and "LIMIT 16" in sql
+            for sql in sqls
+        )
+
+
+@pytest.mark.django_db
+def test_idea_list_small_module_keeps_page_numbers(
+    client, phase_factory, idea_factory, organisation
+):
+    phase, module, project, idea = setup_phase(
+        phase_factory, idea_factory, ideas_phases.FeedbackPhase
+    )
+    idea_factory.create_batch(20, module=module)
+
+    with freeze_phase(phase):
+        response = client.get(project.get_absolute_url(), {"page": 2})
+        page = response.context_data["page_obj"]
+        assert not getattr(page, "is_keyset", False)
+        assert page.number == 2
+        assert len(page) == 6
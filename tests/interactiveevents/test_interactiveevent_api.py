@@ -1,12 +1,17 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from adhocracy4.test.helpers import freeze_phase
 from adhocracy4.test.helpers import freeze_post_phase
 from adhocracy4.test.helpers import freeze_pre_phase
 from adhocracy4.test.helpers import setup_phase
+from apps.interactiveevents import live
 from apps.interactiveevents import models
 from apps.interactiveevents import phases
+from apps.interactiveevents.like_buffer import like_buffer
+from apps.projects.models import ProjectInsight
 
 
 @pytest.mark.django_db
@@ -166,3 +171,107 @@ def test_user_cannot_add_like_during_non_active_phase(
 
     assert response.status_code == 403
     assert models.Like.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_list_queries_do_not_grow_with_questions(
+    apiclient, module_factory, live_question_factory, like_factory
+):
+    session_key = apiclient.session.session_key
+
+    def count_list_queries(module):
+        live.clear()
+        url = reverse("interactiveevents-list", kwargs={"module_pk": module.pk})
+        with CaptureQueriesContext(connection) as context:
+            response = apiclient.get(url)
+        assert response.status_code == 200
+        return len(context.captured_queries), response.data
+
+    module = module_factory()
+    question = live_question_factory(module=module)
+    like_factory(livequestion=question, session=session_key)
+    num_queries, data = count_list_queries(module)
+    assert data[0]["likes"] == {"count": 1, "session_like": True}
+
+    other_module = module_factory()
+    questions = live_question_factory.create_batch(20, module=other_module)
+    for question in questions[::2]:
+        like_factory(livequestion=question, session=session_key)
+        like_factory(livequestion=question, session="other")
+    other_num_queries, data = count_list_queries(other_module)
+    assert other_num_queries == num_queries
+    assert [item["likes"] for item in data] == [
+        {"count": 2, "session_like": True},
+        {"count": 0, "session_like": False},
+    ] * 10
+
+
+@pytest.mark.django_db
+def test_buffered_likes_are_written_in_bulk(
+    apiclient, settings, phase_factory, live_question_factory
+):
+    settings.LIVEQUESTION_LIKE_BUFFER_INTERVAL = 60000
+    phase, module, project, livequestion = setup_phase(
+        phase_factory, live_question_factory, phases.IssuePhase
+    )
+    other_question = live_question_factory(module=module)
+    url = reverse("likes-list", kwargs={"livequestion_pk": livequestion.pk})
+    other_url = reverse("likes-list", kwargs={"livequestion_pk": other_question.pk})
+    list_url = reverse("interactiveevents-list", kwargs={"module_pk": module.pk})
+
+    with freeze_phase(phase):
+        assert apiclient.post(url, {"value": True}).status_code == 201
+        assert apiclient.post(other_url, {"value": True}).status_code == 201
+        assert apiclient.post(other_url, {"value": False}).status_code == 201
+        response = apiclient.get(list_url)
+
+    assert models.Like.objects.count() == 0
+    assert [item["likes"] for item in response.data] == [
+        {"count": 1, "session_like": True},
+        {"count": 0, "session_like": False},
+    ]
+
+    like_buffer.flush()
+    like = models.Like.objects.get()
+    assert like.livequestion == livequestion
+    assert like.session == apiclient.session.session_key
+    assert ProjectInsight.objects.get(project=project).ratings == 1
+
+    with freeze_phase(phase):
+        assert apiclient.post(url, {"value": False}).status_code == 201
+    like_buffer.flush()
+    assert models.Like.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_buffered_likes_ignore_repeated_values(
+    apiclient, settings, phase_factory, live_question_factory
+):
+    settings.LIVEQUESTION_LIKE_BUFFER_INTERVAL = 60000
+    phase, module, project, livequestion = setup_phase(
+        phase_factory, live_question_factory, phases.IssuePhase
+    )
+    url = reverse("likes-list", kwargs={"livequestion_pk": livequestion.pk})
+    list_url = reverse("interactiveevents-list", kwargs={"module_pk": module.pk})
+
+    def get_likes():
+        with freeze_phase(phase):
+            return apiclient.get(list_url).data[0]["likes"]
+
+    with freeze_phase(phase):
+        # e.g. a double submit or a second tab
+        apiclient.post(url, {"value": True})
+        apiclient.post(url, {"value": True})
+    assert get_likes() == {"count": 1, "session_like": True}
+
+    like_buffer.flush()
+    with freeze_phase(phase):
+        apiclient.post(url, {"value": True})
+    assert get_likes() == {"count": 1, "session_like": True}
+
+    with freeze_phase(phase):
+        apiclient.post(url, {"value": False})
+        apiclient.post(url, {"value": False})
+    assert get_likes() == {"count": 0, "session_like": False}
+    like_buffer.flush()
+    assert models.Like.objects.count() == 0
@@ -0,0 +1,156 @@
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from adhocracy4.test.helpers import setup_phase
+from apps.interactiveevents import live
+from apps.interactiveevents import phases
+
+
+@pytest.fixture(autouse=True)
+def clear_live_feeds():
+    live.clear()
+    yield
+    live.clear()
+
+
+def _get_updates(apiclient, module, cursor):
+    url = reverse("interactiveevents-updates", kwargs={"module_pk": module.pk})
+    response = apiclient.get(url, {"cursor": cursor, "wait": 0})
+    assert response.status_code == 200
+    return response.data["cursor"], response.data["diff"]
+
+
+@pytest.mark.django_db
+def test_updates_send_diff_since_list(
+    apiclient,
+    phase_factory,
+    live_question_factory,
+    like_factory,
+    django_capture_on_commit_callbacks,
+):
+    phase, module, project, question = setup_phase(
+        phase_factory, live_question_factory, phases.IssuePhase
+    )
+    other_question = live_question_factory(module=module)
+    url = reverse("interactiveevents-list", kwargs={"module_pk": module.pk})
+    cursor = apiclient.get(url)["X-Live-Cursor"]
+
+    cursor, diff = _get_updates(apiclient, module, cursor)
+    assert diff == {"new": [], "changed": [], "removed": [], "likes": []}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        new_question = live_question_factory(module=module)
+        like_factory(livequestion=question, session="a")
+        like_factory(livequestion=question, session="b")
+        other_question.is_hidden = True
+        other_question.save()
+
+    cursor, diff = _get_updates(apiclient, module, cursor)
+    assert [data["id"] for data in diff["new"]] == [new_question.pk]
+    assert diff["new"][0]["likes"] == {"count": 0}
+    assert diff["changed"] == []
+    assert diff["removed"] == [other_question.pk]
+    assert diff["likes"] == [{"id": question.pk, "delta": 2, "count": 2}]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        new_question.is_answered = True
+        new_question.save()
+        question.delete()
+
+    cursor, diff = _get_updates(apiclient, module, cursor)
+    assert [data["id"] for data in diff["changed"]] == [new_question.pk]
+    assert diff["changed"][0]["is_answered"]
+    assert diff["removed"] == [question.pk]
+    assert diff["likes"] == []
+
+
+@pytest.mark.django_db
+def test_updates_are_shared_between_viewers(
+    apiclient, phase_factory, live_question_factory
+):
+    phase, module, project, question = setup_phase(
+        phase_factory, live_question_factory, phases.IssuePhase
+    )
+    cursor, diff = _get_updates(apiclient, module, "")
+    assert diff is None
+
+    with CaptureQueriesContext(connection) as context:
+        for _ in range(5):
+            assert _get_updates(apiclient, module, cursor)[0] == cursor
+    assert not any(
+        "a4_candy_interactive_events_livequestion" in query["sql"]
+        for query in context.captured_queries
+    )
+
+
+@pytest.mark.django_db
+def test_updates_reset_unknown_cursor(apiclient, phase_factory, live_question_factory):
+    phase, module, project, question = setup_phase(
+        phase_factory, live_question_factory, phases.IssuePhase
+    )
+    cursor, diff = _get_updates(apiclient, module, "other-process:3")
+    assert diff is None
+    assert cursor == live.get_feed(module.pk).cursor
+
+
+@pytest.mark.django_db
+def test_updates_served_by_other_process(
+    apiclient,
+    phase_factory,
+    live_question_factory,
+    django_capture_on_commit_callbacks,
+):
+    phase, module, project, question = setup_phase(
+        phase_factory, live_question_factory, phases.IssuePhase
+    )
+    url = reverse("interactiveevents-list", kwargs={"module_pk": module.pk})
+    cursor = apiclient.get(url)["X-Live-Cursor"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        new_question = live_question_factory(module=module)
+
+    # a process without a feed of its own answers from the shared state
+    live.clear()
+    cursor, diff = _get_updates(apiclient, module, cursor)
+    assert [data["id"] for data in diff["new"]] == [new_question.pk]
+
+    live.clear()
+    assert _get_updates(apiclient, module, cursor) == (
+        cursor,
+        {"new": [], "changed": [], "removed": [], "likes": []},
+    )
+
+
+def test_waiting_slot(settings):
+    settings.LIVEQUESTION_UPDATES_MAX_WAITING = 1
+    with live.waiting_slot() as may_wait:
+        assert may_wait
+        with live.waiting_slot() as may_also_wait:
+            assert not may_also_wait
+    with live.waiting_slot() as may_wait:
+        assert may_wait
+
+
+@pytest.mark.django_db
+def test_updates_answer_right_away_if_too_many_wait(
+    apiclient, phase_factory, live_question_factory, settings
+):
+    settings.LIVEQUESTION_UPDATES_MAX_WAITING = 0
+    phase, module, project, question = setup_phase(
+        phase_factory, live_question_factory, phases.IssuePhase
+    )
+    list_url = reverse("interactiveevents-list", kwargs={"module_pk": module.pk})
+    cursor = apiclient.get(list_url)["X-Live-Cursor"]
+    url = reverse("interactiveevents-updates", kwargs={"module_pk": module.pk})
+
+    start = time.monotonic()
+    response = apiclient.get(url, {"cursor": cursor, "wait": 20})
+    assert time.monotonic() - start < 5
+    assert response.data == {
+        "cursor": cursor,
+        "diff": {"new": [], "changed": [], "removed": [], "likes": []},
+    }
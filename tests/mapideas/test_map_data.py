@@ -0,0 +1,175 @@
+import json
+
+import pytest
+from django.urls import reverse
+
+from adhocracy4.projects.enums import Access
+from adhocracy4.test.helpers import freeze_phase
+from adhocracy4.test.helpers import redirect_target
+from adhocracy4.test.helpers import setup_phase
+from apps.mapideas import map_data
+from apps.mapideas import phases
+
+
+def _point(lng, lat):
+    return {
+        "type": "Feature",
+        "properties": {},
+        "geometry": {"type": "Point", "coordinates": [lng, lat]},
+    }
+
+
+def _url(module):
+    return reverse(
+        "a4_candy_mapideas:mapidea-map-data",
+        kwargs={
+            "organisation_slug": module.project.organisation.slug,
+            "module_slug": module.slug,
+        },
+    )
+
+
+def _features(response):
+    return json.loads(b"".join(response.streaming_content))["features"]
+
+
+@pytest.mark.django_db
+def test_map_data(client, phase_factory, map_idea_factory, comment_factory):
+    phase, module, project, mapidea = setup_phase(
+        phase_factory, map_idea_factory, phases.FeedbackPhase
+    )
+    comment_factory(content_object=mapidea)
+    other_module_idea = map_idea_factory()
+
+    with freeze_phase(phase):
+        response = client.get(_url(module))
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/geo+json"
+    features = _features(response)
+    assert features == [
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": mapidea.point["geometry"]["coordinates"],
+            },
+            "properties": {
+                "id": mapidea.pk,
+                "name": mapidea.name,
+                "url": mapidea.get_absolute_url(),
+                "category": None,
+                "comment_count": 1,
+                "positive_rating_count": 0,
+                "negative_rating_count": 0,
+            },
+        }
+    ]
+    assert other_module_idea.pk not in [f["properties"]["id"] for f in features]
+
+
+@pytest.mark.django_db
+def test_map_data_without_ratings(client, phase_factory, map_idea_factory):
+    phase, module, project, mapidea = setup_phase(
+        phase_factory, map_idea_factory, phases.CollectPhase
+    )
+
+    with freeze_phase(phase):
+        response = client.get(_url(module))
+    properties = _features(response)[0]["properties"]
+    assert "positive_rating_count" not in properties
+    assert "negative_rating_count" not in properties
+
+
+@pytest.mark.django_db
+def test_map_data_etag(
+    client,
+    phase_factory,
+    map_idea_factory,
+    comment_factory,
+    django_assert_max_num_queries,
+):
+    phase, module, project, mapidea = setup_phase(
+        phase_factory, map_idea_factory, phases.FeedbackPhase
+    )
+    url = _url(module)
+
+    with freeze_phase(phase):
+        response = client.get(url)
+        etag = response["ETag"]
+        with django_assert_max_num_queries(12):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+        comment_factory(content_object=mapidea)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+        etag = response["ETag"]
+
+        map_idea_factory(module=module)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert len(_features(response)) == 2
+
+
+@pytest.mark.django_db
+def test_map_data_bbox_and_clusters(client, phase_factory, map_idea_factory):
+    phase, module, project, mapidea = setup_phase(
+        phase_factory,
+        map_idea_factory,
+        phases.FeedbackPhase,
+        point=_point(13.40, 52.52),
+    )
+    map_idea_factory(module=module, point=_point(13.40001, 52.52001))
+    far = map_idea_factory(module=module, point=_point(11.58, 48.14))
+    url = _url(module)
+
+    with freeze_phase(phase):
+        response = client.get(url, {"bbox": "11,48,12,49"})
+        features = _features(response)
+        assert [f["properties"]["id"] for f in features] == [far.pk]
+
+        # crossing the antimeridian
+        response = client.get(url, {"bbox": "170,48,12,49"})
+        features = _features(response)
+        assert [f["properties"]["id"] for f in features] == [far.pk]
+
+        response = client.get(url, {"zoom": 10})
+        features = _features(response)
+        clusters = [f for f in features if f["properties"].get("cluster")]
+        assert len(features) == 2
+        assert clusters[0]["properties"]["count"] == 2
+
+        response = client.get(url, {"zoom": map_data.CLUSTER_MAX_ZOOM})
+        assert len(_features(response)) == 3
+
+        response = client.get(url, {"bbox": "11,48,nan,49"})
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_map_data_private_project(client, phase_factory, map_idea_factory):
+    phase, module, project, mapidea = setup_phase(
+        phase_factory, map_idea_factory, phases.FeedbackPhase
+    )
+    project.access = Access.PRIVATE
+    project.save()
+
+    with freeze_phase(phase):
+        response = client.get(_url(module))
+    assert response.status_code == 302
+    assert redirect_target(response) == "account_login"
+
+
+@pytest.mark.django_db
+def test_map_data_draft_module(client, phase_factory, map_idea_factory):
+    phase, module, project, mapidea = setup_phase(
+        phase_factory, map_idea_factory, phases.FeedbackPhase
+    )
+    module.is_draft = True
+    module.save()
+
+    with freeze_phase(phase):
+        response = client.get(_url(module))
+    assert response.status_code == 302
+    assert redirect_target(response) == "account_login"
@@ -1,4 +1,5 @@
 import pytest
+from django.urls import reverse
 
 from adhocracy4.test.helpers import assert_template_response
 from adhocracy4.test.helpers import freeze_phase
@@ -28,7 +29,7 @@ def test_list_view(client, phase_factory, map_idea_factory, organisation):
     url = project.get_absolute_url()
 
     with freeze_phase(phase):
-        response = client.get(url)
+        response = client.get(url, {"mode": "list"})
         assert_template_response(response, "a4_candy_mapideas/mapidea_list.html")
         assert response.status_code == 200
         assert mapidea in response.context_data["mapidea_list"]
@@ -36,3 +37,27 @@ def test_list_view(client, phase_factory, map_idea_factory, organisation):
         assert response.context_data["mapidea_list"][0].comment_count == 0
         assert response.context_data["mapidea_list"][0].positive_rating_count == 0
         assert response.context_data["mapidea_list"][0].negative_rating_count == 0
+
+
+@pytest.mark.django_db
+def test_list_view_map_mode(client, phase_factory, map_idea_factory, organisation):
+    phase, module, project, mapidea = setup_phase(
+        phase_factory, map_idea_factory, phases.FeedbackPhase
+    )
+    url = project.get_absolute_url()
+
+    with freeze_phase(phase):
+        response = client.get(url)
+    assert response.status_code == 200
+    # the map loads its points from the map data view
+    assert list(response.context_data["mapidea_list"]) == []
+    assert (
+        reverse(
+            "a4_candy_mapideas:mapidea-map-data",
+            kwargs={
+                "organisation_slug": project.organisation.slug,
+                "module_slug": module.slug,
+            },
+        )
+        in response.content.decode()
+    )
@@ -0,0 +1,44 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.newsletters import emails
+
+User = get_user_model()
+
+RECEIVERS = 10000
+
+
+def is_progress_update(query):
+    return query["sql"].startswith('UPDATE "a4_candy_newsletters_newsletterchunk"')
+
+
+@pytest.mark.django_db
+def test_benchmark_newsletter_queries(settings, newsletter):
+    settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+    settings.NEWSLETTER_CHUNK_SIZE = RECEIVERS
+    User.objects.bulk_create(
+        User(
+            username="receiver{}".format(i),
+            email="receiver{}@liqd.net".format(i),
+            language="de" if i % 2 else "en",
+        )
+        for i in range(RECEIVERS)
+    )
+    receivers = User.objects.filter(username__startswith="receiver")
+
+    with CaptureQueriesContext(connection) as context:
+        emails.NewsletterEmailAll.send(newsletter)
+
+    assert len(mail.outbox) >= RECEIVERS
+    sent_to = {m.to[0] for m in mail.outbox}
+    assert all(receiver.email in sent_to for receiver in receivers)
+    first = next(m for m in mail.outbox if m.to[0] == "receiver0@liqd.net")
+    assert "receiver0@liqd.net" in first.body
+    assert "receiver1@liqd.net" not in first.body
+
+    # the progress is written once per mail, everything else is constant
+    queries = [q for q in context.captured_queries if not is_progress_update(q)]
+    assert len(queries) < 100
@@ -0,0 +1,133 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from celery.exceptions import Retry
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.newsletters import emails
+from apps.newsletters import models as newsletter_models
+from apps.newsletters import tasks
+
+
+@pytest.mark.django_db
+def test_send_in_chunks(settings, newsletter, user_factory):
+    settings.NEWSLETTER_CHUNK_SIZE = 2
+    users = [user_factory(get_newsletters=True) for _ in range(5)]
+
+    emails.NewsletterEmail.send(
+        newsletter,
+        participant_ids=[user.pk for user in users],
+        organisation_pk=newsletter.project.organisation.pk,
+    )
+
+    dispatch = newsletter_models.NewsletterDispatch.objects.get(newsletter=newsletter)
+    assert dispatch.finished
+    assert dispatch.chunks.count() == 3
+    assert "participant_ids" not in dispatch.email_kwargs
+    assert dispatch.get_progress() == {"total": 5, "sent": 5, "failed": 0, "pending": 0}
+    assert sorted(m.to[0] for m in mail.outbox) == sorted(u.email for u in users)
+
+
+@pytest.mark.django_db
+def test_resume_skips_sent_receivers(settings, newsletter, user_factory):
+    users = [user_factory(get_newsletters=True) for _ in range(3)]
+    ids = [user.pk for user in users]
+    dispatch = newsletter_models.NewsletterDispatch.objects.create(
+        newsletter=newsletter, email_class="NewsletterEmail"
+    )
+    # a crashed worker which already sent to the first receiver
+    newsletter_models.NewsletterChunk.objects.create(
+        dispatch=dispatch,
+        first_id=ids[0],
+        last_id=ids[-1],
+        receiver_ids=ids,
+        total=3,
+        sent=1,
+        cursor=ids[0],
+    )
+
+    tasks.send_newsletter(dispatch.pk)
+
+    dispatch.refresh_from_db()
+    assert dispatch.finished
+    assert dispatch.get_progress()["sent"] == 3
+    assert [m.to[0] for m in mail.outbox] == [users[1].email, users[2].email]
+
+    tasks.send_newsletter(dispatch.pk)
+    assert len(mail.outbox) == 2
+
+
+@pytest.mark.django_db
+def test_resume_newsletters_command(newsletter, user_factory):
+    users = [user_factory(get_newsletters=True) for _ in range(2)]
+    ids = [user.pk for user in users]
+    dispatch = newsletter_models.NewsletterDispatch.objects.create(
+        newsletter=newsletter, email_class="NewsletterEmail"
+    )
+    newsletter_models.NewsletterChunk.objects.create(
+        dispatch=dispatch,
+        first_id=ids[0],
+        last_id=ids[-1],
+        receiver_ids=ids,
+        total=2,
+        sent=1,
+        cursor=ids[0],
+    )
+
+    out = StringIO()
+    call_command("resume_newsletters", stdout=out)
+
+    assert out.getvalue().splitlines() == [
+        "resuming newsletter {}: 1/2 sent, 0 failed, 1 pending".format(newsletter.pk),
+        "resumed 1 newsletters",
+    ]
+    assert [m.to[0] for m in mail.outbox] == [users[1].email]
+
+
+@pytest.mark.django_db
+def test_failed_mails_are_counted(newsletter, user_factory, mocker):
+    user = user_factory(get_newsletters=True)
+    mocker.patch(
+        "django.core.mail.message.EmailMessage.send", side_effect=OSError("down")
+    )
+
+    emails.NewsletterEmail.send(newsletter, participant_ids=[user.pk])
+
+    progress = newsletter.dispatch.get_progress()
+    assert progress == {"total": 1, "sent": 0, "failed": 1, "pending": 0}
+
+
+@pytest.mark.django_db
+def test_locked_chunk_is_retried_after_lock(newsletter, user_factory, mocker):
+    user = user_factory(get_newsletters=True)
+    dispatch = newsletter_models.NewsletterDispatch.objects.create(
+        newsletter=newsletter, email_class="NewsletterEmail"
+    )
+    # locked by a worker which died while sending it
+    chunk = newsletter_models.NewsletterChunk.objects.create(
+        dispatch=dispatch,
+        first_id=user.pk,
+        last_id=user.pk,
+        receiver_ids=[user.pk],
+        total=1,
+        locked_until=timezone.now() + timedelta(minutes=5),
+    )
+    retry = mocker.patch.object(
+        tasks.send_newsletter_chunk, "retry", return_value=Retry()
+    )
+
+    with pytest.raises(Retry):
+        tasks.send_newsletter_chunk(chunk.pk)
+
+    countdown = retry.call_args.kwargs["countdown"]
+    assert 5 * 60 - 5 < countdown <= 5 * 60 + 1
+    assert len(mail.outbox) == 0
+
+    chunk.locked_until = timezone.now() - timedelta(seconds=1)
+    chunk.save()
+    tasks.send_newsletter_chunk(chunk.pk)
+    assert [m.to[0] for m in mail.outbox] == [user.email]
+    assert retry.call_count == 1
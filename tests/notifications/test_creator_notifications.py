@@ -7,10 +7,14 @@ from tests.helpers import get_emails_for_address
 
 
 @pytest.mark.django_db
-def test_notify_creator(idea, comment_factory):
+def test_notify_creator(
+    idea_factory, comment_factory, django_capture_on_commit_callbacks
+):
     """Check if creators get emails on comment create."""
-    creator = idea.creator
-    comment = comment_factory(content_object=idea)
+    with django_capture_on_commit_callbacks(execute=True):
+        idea = idea_factory()
+        creator = idea.creator
+        comment = comment_factory(content_object=idea)
 
     # 3 emails because of moderator notifications for idea and comment
     assert len(mail.outbox) == 3
@@ -18,7 +22,8 @@ def test_notify_creator(idea, comment_factory):
     assert mail.outbox[1].subject.startswith("Reaction to your contribution")
 
     comment_creator = comment.creator
-    comment_factory(content_object=comment)
+    with django_capture_on_commit_callbacks(execute=True):
+        comment_factory(content_object=comment)
 
     # 2 more emails because of moderator notification
     assert len(mail.outbox) == 5
@@ -27,11 +32,15 @@ def test_notify_creator(idea, comment_factory):
 
 
 @pytest.mark.django_db
-def test_notify_creator_exclude_moderator(idea, comment_factory, user):
+def test_notify_creator_exclude_moderator(
+    idea_factory, comment_factory, user, django_capture_on_commit_callbacks
+):
     """Check if moderators are excluded from creator notifications."""
-    creator_moderator = idea.creator
-    idea.project.moderators.add(creator_moderator)
-    comment_factory(content_object=idea)
+    with django_capture_on_commit_callbacks(execute=True):
+        idea = idea_factory()
+        creator_moderator = idea.creator
+        idea.project.moderators.add(creator_moderator)
+        comment_factory(content_object=idea)
 
     assert len(mail.outbox) == 3
     mails = get_emails_for_address(creator_moderator.email)
@@ -42,19 +51,26 @@ def test_notify_creator_exclude_moderator(idea, comment_factory, user):
 
 
 @pytest.mark.django_db
-def test_notify_creator_exclude_own_comment(idea, comment_factory):
+def test_notify_creator_exclude_own_comment(
+    idea_factory, comment_factory, django_capture_on_commit_callbacks
+):
     """Check if creators does not get email on own comment create."""
-    creator = idea.creator
-    comment_factory(content_object=idea, creator=creator)
+    with django_capture_on_commit_callbacks(execute=True):
+        idea = idea_factory()
+        creator = idea.creator
+        comment_factory(content_object=idea, creator=creator)
 
     # 2 emails because of moderator notifications for idea and comment
     assert len(mail.outbox) == 2
 
 
 @pytest.mark.django_db
-def test_notify_creator_on_moderator_feedback(proposal_factory, client):
+def test_notify_creator_on_moderator_feedback(
+    proposal_factory, client, django_capture_on_commit_callbacks
+):
     """Check if creator gets emails on moderator feedback."""
-    proposal = proposal_factory()
+    with django_capture_on_commit_callbacks(execute=True):
+        proposal = proposal_factory()
     # moderator notifications for proposal
     assert len(mail.outbox) == 1
 
@@ -10,3 +10,27 @@ def test_autofollow_moderator(project, user, user2):
 
     user2.project_moderator.add(project)
     assert Follow.objects.filter(project=project, creator=user2).exists()
+
+
+@pytest.mark.django_db
+def test_autofollow_moderators_reenables_follows(
+    project, user_factory, django_assert_max_num_queries
+):
+    users = user_factory.create_batch(5)
+    Follow.objects.create(project=project, creator=users[0], enabled=False)
+
+    with django_assert_max_num_queries(4):
+        project.moderators.add(*users)
+
+    follows = Follow.objects.filter(project=project)
+    assert follows.count() == 5
+    assert all(follow.enabled for follow in follows)
+
+
+@pytest.mark.django_db
+def test_autofollow_logs_bulk_operation(project, user, caplog):
+    with caplog.at_level("INFO", logger="apps"):
+        project.moderators.add(user)
+    (record,) = [r for r in caplog.records if hasattr(r, "bulk_operation")]
+    assert record.bulk_operation["name"] == "autofollow"
+    assert record.bulk_operation["rows"] == 1
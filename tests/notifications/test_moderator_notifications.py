@@ -3,10 +3,14 @@ from django.core import mail
 
 
 @pytest.mark.django_db
-def test_notify_moderator_on_create(idea, comment_factory):
+def test_notify_moderator_on_create(
+    idea_factory, comment_factory, django_capture_on_commit_callbacks
+):
     """Check if moderator gets email on idea and comment create."""
-    moderator = idea.project.moderators.first()
-    comment_factory(content_object=idea)
+    with django_capture_on_commit_callbacks(execute=True):
+        idea = idea_factory()
+        moderator = idea.project.moderators.first()
+        comment_factory(content_object=idea)
 
     # 3 emails because of creator notification for reaction on idea
     assert len(mail.outbox) == 3
@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+import pytest
+from dateutil.parser import parse
+from django.core import mail
+from django.core.management import call_command
+from freezegun import freeze_time
+
+from adhocracy4.follows.models import Follow
+from apps.notifications import outbox
+from apps.notifications.models import OutboxEntry
+
+
+@pytest.mark.django_db
+def test_action_adds_outbox_entries(idea_factory, django_capture_on_commit_callbacks):
+    # the dispatcher is started once the action is committed
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        idea = idea_factory()
+    assert len(callbacks) > 0
+    entries = OutboxEntry.objects.filter(action__obj_object_id=str(idea.pk))
+    assert [entry.email_class for entry in entries] == [
+        "NotifyCreatorEmail",
+        "NotifyModeratorsEmail",
+    ]
+    assert all(entry.finished for entry in entries)
+    assert sum(entry.sent for entry in entries) == len(mail.outbox) == 1
+
+
+@pytest.mark.django_db
+def test_pending_entries_sent_by_command(idea_factory, module):
+    # the transaction of the test is never committed, so the dispatcher is
+    # not started
+    idea_factory(module=module)
+    assert len(mail.outbox) == 0
+    assert outbox.get_stats()["pending"] == 2
+
+    call_command("dispatch_notifications")
+
+    assert len(mail.outbox) == 1
+    assert not OutboxEntry.objects.filter(finished__isnull=True).exists()
+    stats = outbox.get_stats()
+    assert stats["pending"] == 0
+    assert stats["sent"] == 1
+
+
+@pytest.mark.django_db
+def test_followers_sent_in_batches(
+    phase_factory, user_factory, settings, django_capture_on_commit_callbacks
+):
+    settings.NOTIFICATION_BATCH_SIZE = 2
+    phase = phase_factory(
+        start_date=parse("2022-01-01 17:00:00 UTC"),
+        end_date=parse("2022-05-01 18:00:00 UTC"),
+    )
+    project = phase.module.project
+    followers = user_factory.create_batch(4)
+    for follower in followers:
+        Follow.objects.create(project=project, creator=follower)
+
+    with freeze_time(phase.start_date + timedelta(minutes=30)):
+        with django_capture_on_commit_callbacks(execute=True):
+            call_command("create_system_actions")
+
+    receivers = {message.to[0] for message in mail.outbox}
+    assert {follower.email for follower in followers} <= receivers
+    entry = OutboxEntry.objects.get(email_class="NotifyFollowersOnPhaseStartedEmail")
+    assert entry.sent == len(mail.outbox) == 5
+    assert entry.cursor == max(
+        Follow.objects.filter(project=project).values_list("creator_id", flat=True)
+    )
+
+
+@pytest.mark.django_db
+def test_followers_collapsed_per_project(
+    phase_factory, module_factory, project, django_capture_on_commit_callbacks
+):
+    dates = {
+        "start_date": parse("2022-01-01 17:00:00 UTC"),
+        "end_date": parse("2022-05-01 18:00:00 UTC"),
+    }
+    phase_factory(module=module_factory(project=project), **dates)
+    phase_factory(module=module_factory(project=project), **dates)
+
+    with freeze_time(dates["start_date"] + timedelta(minutes=30)):
+        with django_capture_on_commit_callbacks(execute=True):
+            call_command("create_system_actions")
+
+    assert len(mail.outbox) == 1
+    entries = OutboxEntry.objects.filter(
+        email_class="NotifyFollowersOnPhaseStartedEmail"
+    )
+    assert [(entry.sent, entry.collapsed) for entry in entries] == [(1, 0), (0, 1)]
+
+
+@pytest.mark.django_db
+def test_followers_not_collapsed_without_window(
+    phase_factory, module_factory, project, settings, django_capture_on_commit_callbacks
+):
+    settings.NOTIFICATION_COLLAPSE_WINDOW = 0
+    dates = {
+        "start_date": parse("2022-01-01 17:00:00 UTC"),
+        "end_date": parse("2022-05-01 18:00:00 UTC"),
+    }
+    phase_factory(module=module_factory(project=project), **dates)
+    phase_factory(module=module_factory(project=project), **dates)
+
+    with freeze_time(dates["start_date"] + timedelta(minutes=30)):
+        with django_capture_on_commit_callbacks(execute=True):
+            call_command("create_system_actions")
+
+    assert len(mail.outbox) == 2
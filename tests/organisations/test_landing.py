@@ -0,0 +1,180 @@
+import re
+
+import pytest
+from dateutil.parser import parse
+from django.core.cache import cache
+from django.urls import reverse
+from freezegun import freeze_time
+
+from adhocracy4.projects.enums import Access
+from apps.organisations import landing
+
+
+def add_phase(phase_factory, module_factory, project, start, end):
+    return phase_factory(
+        module=module_factory(project=project),
+        start_date=parse(start),
+        end_date=parse(end),
+    )
+
+
+@pytest.mark.django_db
+def test_timeline_cached_and_invalidated(
+    project_factory,
+    module_factory,
+    phase_factory,
+    organisation,
+    user,
+    django_assert_num_queries,
+):
+    project = project_factory(organisation=organisation)
+    phase = add_phase(
+        phase_factory,
+        module_factory,
+        project,
+        "2013-01-01 17:00:00 UTC",
+        "2013-01-01 19:00:00 UTC",
+    )
+
+    with freeze_time(parse("2013-01-01 18:00:00 UTC")):
+        active, future, past = organisation.get_projects_list(user)
+        assert active == [project]
+        assert active[0].project_end == phase.end_date
+        # viewable projects and the projects themselves, no aggregate
+        with django_assert_num_queries(2):
+            assert organisation.get_projects_list(user)[0] == [project]
+
+        phase.end_date = parse("2013-01-01 17:30:00 UTC")
+        phase.save()
+        active, future, past = organisation.get_projects_list(user)
+        assert active == []
+        assert past == [project]
+
+
+@pytest.mark.django_db
+def test_timeline_cached_before_project_created(
+    project_factory, module_factory, phase_factory, organisation, user
+):
+    project = project_factory(organisation=organisation)
+    stale_timeline = landing.get_timeline(organisation)
+    new_project = project_factory(organisation=organisation)
+    add_phase(
+        phase_factory,
+        module_factory,
+        new_project,
+        "2013-01-01 17:00:00 UTC",
+        "2013-01-01 19:00:00 UTC",
+    )
+    # as cached by another process that did not see the invalidation
+    key = "organisation-timeline:{}:{}".format(
+        organisation.pk, landing.get_cache_version(organisation.pk)
+    )
+    cache.set(key, stale_timeline)
+
+    with freeze_time(parse("2013-01-01 18:00:00 UTC")):
+        active, future, past = organisation.get_projects_list(user)
+
+    assert active == [new_project]
+    assert future == [project]
+
+
+@pytest.mark.django_db
+def test_projects_list_sorted(
+    project_factory, module_factory, phase_factory, organisation, user
+):
+    without_phases = project_factory(organisation=organisation)
+    later = project_factory(organisation=organisation)
+    sooner = project_factory(organisation=organisation)
+    add_phase(
+        phase_factory,
+        module_factory,
+        later,
+        "2013-01-03 17:00:00 UTC",
+        "2013-01-04 17:00:00 UTC",
+    )
+    add_phase(
+        phase_factory,
+        module_factory,
+        sooner,
+        "2013-01-02 17:00:00 UTC",
+        "2013-01-05 17:00:00 UTC",
+    )
+
+    with freeze_time(parse("2013-01-01 18:00:00 UTC")):
+        active, future, past = organisation.get_projects_list(user)
+
+    assert active == past == []
+    assert future == [sooner, later, without_phases]
+
+
+@pytest.mark.django_db
+def test_tiles_cached_per_visibility_class(
+    client,
+    project_factory,
+    module_factory,
+    phase_factory,
+    organisation,
+    member_factory,
+):
+    project = project_factory(organisation=organisation, access=Access.SEMIPUBLIC)
+    project_factory(organisation=organisation)
+    for each in organisation.projects:
+        add_phase(
+            phase_factory,
+            module_factory,
+            each,
+            "2013-01-01 17:00:00 UTC",
+            "2013-01-01 19:00:00 UTC",
+        )
+    member = member_factory(organisation=organisation).member
+    initiator = organisation.initiators.first()
+    url = reverse("organisation", kwargs={"organisation_slug": organisation.slug})
+
+    def get_tiles():
+        response = client.get(url)
+        tiles = response.context["active_projects"]
+        join_in = response.content.decode().count("JOIN IN")
+        return {tile.pk: tile.tile_class for tile in tiles}, join_in
+
+    with freeze_time(parse("2013-01-01 18:00:00 UTC")):
+        tiles, anonymous_join_in = get_tiles()
+        assert tiles[project.pk] == landing.ANONYMOUS
+
+        # the cached anonymous tile is not shown to members
+        client.force_login(member)
+        tiles, member_join_in = get_tiles()
+        assert tiles[project.pk] == landing.MEMBER
+        assert member_join_in > anonymous_join_in
+
+        client.force_login(initiator)
+        tiles, initiator_join_in = get_tiles()
+        assert set(tiles.values()) == {landing.STAFF}
+        assert initiator_join_in == member_join_in
+
+
+@pytest.mark.django_db
+def test_tiles_cached_per_hour(
+    client, project_factory, module_factory, phase_factory, organisation
+):
+    project = project_factory(organisation=organisation)
+    # a single project is shown without the cached tiles
+    project_factory(organisation=organisation)
+    add_phase(
+        phase_factory,
+        module_factory,
+        project,
+        "2013-01-01 17:00:00 UTC",
+        "2013-01-01 19:00:00 UTC",
+    )
+    url = reverse("organisation", kwargs={"organisation_slug": organisation.slug})
+
+    def get_progress():
+        content = client.get(url).content.decode()
+        return re.search(r'status-bar__active-fill" style="width:([^%]*)%', content)[1]
+
+    with freeze_time(parse("2013-01-01 17:58:00 UTC")):
+        progress = get_progress()
+    with freeze_time(parse("2013-01-01 17:59:00 UTC")):
+        assert get_progress() == progress
+    with freeze_time(parse("2013-01-01 18:02:00 UTC")):
+        assert get_progress() != progress
@@ -1,4 +1,3 @@
-import base64
 from io import BytesIO
 
 import pytest
@@ -6,6 +5,7 @@ from django.urls import reverse
 from PIL import Image
 
 from adhocracy4.test.helpers import redirect_target
+from apps.organisations import sharepics
 from apps.organisations.forms import SOCIAL_MEDIA_CHOICES
 from apps.organisations.forms import SOCIAL_MEDIA_SIZES
 from apps.organisations.views import DashboardCommunicationContentCreateView
@@ -125,8 +125,11 @@ def test_valid_data_sharepic_created(
         assert "image_preview" in response.context_data
         assert "Refresh" in response.content.decode()
         assert "Download" in response.content.decode()
-        preview_image_data = response.context_data["image_preview"]
-        preview_image = Image.open(BytesIO(base64.b64decode(preview_image_data)))
+        preview_response = client.get(response.context_data["image_preview"])
+        assert preview_response["Content-Type"] == "image/png"
+        preview_image = Image.open(
+            BytesIO(b"".join(preview_response.streaming_content))
+        )
         assert preview_image.size == (sizes["img_min_width"], sizes["overall_height"])
 
 
@@ -203,3 +206,111 @@ def test_sharepic_aspect_ratio():
     )
     new_ratio = (resize[2] - resize[0]) / float(resize[3] - resize[1])
     assert int(required_ratio) == int(new_ratio)
+
+
+@pytest.mark.django_db
+def test_sharepic_rendered_once(
+    client,
+    settings,
+    tmp_path,
+    monkeypatch,
+    organisation,
+    project_factory,
+    image_factory,
+):
+    settings.SHAREPICS_ROOT = str(tmp_path)
+    initiator = organisation.initiators.first()
+    project = project_factory(organisation=organisation)
+    format = SOCIAL_MEDIA_CHOICES[0][0]
+    url = reverse(
+        "a4dashboard:communication-content-create",
+        kwargs={
+            "organisation_slug": organisation.slug,
+            "project_slug": project.slug,
+            "format": format,
+        },
+    )
+    renders = []
+    render = sharepics.render
+    monkeypatch.setattr(
+        sharepics, "render", lambda *args: renders.append(args) or render(*args)
+    )
+    data = {"title": "my title", "description": "my description"}
+
+    client.login(username=initiator, password="password")
+    data["image"] = image_factory(1080, 760)
+    first = client.post(url, data).context_data["image_preview"]
+    data["image"] = image_factory(1080, 760)
+    second = client.post(url, data).context_data["image_preview"]
+    assert first == second
+    assert len(renders) == 1
+
+    data["image"] = image_factory(1080, 760)
+    data["title"] = "other title"
+    third = client.post(url, data).context_data["image_preview"]
+    assert third != first
+    assert len(renders) == 2
+
+
+@pytest.mark.django_db
+def test_sharepic_view(client, settings, tmp_path, user, organisation, image_factory):
+    settings.SHAREPICS_ROOT = str(tmp_path)
+    initiator = organisation.initiators.first()
+    data = {
+        "title": "my title",
+        "description": "my description",
+        "add_aplus_logo": False,
+        "add_orga_logo": False,
+    }
+    options = sharepics.get_options(organisation, 1, data)
+    key = sharepics.get_key(organisation, "pending", options)
+    url = reverse(
+        "a4dashboard:communication-content-sharepic",
+        kwargs={"organisation_slug": organisation.slug, "key": key},
+    )
+    storage = sharepics.get_sharepic_storage()
+    storage.save("sources/" + key, image_factory(1080, 760))
+
+    client.login(username=user, password="password")
+    assert client.get(url).status_code == 403
+
+    client.login(username=initiator, password="password")
+    assert client.get(url).status_code == 202
+
+    sharepics.run(key, options)
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response["Content-Type"] == "image/png"
+    assert not sharepics.is_pending(key)
+
+    response = client.get(url + "?download")
+    assert "attachment" in response["Content-Disposition"]
+
+    storage.delete(key + ".png")
+    assert client.get(url).status_code == 404
+
+
+@pytest.mark.django_db
+def test_sharepic_view_other_organisation(
+    client, settings, tmp_path, organisation_factory, image_factory
+):
+    settings.SHAREPICS_ROOT = str(tmp_path)
+    organisation = organisation_factory()
+    other = organisation_factory()
+    data = {
+        "title": "my title",
+        "description": "my description",
+        "add_aplus_logo": False,
+        "add_orga_logo": False,
+    }
+    options = sharepics.get_options(other, 1, data)
+    key = sharepics.get_key(other, "other", options)
+    sharepics.get_sharepic_storage().save("sources/" + key, image_factory(1080, 760))
+    sharepics.run(key, options)
+
+    client.login(username=organisation.initiators.first(), password="password")
+    url = reverse(
+        "a4dashboard:communication-content-sharepic",
+        kwargs={"organisation_slug": organisation.slug, "key": key},
+    )
+    assert client.get(url).status_code == 404
@@ -0,0 +1,133 @@
+import pytest
+from dateutil.parser import parse
+from django.core.cache import cache
+from django.urls import reverse
+from freezegun import freeze_time
+
+from adhocracy4.projects.enums import Access
+from apps.organisations import sitemaps
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def projects_url(organisation):
+    return reverse(
+        "organisation-sitemap-projects",
+        kwargs={"organisation_slug": organisation.slug},
+    )
+
+
+@pytest.mark.django_db
+def test_projects_sitemap_public_projects_only(client, project_factory, organisation):
+    public = project_factory(organisation=organisation)
+    private = project_factory(organisation=organisation, access=Access.PRIVATE)
+    draft = project_factory(organisation=organisation, is_draft=True)
+    archived = project_factory(organisation=organisation, is_archived=True)
+
+    response = client.get(projects_url(organisation))
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/xml"
+    content = response.content.decode()
+    assert public.get_absolute_url() in content
+    for project in (private, draft, archived):
+        assert project.get_absolute_url() not in content
+
+
+@pytest.mark.django_db
+def test_projects_sitemap_lastmod_from_phases(
+    client, project_factory, module_factory, phase_factory, organisation
+):
+    with freeze_time(parse("2013-01-01 12:00:00 UTC")):
+        project = project_factory(organisation=organisation)
+        module = module_factory(project=project)
+        phase_factory(
+            module=module,
+            start_date=parse("2013-03-01 12:00:00 UTC"),
+            end_date=parse("2013-04-01 12:00:00 UTC"),
+        )
+        phase_factory(
+            module=module,
+            start_date=parse("2013-05-01 12:00:00 UTC"),
+            end_date=parse("2013-06-01 12:00:00 UTC"),
+        )
+
+    with freeze_time(parse("2013-04-15 12:00:00 UTC")):
+        response = client.get(projects_url(organisation))
+    assert "<lastmod>2013-03-01</lastmod>" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_projects_sitemap_queries_independent_of_projects(
+    client, django_assert_num_queries, project_factory, organisation
+):
+    for _ in range(10):
+        project_factory(organisation=organisation)
+
+    # organisation and projects
+    with django_assert_num_queries(2):
+        client.get(projects_url(organisation))
+    # rendered sitemap is cached
+    with django_assert_num_queries(1):
+        response = client.get(projects_url(organisation))
+    assert response.content.decode().count("<url>") == 10
+
+
+@pytest.mark.django_db
+def test_projects_sitemap_invalidated_by_project_change(
+    client, project_factory, organisation
+):
+    project = project_factory(organisation=organisation)
+    client.get(projects_url(organisation))
+
+    new_project = project_factory(organisation=organisation)
+    content = client.get(projects_url(organisation)).content.decode()
+    assert new_project.get_absolute_url() in content
+
+    project.is_draft = True
+    project.save()
+    content = client.get(projects_url(organisation)).content.decode()
+    assert project.get_absolute_url() not in content
+
+
+@pytest.mark.django_db
+def test_projects_sitemap_pages(client, monkeypatch, project_factory, organisation):
+    monkeypatch.setattr(sitemaps, "SITEMAP_LIMIT", 2)
+    projects = [project_factory(organisation=organisation) for _ in range(3)]
+
+    response = client.get(
+        reverse(
+            "organisation-sitemap-index",
+            kwargs={"organisation_slug": organisation.slug},
+        )
+    )
+    content = response.content.decode()
+    assert projects_url(organisation) + "?p=2" in content
+    assert projects_url(organisation) + "?p=3" not in content
+
+    content = client.get(projects_url(organisation) + "?p=2").content.decode()
+    assert content.count("<url>") == 1
+    assert projects[2].get_absolute_url() in content
+
+    assert client.get(projects_url(organisation) + "?p=3").status_code == 404
+    assert client.get(projects_url(organisation) + "?p=x").status_code == 404
+    assert client.get(projects_url(organisation) + "?p=0").status_code == 404
+    assert client.get(projects_url(organisation) + "?p=-1").status_code == 404
+
+
+@pytest.mark.django_db
+def test_organisations_sitemap_index_current_site(client, organisation_factory):
+    organisation = organisation_factory()
+    response = client.get(reverse("organisations-sitemap-index"))
+    assert response.status_code == 200
+    assert (
+        reverse(
+            "organisation-sitemap-index",
+            kwargs={"organisation_slug": organisation.slug},
+        )
+        in response.content.decode()
+    )
@@ -30,7 +30,7 @@ component = components.projects.get("moderators")
     ],
 )
 @pytest.mark.django_db
-def test_initiator_can_edit(client, phase_factory):
+def test_initiator_can_edit(client, phase_factory, django_capture_on_commit_callbacks):
     phase, module, project, idea = setup_phase(
         phase_factory, None, CollectFeedbackPhase
     )
@@ -46,7 +46,8 @@ def test_initiator_can_edit(client, phase_factory):
     data = {
         "add_users": "test1@foo.bar,test2@foo.bar",
     }
-    response = client.post(url, data)
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(url, data)
     assert redirect_target(response) == "dashboard-{}-edit".format(component.identifier)
     assert ModeratorInvite.objects.get(email="test1@foo.bar")
     assert ModeratorInvite.objects.get(email="test2@foo.bar")
@@ -138,7 +139,9 @@ def test_moderator_can_only_be_invited_once(client, phase_factory, user):
 
 
 @pytest.mark.django_db
-def test_registered_user_gets_email_in_english(client, phase_factory, user):
+def test_registered_user_gets_email_in_english(
+    client, phase_factory, user, django_capture_on_commit_callbacks
+):
     phase, module, project, idea = setup_phase(
         phase_factory, None, CollectFeedbackPhase
     )
@@ -154,7 +157,8 @@ def test_registered_user_gets_email_in_english(client, phase_factory, user):
     data = {
         "add_users": user.email,
     }
-    response = client.post(url, data)
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(url, data)
     assert redirect_target(response) == "dashboard-{}-edit".format(component.identifier)
     assert ModeratorInvite.objects.get(email=user.email)
     assert len(mail.outbox) == 1
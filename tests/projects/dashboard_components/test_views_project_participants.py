@@ -30,7 +30,7 @@ component = components.projects.get("participants")
     ],
 )
 @pytest.mark.django_db
-def test_initiator_can_edit(client, phase_factory):
+def test_initiator_can_edit(client, phase_factory, django_capture_on_commit_callbacks):
     phase, module, project, idea = setup_phase(
         phase_factory, None, CollectFeedbackPhase
     )
@@ -46,7 +46,8 @@ def test_initiator_can_edit(client, phase_factory):
     data = {
         "add_users": "test1@foo.bar,test2@foo.bar",
     }
-    response = client.post(url, data)
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(url, data)
     assert redirect_target(response) == "dashboard-{}-edit".format(component.identifier)
     assert ParticipantInvite.objects.get(email="test1@foo.bar")
     assert ParticipantInvite.objects.get(email="test2@foo.bar")
@@ -140,7 +141,9 @@ def test_participant_can_only_be_invited_once(client, phase_factory, user):
 
 
 @pytest.mark.django_db
-def test_registered_user_gets_email_in_english(client, phase_factory, user):
+def test_registered_user_gets_email_in_english(
+    client, phase_factory, user, django_capture_on_commit_callbacks
+):
     phase, module, project, idea = setup_phase(
         phase_factory, None, CollectFeedbackPhase
     )
@@ -156,7 +159,8 @@ def test_registered_user_gets_email_in_english(client, phase_factory, user):
     data = {
         "add_users": user.email,
     }
-    response = client.post(url, data)
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(url, data)
     assert redirect_target(response) == "dashboard-{}-edit".format(component.identifier)
     assert ParticipantInvite.objects.get(email=user.email)
     assert len(mail.outbox) == 1
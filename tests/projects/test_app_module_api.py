@@ -1,5 +1,7 @@
 import pytest
 from dateutil.parser import parse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from adhocracy4.test.helpers import freeze_phase
@@ -208,3 +210,47 @@ def test_app_module_api_poll(client, apiclient, project_factory, user):
         apiclient.login(username=user.email, password="password")
         response = apiclient.get(url, format="json")
         assert response.data[0]["has_idea_adding_permission"] is False
+
+
+@pytest.mark.django_db
+def test_app_module_api_queries_do_not_grow_with_modules(
+    user,
+    project_factory,
+    module_factory,
+    phase_factory,
+    category_factory,
+    label_factory,
+    apiclient,
+):
+    project = project_factory(is_app_accessible=True)
+
+    def add_module():
+        module = module_factory(project=project)
+        phase = phase_factory(module=module)
+        phase_factory(module=module)
+        category_factory(module=module)
+        label_factory(module=module)
+        return phase
+
+    def count_queries():
+        with CaptureQueriesContext(connection) as context:
+            response = apiclient.get(url, format="json")
+        assert response.status_code == 200
+        return len(context.captured_queries), response.data
+
+    url = reverse("app-modules-list")
+    apiclient.force_authenticate(user=user)
+    phase = add_module()
+    with freeze_phase(phase):
+        num_queries, data = count_queries()
+        for i in range(3):
+            add_module()
+        num_queries_more, data = count_queries()
+        etag = apiclient.get(url, format="json")["ETag"]
+        response = apiclient.get(url, format="json", HTTP_IF_NONE_MATCH=etag)
+
+    assert num_queries_more == num_queries
+    assert len(data) == 4
+    assert data[0]["active_phase"]
+    assert len(data[0]["labels"]) == len(data[0]["categories"]) == 1
+    assert response.status_code == 304
@@ -1,4 +1,6 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from adhocracy4.api.dates import get_date_display
@@ -387,3 +389,71 @@ def test_retrieve_project_with_jwt_auth(
         apiclient.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
         response = apiclient.get(url)
     assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_app_project_api_queries_do_not_grow_with_projects(
+    user,
+    module_factory,
+    organisation_factory,
+    phase_factory,
+    project_factory,
+    apiclient,
+):
+    organisation = organisation_factory(enable_geolocation=True)
+
+    def add_project():
+        project = project_factory(organisation=organisation)
+        for i in range(2):
+            module = module_factory(project=project)
+            phase = phase_factory(module=module)
+            phase_factory(module=module)
+        return phase
+
+    def count_queries():
+        with CaptureQueriesContext(connection) as context:
+            response = apiclient.get(url, format="json")
+        assert response.status_code == 200
+        return len(context.captured_queries), response.data
+
+    url = reverse("app-projects-list")
+    apiclient.force_authenticate(user=user)
+    phase = add_project()
+    with helpers.freeze_phase(phase):
+        num_queries, data = count_queries()
+        for i in range(3):
+            add_project()
+        num_queries_more, data = count_queries()
+
+    assert num_queries_more == num_queries
+    # projects with several unfinished phases are listed once
+    assert len(data) == 4
+    assert len(data[0]["published_modules"]) == 2
+
+
+@pytest.mark.django_db
+def test_app_project_api_etag(
+    user, module_factory, organisation_factory, phase_factory, apiclient
+):
+    organisation = organisation_factory(enable_geolocation=True)
+    phase = phase_factory(
+        module=module_factory(project__organisation=organisation),
+    )
+    project = phase.module.project
+    url = reverse("app-projects-list")
+    apiclient.force_authenticate(user=user)
+
+    with helpers.freeze_phase(phase):
+        response = apiclient.get(url, format="json")
+        etag = response["ETag"]
+        assert response.status_code == 200
+
+        response = apiclient.get(url, format="json", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+
+        project.name = "changed"
+        project.save()
+        response = apiclient.get(url, format="json", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
@@ -0,0 +1,155 @@
+import pytest
+from django.core import mail
+from django.urls import reverse
+
+from apps.projects import invites
+from apps.projects import tasks
+from apps.projects.models import InviteChunk
+from apps.projects.models import InviteDispatch
+from apps.projects.models import ModeratorInvite
+from apps.projects.models import ParticipantInvite
+
+
+@pytest.mark.django_db
+def test_invite_in_chunks(
+    settings,
+    project,
+    user,
+    participant_invite_factory,
+    django_capture_on_commit_callbacks,
+):
+    settings.INVITE_CHUNK_SIZE = 2
+    project.participants.add(user)
+    participant_invite_factory(project=project, email="pending@foo.bar")
+    emails = ["test{}@foo.bar".format(i) for i in range(5)]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        dispatch = invites.invite(
+            project=project,
+            creator=user,
+            invite_model=ParticipantInvite,
+            related_users=project.participants,
+            emails=emails + [user.email, "pending@foo.bar"],
+            site="example.com",
+        )
+
+    dispatch.refresh_from_db()
+    assert dispatch.finished
+    assert dispatch.invite_type == InviteDispatch.PARTICIPANT
+    assert dispatch.existing == [user.email]
+    assert dispatch.pending == ["pending@foo.bar"]
+    assert dispatch.chunks.count() == 3
+    assert dispatch.get_progress() == {"total": 5, "sent": 5, "failed": 0, "pending": 0}
+    assert ParticipantInvite.objects.filter(project=project).count() == 6
+    assert sorted(m.to[0] for m in mail.outbox) == emails
+
+    report = dict(dispatch.get_report())
+    assert report[user.email] == "already accepted an invitation"
+    assert report["pending@foo.bar"] == "already invited"
+    assert all(report[email] == "invited" for email in emails)
+
+
+@pytest.mark.django_db
+def test_invite_dedupe_queries(
+    django_assert_max_num_queries, django_capture_on_commit_callbacks, project, user
+):
+    emails = ["test{}@foo.bar".format(i) for i in range(100)]
+
+    # only the dedupe and the inserts, sending is started after the commit
+    with django_capture_on_commit_callbacks() as callbacks:
+        with django_assert_max_num_queries(10):
+            dispatch = invites.invite(
+                project=project,
+                creator=user,
+                invite_model=ModeratorInvite,
+                related_users=project.moderators,
+                emails=emails,
+                site="example.com",
+            )
+    assert len(callbacks) == 1
+    assert not mail.outbox
+    assert dispatch.invite_type == InviteDispatch.MODERATOR
+    assert ModeratorInvite.objects.filter(project=project).count() == 100
+
+
+@pytest.mark.django_db
+def test_resume_skips_sent_invites(project, user, participant_invite_factory):
+    for email in ["a@foo.bar", "b@foo.bar", "c@foo.bar"]:
+        participant_invite_factory(project=project, email=email)
+    dispatch = InviteDispatch.objects.create(
+        project=project, creator=user, invite_type=InviteDispatch.PARTICIPANT
+    )
+    # a crashed worker which already sent the first invite
+    InviteChunk.objects.create(
+        dispatch=dispatch,
+        emails=["a@foo.bar", "b@foo.bar", "c@foo.bar"],
+        total=3,
+        sent=1,
+        cursor=1,
+    )
+
+    tasks.send_invites(dispatch.pk)
+
+    dispatch.refresh_from_db()
+    assert dispatch.finished
+    assert dispatch.get_progress()["sent"] == 3
+    assert [m.to[0] for m in mail.outbox] == ["b@foo.bar", "c@foo.bar"]
+
+
+@pytest.mark.django_db
+def test_failed_invites_are_reported(
+    project, user, mocker, django_capture_on_commit_callbacks
+):
+    mocker.patch(
+        "django.core.mail.message.EmailMessage.send", side_effect=OSError("down")
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        dispatch = invites.invite(
+            project=project,
+            creator=user,
+            invite_model=ParticipantInvite,
+            related_users=project.participants,
+            emails=["test@foo.bar"],
+            site="example.com",
+        )
+
+    assert dispatch.get_progress() == {"total": 1, "sent": 0, "failed": 1, "pending": 0}
+    assert dict(dispatch.get_report()) == {"test@foo.bar": "sending failed"}
+
+
+@pytest.mark.django_db
+def test_invite_dispatch_view(
+    client, project, user, django_capture_on_commit_callbacks
+):
+    initiator = project.organisation.initiators.first()
+    with django_capture_on_commit_callbacks(execute=True):
+        dispatch = invites.invite(
+            project=project,
+            creator=initiator,
+            invite_model=ParticipantInvite,
+            related_users=project.participants,
+            emails=["test@foo.bar"],
+            site="example.com",
+        )
+    url = dispatch.get_absolute_url()
+    assert url == reverse(
+        "a4dashboard:dashboard-participants-invites",
+        kwargs={
+            "organisation_slug": project.organisation.slug,
+            "project_slug": project.slug,
+            "pk": dispatch.pk,
+        },
+    )
+
+    client.login(username=user.email, password="password")
+    assert client.get(url).status_code == 403
+
+    client.login(username=initiator.email, password="password")
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.context_data["progress"]["sent"] == 1
+
+    response = client.get(url, {"format": "csv"})
+    assert response["Content-Type"] == "text/csv"
+    assert "test@foo.bar,invited" in response.content.decode()
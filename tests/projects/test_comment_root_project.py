@@ -0,0 +1,94 @@
+import os
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+
+from adhocracy4.comments.models import Comment
+from apps.projects import helpers
+from apps.projects.models import CommentRootProject
+
+# run with --benchmarks, COMMENT_BENCHMARK_SIZE=1000000 for a large platform
+BENCHMARK_COMMENTS = int(os.environ.get("COMMENT_BENCHMARK_SIZE", 20000))
+
+
+@pytest.mark.django_db
+def test_comments_and_replies_get_root_project(idea, comment_factory):
+    comment = comment_factory(content_object=idea)
+    reply = comment_factory(content_object=comment)
+
+    assert comment.root_project.project == idea.project
+    assert CommentRootProject.objects.get(comment=reply).project == idea.project
+    assert set(helpers.get_all_comments_project(idea.project)) == {comment, reply}
+
+    comment_pk = comment.pk
+    comment.delete()
+    assert not CommentRootProject.objects.filter(comment=comment_pk).exists()
+
+
+@pytest.mark.django_db
+def test_update_comment_projects_command(idea, comment_factory, project_factory):
+    comment = comment_factory(content_object=idea)
+    reply = comment_factory(content_object=comment)
+    Comment.objects.filter(pk=reply.pk).update(project=None)
+    CommentRootProject.objects.all().delete()
+    other = CommentRootProject.objects.create(
+        comment=comment_factory(content_object=idea), project=project_factory()
+    )
+
+    call_command("update_comment_projects", batch_size=2)
+
+    assert set(CommentRootProject.objects.values_list("comment", "project")) == {
+        (comment.pk, idea.project.pk),
+        (reply.pk, idea.project.pk),
+        (other.comment_id, idea.project.pk),
+    }
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_benchmark_comments_of_project(idea, user):
+    idea_ct = ContentType.objects.get_for_model(idea)
+    comment_ct = ContentType.objects.get_for_model(Comment)
+    comments = Comment.objects.bulk_create(
+        Comment(
+            comment="comment",
+            creator=user,
+            content_type=idea_ct,
+            object_pk=str(idea.pk),
+            project=idea.project,
+        )
+        for _ in range(BENCHMARK_COMMENTS // 2)
+    )
+    Comment.objects.bulk_create(
+        Comment(
+            comment="reply",
+            creator=user,
+            content_type=comment_ct,
+            object_pk=str(comment.pk),
+        )
+        for comment in comments
+    )
+
+    with CaptureQueriesContext(connection) as context:
+        for _ in helpers.update_comment_root_projects(Comment.objects.all()):
+            pass
+    # queries per batch of comments, not per comment
+    assert len(context.captured_queries) < BENCHMARK_COMMENTS / 100
+
+    project = idea.project
+    before = Comment.objects.filter(
+        Q(project=project) | Q(parent_comment__project=project)
+    ).count()
+    with CaptureQueriesContext(connection) as context:
+        after = helpers.get_all_comments_project(project).count()
+    assert before == after == BENCHMARK_COMMENTS
+
+    # one equality on the root project instead of or-ing the parent's project
+    (query,) = context.captured_queries
+    sql = query["sql"].upper()
+    assert '"A4_CANDY_PROJECTS_COMMENTROOTPROJECT"."PROJECT_ID" =' in sql
+    assert " OR " not in sql
@@ -1,4 +1,5 @@
 import pytest
+from django.core.management import call_command
 from django.urls import reverse
 from rest_framework import status
 
@@ -8,15 +9,26 @@ from adhocracy4.polls.models import Vote
 from adhocracy4.test.helpers import freeze_phase
 from adhocracy4.test.helpers import setup_phase
 from apps.dashboard.blueprints import blueprints
+from apps.projects.insights import add_active_participant
+from apps.projects.insights import batch
 from apps.projects.insights import create_insight
+from apps.projects.insights import increase_counts
+from apps.projects.insights import rebuild_insights
 from apps.projects.models import ProjectInsight
 from apps.projects.models import create_insight_context
 
 get_insight = ProjectInsight.objects.get
 
 
+def rebuild_insight(project):
+    rebuild_insights([project.pk])
+    return ProjectInsight.objects.get(project=project)
+
+
 @pytest.mark.django_db
-@pytest.mark.parametrize("insight_provider", [create_insight, get_insight])
+@pytest.mark.parametrize(
+    "insight_provider", [create_insight, rebuild_insight, get_insight]
+)
 def test_draft_modules_do_not_trigger_show_results(
     project_factory,
     module_factory,
@@ -93,7 +105,9 @@ def test_can_create_insight_for_empty_project(
 
 
 @pytest.mark.django_db
-@pytest.mark.parametrize("insight_provider", [create_insight, get_insight])
+@pytest.mark.parametrize(
+    "insight_provider", [create_insight, rebuild_insight, get_insight]
+)
 def test_comments_of_comments_are_counted(
     module_factory,
     comment_factory,
@@ -125,7 +139,9 @@ def test_comments_of_comments_are_counted(
 
 
 @pytest.mark.django_db
-@pytest.mark.parametrize("insight_provider", [create_insight, get_insight])
+@pytest.mark.parametrize(
+    "insight_provider", [create_insight, rebuild_insight, get_insight]
+)
 def test_repeated_saving_does_not_increase_count(
     module_factory,
     live_question_factory,
@@ -146,7 +162,9 @@ def test_repeated_saving_does_not_increase_count(
 
 
 @pytest.mark.django_db
-@pytest.mark.parametrize("insight_provider", [create_insight, get_insight])
+@pytest.mark.parametrize(
+    "insight_provider", [create_insight, rebuild_insight, get_insight]
+)
 def test_initiators_are_not_counted_as_participants(
     module_factory,
     poll_factory,
@@ -162,7 +180,9 @@ def test_initiators_are_not_counted_as_participants(
 
 
 @pytest.mark.django_db
-@pytest.mark.parametrize("insight_provider", [create_insight, get_insight])
+@pytest.mark.parametrize(
+    "insight_provider", [create_insight, rebuild_insight, get_insight]
+)
 def test_complex_example(
     project_factory,
     module_factory,
@@ -238,7 +258,7 @@ def test_complex_example(
 
 
 @pytest.mark.django_db
-@pytest.mark.parametrize("insight_provider", [get_insight])
+@pytest.mark.parametrize("insight_provider", [rebuild_insight, get_insight])
 def test_create_insight_for_ideas(
     module_factory,
     idea_factory,
@@ -271,7 +291,9 @@ def test_create_insight_for_ideas(
 
 
 @pytest.mark.django_db
-@pytest.mark.parametrize("insight_provider", [create_insight, get_insight])
+@pytest.mark.parametrize(
+    "insight_provider", [create_insight, rebuild_insight, get_insight]
+)
 def test_create_insight_contexts_combines_unregistered_users_and_registered_users(
     apiclient,
     user_factory,
@@ -345,3 +367,78 @@ def test_create_insight_contexts_combines_unregistered_users_and_registered_user
     assert insight.unregistered_participants == n_unregistered_users
     context = create_insight_context(insight)
     assert context["counts"][0][1] == len(users) + n_unregistered_users
+
+
+@pytest.mark.django_db
+def test_increase_counts_does_not_overwrite_concurrent_updates(project_factory):
+    project = project_factory()
+    increase_counts(project, comments=1)
+    stale_insight = ProjectInsight.objects.get(project=project)
+
+    increase_counts(project, comments=1, ratings=2)
+
+    assert stale_insight.comments == 1
+    insight = ProjectInsight.objects.get(project=project)
+    assert insight.comments == 2
+    assert insight.ratings == 2
+
+
+@pytest.mark.django_db
+def test_batch(
+    module_factory,
+    idea_factory,
+    comment_factory,
+    user_factory,
+    django_assert_num_queries,
+):
+    module = module_factory()
+    users = user_factory.create_batch(size=2)
+    idea = idea_factory(module=module, creator=users[0])
+
+    with batch():
+        for user in users + users:
+            comment_factory(content_object=idea, creator=user)
+        assert ProjectInsight.objects.get(project=module.project).comments == 0
+
+    insight = ProjectInsight.objects.get(project=module.project)
+    assert insight.comments == 4
+    assert insight.active_participants.count() == 2
+
+    with django_assert_num_queries(2):
+        add_active_participant(module.project, users[1].id)
+    assert insight.active_participants.count() == 2
+
+
+@pytest.mark.django_db
+def test_reset_insights_table_dry_run(module_factory, idea_factory, capsys):
+    module = module_factory()
+    idea_factory(module=module)
+    ProjectInsight.objects.filter(project=module.project).update(written_ideas=5)
+
+    call_command("reset_insights_table", "--dry-run")
+    out = capsys.readouterr().out
+    assert "project {}: written_ideas 5 -> 1".format(module.project.pk) in out
+    assert "1/1 projects" in out
+    assert get_insight(project=module.project).written_ideas == 5
+
+    call_command("reset_insights_table", "--batch-size", "1")
+    insight = get_insight(project=module.project)
+    assert insight.written_ideas == 1
+    assert insight.active_participants.count() == 1
+
+
+@pytest.mark.django_db
+def test_batch_writes_once_per_project(module_factory, django_assert_num_queries):
+    project = module_factory().project
+    ProjectInsight.objects.get_or_create(project=project)
+
+    # one update for the counters, the participants are not touched
+    with django_assert_num_queries(1):
+        with batch():
+            for i in range(10):
+                increase_counts(project, ratings=1)
+            increase_counts(project, comments=2)
+
+    insight = ProjectInsight.objects.get(project=project)
+    assert insight.ratings == 10
+    assert insight.comments == 2
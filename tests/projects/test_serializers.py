@@ -2,6 +2,9 @@ from datetime import timedelta
 
 import pytest
 from dateutil.parser import parse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from freezegun import freeze_time
 
@@ -122,3 +125,55 @@ def test_project_serializer(
         assert not project_data[1]["tile_image_alt_text"]
         assert not project_data[2]["tile_image_alt_text"]
         assert project_data[3]["tile_image_alt_text"]
+
+
+@pytest.mark.django_db
+def test_moderation_projects_queries_do_not_grow_with_projects(
+    apiclient,
+    user,
+    project_factory,
+    phase_factory,
+    idea_factory,
+    comment_factory,
+    report_factory,
+):
+    def add_project(now):
+        project = project_factory()
+        project.moderators.add(user)
+        phase = phase_factory(
+            start_date=now - timedelta(days=1),
+            end_date=now + timedelta(days=1),
+            module__project=project,
+        )
+        phase_factory(
+            start_date=now + timedelta(days=2),
+            end_date=now + timedelta(days=3),
+            module=phase.module,
+        )
+        idea = idea_factory(module=phase.module)
+        comment = comment_factory(content_object=idea)
+        comment_factory(content_object=comment)
+        report_factory(content_object=comment)
+        report_factory(content_object=comment)
+        return project
+
+    def count_queries():
+        with CaptureQueriesContext(connection) as context:
+            response = apiclient.get(reverse("moderationprojects-list"))
+        assert response.status_code == 200
+        return len(context.captured_queries), response.data
+
+    now = parse("2013-01-01 18:00:00+01:00")
+    apiclient.force_authenticate(user=user)
+    with freeze_time(now):
+        add_project(now)
+        num_queries, data = count_queries()
+        for i in range(4):
+            add_project(now)
+        assert count_queries()[0] == num_queries
+
+    assert data[0]["comment_count"] == 2
+    assert data[0]["num_reported_unread_comments"] == 1
+    assert data[0]["participation_string"] == _("running")
+    assert data[0]["active_phase"]
+    assert data[0]["status"] == 0
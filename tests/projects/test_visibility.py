@@ -0,0 +1,162 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+
+from adhocracy4.projects.enums import Access
+from adhocracy4.projects.models import Project
+from apps.organisations.models import Member
+from apps.projects import query
+from apps.projects import visibility
+
+User = get_user_model()
+
+
+def filter_viewable_joined(queryset, user):
+    """The former implementation, kept as reference."""
+    if not user.is_authenticated:
+        return queryset.filter(Q(access=Access.PUBLIC) | Q(access=Access.SEMIPUBLIC))
+    return queryset.filter(
+        Q(access=Access.PUBLIC)
+        | Q(access=Access.SEMIPUBLIC)
+        | Q(participants__in=[user.id])
+        | Q(organisation__initiators__id__in=[user.id])
+        | Q(moderators__in=[user.id])
+        | Q(organisation__member__member__id=user.id)
+    ).distinct()
+
+
+def viewable_pks(user):
+    return set(
+        query.filter_viewable(Project.objects.all(), user).values_list("pk", flat=True)
+    )
+
+
+def joined_pks(user):
+    return set(
+        filter_viewable_joined(Project.objects.all(), user).values_list("pk", flat=True)
+    )
+
+
+@pytest.mark.django_db
+def test_filter_viewable_matches_joined_filter(
+    project_factory, organisation_factory, user_factory, member_factory
+):
+    organisation = organisation_factory()
+    other_organisation = organisation_factory()
+    public = project_factory(organisation=organisation)
+    semipublic = project_factory(organisation=organisation, access=Access.SEMIPUBLIC)
+    private = project_factory(organisation=organisation, access=Access.PRIVATE)
+    other_private = project_factory(
+        organisation=other_organisation, access=Access.PRIVATE
+    )
+
+    stranger, participant, moderator, initiator = user_factory.create_batch(4)
+    member = member_factory(organisation=organisation).member
+    private.participants.add(participant)
+    other_private.moderators.add(moderator)
+    other_organisation.initiators.add(initiator)
+
+    assert viewable_pks(stranger) == {public.pk, semipublic.pk}
+    assert viewable_pks(participant) == {public.pk, semipublic.pk, private.pk}
+    assert viewable_pks(moderator) == {public.pk, semipublic.pk, other_private.pk}
+    assert viewable_pks(initiator) == {public.pk, semipublic.pk, other_private.pk}
+    assert viewable_pks(member) == {public.pk, semipublic.pk, private.pk}
+    for user in (stranger, participant, moderator, initiator, member):
+        assert viewable_pks(user) == joined_pks(user)
+
+
+@pytest.mark.django_db
+def test_visibility_cached_and_invalidated(
+    project_factory, user, django_assert_num_queries
+):
+    project = project_factory(access=Access.PRIVATE)
+    with django_assert_num_queries(1):
+        assert visibility.get_ids(user) == (frozenset(), frozenset())
+    with django_assert_num_queries(0):
+        visibility.get_ids(user)
+
+    project.participants.add(user)
+    assert visibility.get_ids(user)[0] == {project.pk}
+    user.project_participant.remove(project)
+    assert visibility.get_ids(user)[0] == set()
+
+    project.moderators.add(user)
+    assert visibility.get_ids(user)[0] == {project.pk}
+    project.moderators.clear()
+    assert visibility.get_ids(user)[0] == set()
+
+    project.organisation.initiators.add(user)
+    assert visibility.get_ids(user)[1] == {project.organisation_id}
+    member = Member.objects.create(
+        member=user, organisation=project.organisation, additional_info={}
+    )
+    project.organisation.initiators.remove(user)
+    assert visibility.get_ids(user)[1] == {project.organisation_id}
+    member.delete()
+    assert visibility.get_ids(user)[1] == set()
+
+
+@pytest.mark.django_db
+def test_visibility_invalidated_after_commit(
+    project_factory, user, django_capture_on_commit_callbacks
+):
+    project = project_factory(access=Access.PRIVATE)
+    with django_capture_on_commit_callbacks(execute=True):
+        project.participants.add(user)
+        # as cached by a concurrent request before the commit
+        cache.set(visibility._cache_key(user.pk), (frozenset(), frozenset()))
+    assert visibility.get_ids(user)[0] == {project.pk}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        member = Member.objects.create(
+            member=user, organisation=project.organisation, additional_info={}
+        )
+        cache.set(visibility._cache_key(user.pk), (frozenset(), frozenset()))
+    assert visibility.get_ids(user)[1] == {member.organisation_id}
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_visibility_benchmark(project_factory, organisation):
+    """Filter with 50k memberships in private projects."""
+    projects = [
+        project_factory(organisation=organisation, access=Access.PRIVATE)
+        for i in range(50)
+    ]
+    users = User.objects.bulk_create(
+        User(username="bench{}".format(i), email="bench{}@example.com".format(i))
+        for i in range(1000)
+    )
+    Project.participants.through.objects.bulk_create(
+        Project.participants.through(project_id=project.pk, user_id=user.pk)
+        for project in projects
+        for user in users
+    )
+    user = users[0]
+    visibility.invalidate(user.pk)
+    expected = joined_pks(user)
+
+    assert viewable_pks(user) == expected
+    with CaptureQueriesContext(connection) as queries:
+        assert viewable_pks(user) == expected
+    # the cached ids are used, without joins or distinct
+    assert len(queries) == 1
+    sql = queries[0]["sql"].upper()
+    assert " JOIN " not in sql
+    assert "DISTINCT" not in sql
+    assert len(expected) == 50
+
+
+@pytest.mark.django_db
+def test_project_queryset_viewable(project_factory, user):
+    public = project_factory()
+    private = project_factory(access=Access.PRIVATE)
+    projects = query.ProjectQuerySet(Project)
+
+    assert set(projects.viewable(user)) == {public}
+    private.participants.add(user)
+    assert set(projects.viewable(user)) == {public, private}
+    assert set(projects.filter(pk=private.pk).viewable(user)) == {private}
@@ -0,0 +1,23 @@
+import pytest
+from django.core import mail
+
+from apps.projects import emails
+
+
+@pytest.mark.django_db
+def test_welcome_emails_sent_in_chunks(project, user_factory, settings, mocker):
+    settings.WELCOME_EMAIL_CHUNK_SIZE = 2
+    project.is_public = False
+    project.save()
+    users = user_factory.create_batch(5)
+    send = mocker.spy(emails.WelcomeToPrivateProjectEmail, "send")
+
+    project.participants.add(*users)
+
+    assert send.call_count == 3
+    chunks = [call.kwargs["participant_pks"] for call in send.call_args_list]
+    assert sorted(pk for chunk in chunks for pk in chunk) == sorted(
+        user.pk for user in users
+    )
+    assert len(mail.outbox) == 5
+    assert {message.to[0] for message in mail.outbox} == {user.email for user in users}
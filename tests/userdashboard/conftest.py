@@ -1,3 +1,5 @@
+import pytest
+from django.core.cache import cache
 from pytest_factoryboy import register
 
 from tests.ideas.factories import IdeaFactory
@@ -5,3 +7,8 @@ from tests.moderatorfeedback.factories import ModeratorCommentFeedbackFactory
 
 register(IdeaFactory)
 register(ModeratorCommentFeedbackFactory)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
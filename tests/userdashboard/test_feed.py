@@ -0,0 +1,124 @@
+import pytest
+from dateutil.parser import parse
+from freezegun import freeze_time
+
+from adhocracy4.actions.models import Action
+from apps.userdashboard import feed
+
+
+@pytest.mark.django_db
+def test_feed_merges_comments_and_feedback(
+    user, user2, idea_factory, comment_factory, moderator_comment_feedback_factory
+):
+    idea = idea_factory(creator=user)
+    with freeze_time(parse("2024-01-01 12:00:00 UTC")):
+        comment = comment_factory(content_object=idea, creator=user2)
+    with freeze_time(parse("2024-01-03 12:00:00 UTC")):
+        later_comment = comment_factory(content_object=idea, creator=user2)
+    with freeze_time(parse("2024-01-02 12:00:00 UTC")):
+        own_comment = comment_factory(content_object=idea, creator=user)
+        feedback = moderator_comment_feedback_factory(comment=own_comment)
+    # own comments are not part of the feed
+    comment_factory(content_object=idea, creator=user)
+
+    actions, next_cursor = feed.get_page(user)
+    assert [action.obj for action in actions] == [later_comment, feedback, comment]
+    assert next_cursor is None
+
+
+@pytest.mark.django_db
+def test_feed_excludes_blocked_comments(user, user2, idea_factory, comment_factory):
+    idea = idea_factory(creator=user)
+    comment = comment_factory(content_object=idea, creator=user2)
+    blocked = comment_factory(content_object=idea, creator=user2)
+    blocked.is_blocked = True
+    blocked.save()
+
+    actions, _ = feed.get_page(user)
+    assert [action.obj for action in actions] == [comment]
+
+
+@pytest.mark.django_db
+def test_feed_cursor(user, user2, idea_factory, comment_factory):
+    idea = idea_factory(creator=user)
+    with freeze_time(parse("2024-01-01 12:00:00 UTC")):
+        comments = [
+            comment_factory(content_object=idea, creator=user2) for _ in range(5)
+        ]
+
+    first_page, cursor = feed.get_page(user, page_size=2)
+    second_page, cursor = feed.get_page(user, cursor, page_size=2)
+    third_page, cursor = feed.get_page(user, cursor, page_size=2)
+    assert cursor is None
+    shown = [action.obj for action in first_page + second_page + third_page]
+    assert shown == comments[::-1]
+
+
+@pytest.mark.django_db
+def test_feed_queries_bounded(
+    django_assert_max_num_queries, user, user2, idea_factory, comment_factory
+):
+    idea = idea_factory(creator=user)
+    for _ in range(feed.PAGE_SIZE + 5):
+        comment_factory(content_object=idea, creator=user2)
+
+    with django_assert_max_num_queries(6):
+        actions, next_cursor = feed.get_page(user)
+        for action in actions:
+            action.obj.is_blocked
+            action.target.creator
+    assert len(actions) == feed.PAGE_SIZE
+    assert next_cursor
+
+
+@pytest.mark.django_db
+def test_first_page_cached_until_new_action(
+    monkeypatch, user, user2, idea_factory, comment_factory
+):
+    idea = idea_factory(creator=user)
+    comment_factory(content_object=idea, creator=user2)
+    pages = []
+    get_page = feed.get_page
+    monkeypatch.setattr(
+        feed, "get_page", lambda *args: pages.append(args) or get_page(*args)
+    )
+
+    actions, _ = feed.get_first_page(user)
+    assert len(actions) == 1
+    actions, _ = feed.get_first_page(user)
+    assert len(actions) == 1
+    assert len(pages) == 1
+
+    comment = comment_factory(content_object=idea, creator=user2)
+    actions, _ = feed.get_first_page(user)
+    assert len(pages) == 2
+    assert len(actions) == 2
+    assert actions[0].obj == comment
+
+
+@pytest.mark.django_db
+def test_first_page_shows_actions_saved_without_invalidation(
+    user, user2, idea_factory, comment_factory
+):
+    idea = idea_factory(creator=user)
+    with freeze_time(parse("2024-01-01 12:00:00 UTC")):
+        comments = [
+            comment_factory(content_object=idea, creator=user2)
+            for _ in range(feed.PAGE_SIZE)
+        ]
+    actions, next_cursor = feed.get_first_page(user)
+    assert next_cursor is None
+
+    # e.g. saved by a process using another cache
+    action = Action.objects.get(pk=actions[0].pk)
+    action.pk = None
+    action.timestamp = parse("2024-01-02 12:00:00 UTC")
+    Action.objects.bulk_create([action])
+
+    actions, next_cursor = feed.get_first_page(user)
+    assert len(actions) == feed.PAGE_SIZE
+    assert actions[0].timestamp == action.timestamp
+    assert next_cursor == feed.encode_cursor(actions[-1])
+    rest, next_cursor = feed.get_page(user, next_cursor)
+    assert [a.obj for a in rest] == [comments[0]]
+    assert next_cursor is None
@@ -1,6 +1,8 @@
 import pytest
 from django.urls import reverse
 
+from apps.userdashboard import feed
+
 
 @pytest.mark.django_db
 def test_login_required(client, login_url):
@@ -43,3 +45,25 @@ def test_userdashboard_activities_context_data(
     assert context_data_new["view"].actions[0].actor == user2
     assert context_data_new["view"].actions[0].target == idea
     assert context_data_new["view"].actions[0].obj == comment
+
+
+@pytest.mark.django_db
+def test_userdashboard_activities_load_more(
+    client, user, user2, idea_factory, comment_factory
+):
+    idea = idea_factory(creator=user)
+    for _ in range(feed.PAGE_SIZE + 1):
+        comment_factory(content_object=idea, creator=user2)
+
+    client.login(username=user.email, password="password")
+    url = reverse("userdashboard-activities")
+    response = client.get(url)
+    view = response.context_data["view"]
+    assert len(view.actions) == feed.PAGE_SIZE
+    assert "Load more" in response.content.decode()
+
+    response = client.get(url, {"cursor": view.next_cursor})
+    view = response.context_data["view"]
+    assert len(view.actions) == 1
+    assert view.next_cursor is None
+    assert "Load more" not in response.content.decode()
@@ -75,6 +75,11 @@ module.exports = {
         './apps/userdashboard/assets/js/a4_candy_userdashboard/react_moderation_notification_list.jsx'
       ]
     },
+    sharepic_preview: {
+      import: [
+        './apps/organisations/assets/sharepic_preview.js'
+      ]
+    },
     unload_warning: {
       import: [
         './adhocracy-plus/assets/js/unload_warning.js'
@@ -99,6 +104,14 @@ module.exports = {
       ],
       dependOn: 'adhocracy4'
     },
+    map_display_points_from_url: {
+      import: [
+        'leaflet/dist/leaflet.css',
+        'maplibre-gl/dist/maplibre-gl.css',
+        './apps/maps/assets/map_display_points_from_url.js'
+      ],
+      dependOn: 'adhocracy4'
+    },
     a4maps_choose_point: {
       import: [
         'leaflet/dist/leaflet.css',